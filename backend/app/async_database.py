@@ -0,0 +1,68 @@
+"""
+Async database stack (enabled with ASYNC_DB=1)
+
+Uses the same DATABASE_URL and DB_PROFILE as app.database, with the async
+driver swapped in (aiosqlite for SQLite, asyncpg for PostgreSQL) unless
+ASYNC_DATABASE_URL is set explicitly.
+"""
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import os
+
+from app.database import (
+    DATABASE_URL,
+    DB_PROFILE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    _set_sqlite_pragmas,
+)
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart"""
+    scheme, rest = url.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}://{rest}"
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_url(DATABASE_URL))
+
+
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, profile: str = DB_PROFILE):
+    """Build an AsyncEngine using the same profile rules as create_db_engine"""
+    is_sqlite = url.startswith("sqlite")
+    is_memory = is_sqlite and (":memory:" in url or url.endswith("://") or "mode=memory" in url)
+
+    kwargs = {}
+    if profile == "production" and not is_memory:
+        kwargs.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=not is_sqlite,
+            pool_recycle=DB_POOL_RECYCLE
+        )
+
+    engine = create_async_engine(url, **kwargs)
+
+    if profile == "production" and is_sqlite and not is_memory:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    return engine
+
+
+async_engine = create_async_db_engine()
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False)
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
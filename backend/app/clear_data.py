@@ -3,7 +3,9 @@ Script to clear all data from the database
 Usage: python -m app.clear_data
 """
 from app.database import SessionLocal, engine
-from app.models import Base, User, Property, PropertyImage, Visit, Review
+from app.models import Base, User, Property, PropertyImage, ListingCard, OwnerRating, PlatformCounter, Visit, Review
+from app.table_versions import bump_all
+from app.utils.response_cache import response_cache
 
 db = SessionLocal()
 
@@ -11,12 +13,18 @@ try:
     print("🗑️  Clearing all data from database...")
     
     # Delete in correct order to respect foreign key constraints
+    db.query(OwnerRating).delete()
+    print("   ✓ Deleted all owner ratings")
+    
     db.query(Review).delete()
     print("   ✓ Deleted all reviews")
     
     db.query(PropertyImage).delete()
     print("   ✓ Deleted all property images")
     
+    db.query(ListingCard).delete()
+    print("   ✓ Deleted all listing cards")
+    
     db.query(Visit).delete()
     print("   ✓ Deleted all visits")
     
@@ -26,8 +34,19 @@ try:
     db.query(User).delete()
     print("   ✓ Deleted all users")
     
+    # Missing counters are recounted on the next GET /api/stats
+    db.query(PlatformCounter).delete()
+    print("   ✓ Reset platform counters")
+    
+    # Bulk deletes skip the ORM listener that versions tables for ETags
+    bump_all(db.connection())
+    
     db.commit()
     
+    # Bulk deletes skip the ORM events that invalidate cached responses
+    response_cache.clear()
+    print("   ✓ Cleared response cache")
+    
     print("\n✅ All data cleared successfully!")
     print("   Database is now empty and ready for new data.")
     
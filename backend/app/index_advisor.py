@@ -0,0 +1,254 @@
+"""
+Index advisor: replays the app's queries and reports the ones that still scan
+
+Every scenario calls the real route code against the configured database
+while the statements it sends are captured. Writes are stopped before they
+execute, so only the lookups of write routes (booking, reviewing) are
+replayed and nothing is changed. Each distinct statement is then explained
+with its captured parameters:
+
+    SQLite      EXPLAIN QUERY PLAN; "SCAN <table>" without an index is a full
+                table scan, "USE TEMP B-TREE" a sort no index provides, and a
+                full-text (virtual table) scan below another loop re-runs the
+                MATCH for every outer row
+    PostgreSQL  EXPLAIN (FORMAT JSON); "Seq Scan" nodes. The planner prefers
+                them on small tables, so run it on a realistically sized
+                database (python -m app.seed_data --synthetic)
+
+Scans of tables that are read whole by design (the few counter rows) are not
+reported. Exits with 1 when a table scan is found.
+
+Usage: python -m app.index_advisor [--verbose]
+"""
+import argparse
+import json
+import re
+import sys
+from types import SimpleNamespace
+
+from fastapi import HTTPException, Response
+from sqlalchemy import event, func, select
+
+from app import models, schemas
+from app.database import SessionLocal, engine
+from app.platform_counters import get_counters, invalidate_cache
+from app.routers.auth import _get_user_by_email
+from app.routers.listings import get_listings
+from app.routers.properties import build_property_details, get_owner_properties
+from app.routers.reviews import create_review, get_owner_rating_summary, get_owner_reviews, get_property_reviews
+from app.routers.visits import create_visit, get_available_slots, get_available_slots_range, get_my_visits
+from app.table_versions import get_versions
+
+# Read in full on purpose (a few rows each)
+FULL_READ_TABLES = {"platform_counters", "table_versions", "sqlite_master"}
+
+
+class _WriteStopped(Exception):
+    pass
+
+
+class QueryCapture:
+    """Records the SELECTs sent while active and stops the first write"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._before_execute)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._before_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if verb in ("INSERT", "UPDATE", "DELETE"):
+            raise _WriteStopped(statement)
+        if verb in ("SELECT", "WITH"):
+            self.statements.append((statement, parameters))
+
+
+def _sample(db) -> SimpleNamespace:
+    """Ids of real rows for the scenarios to ask about"""
+    property_id = db.execute(
+        select(models.Review.property_id).group_by(models.Review.property_id)
+        .order_by(func.count().desc()).limit(1)
+    ).scalar() or db.execute(select(func.min(models.Property.id))).scalar()
+    if property_id is None:
+        raise SystemExit("❌ The database has no properties; load some data first (python -m app.seed_data)")
+    owner_id = db.get(models.Property, property_id).owner_id
+    visit = db.execute(select(models.Visit).where(models.Visit.status == "scheduled").limit(1)).scalar()
+    buyer = db.get(models.User, visit.buyer_id) if visit else db.execute(
+        select(models.User).where(models.User.role == "buyer").limit(1)
+    ).scalar()
+    owner = db.get(models.User, owner_id)
+    date = visit.visit_date if visit else "2030-01-01"
+    return SimpleNamespace(property_id=property_id, owner_id=owner_id, owner=owner, buyer=buyer, date=date)
+
+
+def scenarios(sample):
+    """(name, function of a session) for every query shape the app sends"""
+    def listings(**filters):
+        params = dict(search=None, price=None, forSale=None, forRent=None, twoPlusRooms=None, limit=20, cursor=None)
+        params.update(filters)
+        return lambda db: get_listings(Response(), db=db, **params)
+
+    def next_page(**filters):
+        def run(db):
+            first = json.loads(get_listings(Response(), db=db, **{
+                **dict(search=None, price=None, forSale=None, forRent=None, twoPlusRooms=None, limit=20, cursor=None),
+                **filters
+            }).body)
+            if first["next_cursor"]:
+                listings(**filters, cursor=first["next_cursor"])(db)
+        return run
+
+    return [
+        ("listings", listings()),
+        ("listings: next page", next_page()),
+        ("listings: rent", listings(forRent=True)),
+        ("listings: sale, 2+ rooms", listings(forSale=True, twoPlusRooms=True)),
+        ("listings: price 500-1000", listings(price="500-1000")),
+        ("listings: price 2000+, rent", listings(price="2000+", forRent=True)),
+        ("listings: search", listings(search="cluj")),
+        ("listings: search, rent", listings(search="cluj", forRent=True)),
+        ("listings: search, sale, 2+ rooms", listings(search="cluj", forSale=True, twoPlusRooms=True)),
+        ("listings: search, price 500-1000", listings(search="cluj", price="500-1000")),
+        ("property details", lambda db: build_property_details(sample.property_id, db)),
+        ("owner properties", lambda db: get_owner_properties(sample.owner_id, Response(), db)),
+        ("owner reviews", lambda db: get_owner_reviews(sample.owner_id, limit=50, cursor=None, db=db)),
+        ("owner rating summary", lambda db: get_owner_rating_summary(sample.owner_id, db)),
+        ("property reviews", lambda db: get_property_reviews(sample.property_id, Response(), limit=50, cursor=None, db=db)),
+        ("visit slots", lambda db: get_available_slots(sample.property_id, sample.date, db)),
+        ("visit availability range", lambda db: get_available_slots_range(
+            sample.date, sample.date, [sample.property_id], db
+        )),
+        ("my visits (buyer)", lambda db: get_my_visits(Response(), db.merge(sample.buyer, load=False), db)),
+        ("my visits (owner)", lambda db: get_my_visits(Response(), db.merge(sample.owner, load=False), db)),
+        ("book visit", lambda db: create_visit(
+            schemas.VisitCreate(property_id=sample.property_id, visit_date="2099-01-01", visit_time="09:00"),
+            db.merge(sample.buyer, load=False), db
+        )),
+        ("post review", lambda db: create_review(
+            schemas.ReviewCreate(owner_id=sample.owner_id, property_id=sample.property_id, rating=5),
+            db.merge(sample.buyer, load=False), db
+        )),
+        ("login", lambda db: _get_user_by_email(db, sample.buyer.email)),
+        ("stats", lambda db: (invalidate_cache(), get_counters(db))),
+        ("table versions", lambda db: get_versions(db.connection(), ["properties", "property_images", "users"])),
+    ]
+
+
+def capture(engine, run) -> list:
+    """Distinct SELECTs one scenario sends, with the parameters of their first use"""
+    db = SessionLocal()
+    try:
+        with QueryCapture(engine) as captured:
+            try:
+                run(db)
+            except (_WriteStopped, HTTPException):
+                pass
+    finally:
+        db.rollback()
+        db.close()
+    seen = {}
+    for statement, parameters in captured.statements:
+        seen.setdefault(statement, parameters)
+    return list(seen.items())
+
+
+def _sqlite_problems(plan_rows) -> tuple:
+    lines = [row[-1] for row in plan_rows]
+    problems = []
+    # CTEs and subqueries SQLite builds once and then reads in full
+    built = {match.group(1) for match in (re.match(r"(?:MATERIALIZE|CO-ROUTINE) (\w+)", line) for line in lines) if match}
+    loops = {}  # parent id -> tables already looped over at that level
+    for node_id, parent, _, line in plan_rows:
+        match = re.match(r"(SCAN|SEARCH) (\w+)(.*)", line)
+        if not match:
+            if line.startswith("USE TEMP B-TREE"):
+                problems.append(line.lower())
+            continue
+        kind, name, rest = match.groups()
+        outer = loops.setdefault(parent, [])
+        if "VIRTUAL TABLE" in rest:
+            # A full-text MATCH must run once, as the outermost loop
+            if outer:
+                problems.append(f"full scan of {name} for every row of {outer[-1]}")
+        elif kind == "SCAN" and "USING" not in rest and name not in FULL_READ_TABLES | built:
+            problems.append(f"full scan of {name}")
+        outer.append(name)
+    return lines, problems
+
+
+def _postgres_problems(plan_json) -> tuple:
+    lines, problems = [], []
+
+    def walk(node, depth):
+        relation = node.get("Relation Name")
+        lines.append("  " * depth + node["Node Type"] + (f" on {relation}" if relation else ""))
+        if node["Node Type"] == "Seq Scan" and relation not in FULL_READ_TABLES:
+            problems.append(f"full scan of {relation}")
+        if node["Node Type"] == "Sort":
+            problems.append(f"sort on {', '.join(node.get('Sort Key', []))}")
+        for child in node.get("Plans", []):
+            walk(child, depth + 1)
+
+    walk(plan_json[0]["Plan"], 0)
+    return lines, problems
+
+
+def explain(engine, statement: str, parameters) -> tuple:
+    """(plan lines, problems) for one statement"""
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            return _sqlite_problems(rows)
+        if engine.dialect.name == "postgresql":
+            plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+            return _postgres_problems(plan if isinstance(plan, list) else json.loads(plan))
+    raise SystemExit(f"❌ EXPLAIN is not supported for {engine.dialect.name}")
+
+
+def _short(statement: str, width: int = 110) -> str:
+    text = " ".join(statement.split())
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the problems")
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        sample = _sample(db)
+        for user in (sample.owner, sample.buyer):
+            db.expunge(user)
+
+    print(f"🔎 Explaining the app's queries on {engine.url.render_as_string(hide_password=True)}")
+    scans = sorts = 0
+    for name, run in scenarios(sample):
+        for statement, parameters in capture(engine, run):
+            lines, problems = explain(engine, statement, parameters)
+            full_scans = [problem for problem in problems if problem.startswith("full scan")]
+            scans += len(full_scans)
+            sorts += len(problems) - len(full_scans)
+            if not problems and not args.verbose:
+                continue
+            marker = "❌" if full_scans else ("⚠️ " if problems else "✅")
+            print(f"\n{marker} {name}: {_short(statement)}")
+            for line in lines:
+                print(f"      {line}")
+            for problem in problems:
+                print(f"   → {problem}")
+
+    if scans:
+        print(f"\n❌ {scans} full table scan(s), {sorts} sort(s) without an index")
+        return 1
+    print(f"\n✅ No full table scans ({sorts} sort(s) without an index)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Listing card read model
+
+`listing_cards` holds one pre-formatted row per property with exactly the
+fields ListingsPage needs, so GET /api/listings reads a single table. Rows are
+refreshed in the same transaction whenever a Property or PropertyImage is
+flushed through an ORM session. Bulk Core writes bypass the listener; run the
+rebuild afterwards.
+
+Usage: python -m app.listing_cards   (rebuilds every card from properties)
+"""
+from datetime import datetime
+
+from sqlalchemy import delete, event, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+
+SNIPPET_LENGTH = 200
+REBUILD_BATCH_SIZE = 1000
+
+
+def format_price(type: str, price: float, price_currency: str, price_period: str) -> str:
+    """Format a price the way listing cards and property details show it"""
+    if type == "rent":
+        return f"{int(price)} {price_currency}/{price_period}"
+    return f"{int(price)} {price_currency}"
+
+
+def make_snippet(description: str) -> str:
+    """Shorten a description to SNIPPET_LENGTH characters on a word boundary"""
+    if len(description) <= SNIPPET_LENGTH:
+        return description
+    cut = description[:SNIPPET_LENGTH].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,.;:") + "…"
+
+
+def refresh_listing_cards(connection, property_ids) -> None:
+    """Recompute the cards for the given property ids (deleted ids lose their card)"""
+    property_ids = list(property_ids)
+    if not property_ids:
+        return
+
+    primary_image = (
+        select(models.PropertyImage.image_url)
+        .where(
+            models.PropertyImage.property_id == models.Property.id,
+            models.PropertyImage.is_primary == True
+        )
+        .order_by(models.PropertyImage.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    rows = connection.execute(
+        select(
+            models.Property.id,
+            models.Property.created_at,
+            models.Property.price,
+            models.Property.price_currency,
+            models.Property.price_period,
+            models.Property.description,
+            models.Property.location,
+            models.Property.rooms,
+            models.Property.type,
+            primary_image.label("image")
+        ).where(models.Property.id.in_(property_ids))
+    ).all()
+
+    connection.execute(delete(models.ListingCard).where(models.ListingCard.property_id.in_(property_ids)))
+    updated_at = datetime.utcnow()
+    if rows:
+        connection.execute(insert(models.ListingCard), [
+            {
+                "property_id": row.id,
+                "created_at": row.created_at,
+                "price": row.price,
+                "price_label": format_price(row.type, row.price, row.price_currency, row.price_period),
+                "description": make_snippet(row.description),
+                "image": row.image,
+                "location": row.location,
+                "rooms": row.rooms,
+                "type": row.type,
+                "updated_at": updated_at
+            }
+            for row in rows
+        ])
+
+
+def rebuild_listing_cards(db: Session) -> int:
+    """Rebuild every card from scratch in batches; returns the number of cards"""
+    db.execute(delete(models.ListingCard))
+    connection = db.connection()
+    last_id = 0
+    total = 0
+    while True:
+        ids = db.execute(
+            select(models.Property.id)
+            .where(models.Property.id > last_id)
+            .order_by(models.Property.id)
+            .limit(REBUILD_BATCH_SIZE)
+        ).scalars().all()
+        if not ids:
+            break
+        refresh_listing_cards(connection, ids)
+        last_id = ids[-1]
+        total += len(ids)
+    db.commit()
+    return total
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_listing_cards(session, flush_context):
+    """Refresh the cards of every property touched by this flush"""
+    property_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.Property):
+            property_ids.add(obj.id)
+        elif isinstance(obj, models.PropertyImage):
+            property_ids.add(obj.property_id)
+            # An image moved to another property also changes its old card
+            property_ids.update(inspect(obj).attrs.property_id.history.deleted)
+    property_ids.discard(None)
+    if property_ids:
+        refresh_listing_cards(session.connection(), property_ids)
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal, engine
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.ListingCard.__table__])
+    db = SessionLocal()
+    try:
+        print("🔄 Rebuilding listing cards...")
+        count = rebuild_listing_cards(db)
+        print(f"✅ Rebuilt {count} listing card(s)")
+    except Exception as e:
+        print(f"❌ Error rebuilding listing cards: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
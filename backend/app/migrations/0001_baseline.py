@@ -0,0 +1,10 @@
+"""
+Create the tables this database lacks
+
+A new database gets the full current schema here, so the later migrations
+find nothing to do on it.
+"""
+
+
+def upgrade(ctx):
+    ctx.create_tables()
@@ -0,0 +1,10 @@
+"""Add the role and profile columns to users created before them"""
+from app import models
+
+
+def upgrade(ctx):
+    users = models.User.__table__.c
+    ctx.add_column(users.role, default_sql="'buyer'")
+    ctx.add_column(users.phone)
+    ctx.add_column(users.date_of_birth)
+    ctx.add_column(users.is_active, default_sql="TRUE")
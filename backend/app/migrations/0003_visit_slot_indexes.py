@@ -0,0 +1,22 @@
+"""Index slot lookups and allow one scheduled visit per slot"""
+from app import models
+
+SLOT_INDEX = "uq_visits_scheduled_slot"
+
+
+def upgrade(ctx):
+    indexes = {index.name: index for index in models.Visit.__table__.indexes}
+    ctx.create_index(indexes["ix_visits_property_date_status"])
+    if ctx.has_index(SLOT_INDEX, "visits"):
+        return
+    # Keep the earliest booking of any slot that was double-booked before the index existed
+    cancelled = ctx.execute("""
+        UPDATE visits SET status = 'cancelled'
+        WHERE status = 'scheduled' AND id NOT IN (
+            SELECT MIN(id) FROM visits WHERE status = 'scheduled'
+            GROUP BY property_id, visit_date, visit_time
+        )
+    """).rowcount
+    if cancelled:
+        ctx.log(f"      cancelled {cancelled} double-booked visit(s)")
+    ctx.create_index(indexes[SLOT_INDEX])
@@ -0,0 +1,14 @@
+"""Add the listing_cards.updated_at export watermark"""
+from app import models
+
+
+def upgrade(ctx):
+    cards = models.ListingCard.__table__
+    if ctx.add_column(cards.c.updated_at):
+        ctx.backfill(
+            "listing_cards", "updated_at = COALESCE(created_at, CURRENT_TIMESTAMP)",
+            "updated_at IS NULL", key="property_id"
+        )
+    for index in cards.indexes:
+        if index.name == "ix_listing_cards_updated_at_property_id":
+            ctx.create_index(index)
@@ -0,0 +1,6 @@
+"""Build every index declared on the models that an existing table lacks"""
+
+
+def upgrade(ctx):
+    if not ctx.create_missing_indexes():
+        ctx.log("      all declared indexes exist")
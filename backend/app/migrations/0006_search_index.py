@@ -0,0 +1,10 @@
+"""Install the full-text search index (FTS5 on SQLite, GIN on PostgreSQL)"""
+from app.utils.search import POSTGRES_SEARCH_INDEX, ensure_search_index
+
+
+def upgrade(ctx):
+    if not ensure_search_index(ctx.engine, build_index=False):
+        ctx.log("      full-text search unavailable; listings fall back to ILIKE")
+        return
+    if ctx.postgresql:
+        ctx.create_index_sql("ix_properties_search", "properties", POSTGRES_SEARCH_INDEX)
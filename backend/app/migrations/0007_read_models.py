@@ -0,0 +1,39 @@
+"""
+Fill the read models for data that predates them
+
+Only missing rows are written (properties without a card, owners with reviews
+but no aggregate), one batch of keys per transaction, so an interrupted run
+resumes where it stopped and existing cards keep their updated_at.
+"""
+from sqlalchemy import select
+
+from app import models
+from app.listing_cards import refresh_listing_cards
+from app.owner_ratings import refresh_owner_ratings
+from app.table_versions import ensure_table_versions
+
+
+def _fill_cards(connection, property_ids) -> None:
+    missing = connection.execute(
+        select(models.Property.id)
+        .outerjoin(models.ListingCard, models.ListingCard.property_id == models.Property.id)
+        .where(models.Property.id.in_(property_ids), models.ListingCard.property_id.is_(None))
+    ).scalars().all()
+    refresh_listing_cards(connection, missing)
+
+
+def _fill_ratings(connection, owner_ids) -> None:
+    missing = connection.execute(
+        select(models.Review.owner_id).distinct()
+        .outerjoin(models.OwnerRating, models.OwnerRating.owner_id == models.Review.owner_id)
+        .where(models.Review.owner_id.in_(owner_ids), models.OwnerRating.owner_id.is_(None))
+    ).scalars().all()
+    refresh_owner_ratings(connection, missing)
+
+
+def upgrade(ctx):
+    properties = ctx.in_batches(models.Property.id, _fill_cards)
+    owners = ctx.in_batches(models.Review.owner_id, _fill_ratings)
+    ctx.log(f"      checked the cards of {properties:,} properties and the ratings of {owners:,} owners")
+    # A later migration that adds a table calls this again for its counter
+    ensure_table_versions(ctx.engine)
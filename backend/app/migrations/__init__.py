@@ -0,0 +1,367 @@
+"""
+Versioned schema migrations
+
+Every module in this package named NNNN_description.py is one migration: an
+upgrade(ctx) function, with the first docstring line as its description.
+Pending migrations run in version order and each applied version is recorded
+in `schema_migrations`, so a deploy only runs what is new:
+
+    python -m app.migrate_db            apply every pending migration
+    python -m app.migrate_db --status   list applied and pending versions
+
+The server does not change the schema when it starts (unless
+MIGRATE_ON_STARTUP=1); it only logs a warning when migrations are pending.
+
+Steps are written for a live database, through the MigrationContext helpers:
+
+    create_index     PostgreSQL builds CREATE INDEX CONCURRENTLY outside a
+                     transaction (writes continue; an invalid index left by an
+                     interrupted build is dropped and rebuilt). SQLite has no
+                     online build, so each index gets its own short write
+                     transaction (readers are not blocked in WAL mode)
+    add_column       nullable or constant-default columns only, which neither
+                     database rewrites the table for
+    backfill         UPDATE in primary-key ranges of MIGRATION_BATCH_SIZE rows
+                     (default 5000), one transaction per range, with an
+                     optional MIGRATION_BATCH_PAUSE_MS between them
+    in_batches       the same batching for work done in Python, such as
+                     filling a read model for a range of keys
+
+DDL on PostgreSQL runs with lock_timeout = MIGRATION_LOCK_TIMEOUT_MS (default
+5000) so an ALTER stuck behind a long query fails instead of queueing every
+other query behind it; rerun the migration later. Concurrent runners (e.g.
+several workers started with MIGRATE_ON_STARTUP=1) are serialised: with an
+advisory lock on PostgreSQL, with a lock on `<database file>.migrate-lock` on
+SQLite. Each one reads the applied versions once it holds the lock.
+
+Every step checks before it changes anything (the helpers do), because a new
+database gets the full current schema from 0001 and databases created before
+this runner existed already have some of the later changes.
+"""
+import importlib
+import logging
+import os
+import pkgutil
+import re
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import ModuleType
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, insert, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+
+from app import models
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+MIGRATION_BATCH_PAUSE_MS = int(os.getenv("MIGRATION_BATCH_PAUSE_MS", "0"))
+MIGRATION_LOCK_TIMEOUT_MS = int(os.getenv("MIGRATION_LOCK_TIMEOUT_MS", "5000"))
+
+# Arbitrary constant identifying the runner's pg_advisory_lock
+_ADVISORY_LOCK_KEY = 724_310_025
+
+# Kept out of models.Base so the read models and table_versions ignore it
+schema_migrations = Table(
+    "schema_migrations", MetaData(),
+    Column("version", String(16), primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: str
+    name: str
+    module: ModuleType
+
+    @property
+    def description(self) -> str:
+        doc = (self.module.__doc__ or "").strip()
+        return doc.splitlines()[0] if doc else self.name.replace("_", " ")
+
+
+def discover() -> list:
+    """Every migration in this package, in version order"""
+    found = {}
+    for info in pkgutil.iter_modules(__path__):
+        match = re.fullmatch(r"(\d{4})_(\w+)", info.name)
+        if not match:
+            continue
+        version, name = match.groups()
+        if version in found:
+            raise RuntimeError(f"Two migrations share version {version}: {found[version].name} and {name}")
+        found[version] = Migration(version, name, importlib.import_module(f"{__name__}.{info.name}"))
+    return [found[version] for version in sorted(found)]
+
+
+def applied_versions(engine) -> set:
+    if not inspect(engine).has_table(schema_migrations.name):
+        return set()
+    with engine.connect() as connection:
+        return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+def pending_migrations(engine) -> list:
+    applied = applied_versions(engine)
+    return [migration for migration in discover() if migration.version not in applied]
+
+
+class MigrationContext:
+    """What a migration's upgrade() works with; every helper is safe to repeat"""
+
+    def __init__(self, engine, log=logger.info):
+        self.engine = engine
+        self.dialect = engine.dialect.name
+        self.log = log
+
+    @property
+    def postgresql(self) -> bool:
+        return self.dialect == "postgresql"
+
+    @property
+    def sqlite(self) -> bool:
+        return self.dialect == "sqlite"
+
+    def execute(self, statement: str, params=None):
+        """Run one statement in its own transaction"""
+        with self.engine.begin() as connection:
+            if self.postgresql:
+                connection.execute(text(f"SET LOCAL lock_timeout = {MIGRATION_LOCK_TIMEOUT_MS}"))
+            return connection.execute(text(statement), params or {})
+
+    def has_table(self, table: str) -> bool:
+        return inspect(self.engine).has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column in {info["name"] for info in inspect(self.engine).get_columns(table)}
+
+    def has_index(self, name: str, table: str) -> bool:
+        inspector = inspect(self.engine)
+        names = {index["name"] for index in inspector.get_indexes(table)}
+        names.update(constraint["name"] for constraint in inspector.get_unique_constraints(table))
+        return name in names
+
+    def create_tables(self) -> list:
+        """Create the model tables this database lacks (with their indexes; they are empty)"""
+        existing = set(inspect(self.engine).get_table_names())
+        missing = [table for table in models.Base.metadata.sorted_tables if table.name not in existing]
+        if missing:
+            models.Base.metadata.create_all(bind=self.engine, tables=missing)
+            for table in missing:
+                self.log(f"      created table {table.name}")
+        return missing
+
+    def add_column(self, column: Column, default_sql: str = None) -> bool:
+        """Add a model column to its existing table; nullable, or with a constant default"""
+        table = column.table.name
+        if not self.has_table(table) or self.has_column(table, column.name):
+            return False
+        ddl = f"ALTER TABLE {table} ADD COLUMN {column.name} {column.type.compile(dialect=self.engine.dialect)}"
+        if default_sql is not None:
+            ddl += f" DEFAULT {default_sql}"
+        self.execute(ddl)
+        self.log(f"      added column {table}.{column.name}")
+        return True
+
+    def create_index(self, index) -> bool:
+        """Build one of the models' indexes if it is missing"""
+        ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=self.engine.dialect))
+        return self.create_index_sql(index.name, index.table.name, ddl)
+
+    def create_index_sql(self, name: str, table: str, ddl: str) -> bool:
+        """Run a CREATE INDEX statement for an index that may not exist yet, without blocking writes"""
+        if not self.has_table(table):
+            return False
+        if self.postgresql:
+            self._drop_invalid_index(name)
+        if self.has_index(name, table):
+            return False
+        start = time.perf_counter()
+        if self.postgresql:
+            ddl = re.sub(r"^\s*CREATE (UNIQUE )?INDEX", r"CREATE \1INDEX CONCURRENTLY", ddl, count=1)
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.execute(text(ddl))
+        else:
+            with self.engine.begin() as connection:
+                connection.execute(text(ddl))
+        self.log(f"      built index {name} in {time.perf_counter() - start:.1f}s")
+        return True
+
+    def _drop_invalid_index(self, name: str) -> None:
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            valid = connection.execute(text(
+                "SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ), {"name": name}).scalar()
+            if valid is False:
+                self.log(f"      dropping invalid index {name} left by an interrupted build")
+                connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    def create_missing_indexes(self) -> int:
+        """Every index declared on the models that an existing table lacks"""
+        created = 0
+        existing = set(inspect(self.engine).get_table_names())
+        for table in models.Base.metadata.sorted_tables:
+            if table.name in existing:
+                for index in sorted(table.indexes, key=lambda index: index.name):
+                    created += self.create_index(index)
+        return created
+
+    def in_batches(self, column, apply, batch_size: int = None) -> int:
+        """
+        Call apply(connection, keys) for consecutive batches of the column's
+        distinct values, in order, one transaction per batch; returns the
+        number of keys visited.
+        """
+        batch_size = batch_size or MIGRATION_BATCH_SIZE
+        visited = 0
+        last = None
+        while True:
+            query = select(column).distinct().order_by(column).limit(batch_size)
+            if last is not None:
+                query = query.where(column > last)
+            with self.engine.begin() as connection:
+                keys = connection.execute(query).scalars().all()
+                if not keys:
+                    break
+                apply(connection, keys)
+            visited += len(keys)
+            last = keys[-1]
+            if MIGRATION_BATCH_PAUSE_MS:
+                time.sleep(MIGRATION_BATCH_PAUSE_MS / 1000)
+        return visited
+
+    def backfill(self, table: str, assignments: str, where: str, key: str = "id",
+                 batch_size: int = None) -> int:
+        """
+        UPDATE table SET assignments WHERE where, one key range per transaction.
+
+        Ranges are walked in primary-key order, so each row is visited once
+        and no transaction holds more than batch_size rows.
+        """
+        batch_size = batch_size or MIGRATION_BATCH_SIZE
+        updated = 0
+        last = None
+        start = time.perf_counter()
+        while True:
+            after = [] if last is None else [f"{key} > :last"]
+            with self.engine.begin() as connection:
+                upper = connection.execute(text(
+                    f"SELECT {key} FROM {table} {'WHERE ' + after[0] if after else ''} "
+                    f"ORDER BY {key} LIMIT 1 OFFSET :skip"
+                ), {"last": last, "skip": batch_size - 1}).scalar()
+                bound = [] if upper is None else [f"{key} <= :upper"]
+                result = connection.execute(text(
+                    f"UPDATE {table} SET {assignments} WHERE {' AND '.join(after + bound + [f'({where})'])}"
+                ), {"last": last, "upper": upper})
+                updated += max(result.rowcount, 0)
+            if upper is None:
+                break
+            last = upper
+            if MIGRATION_BATCH_PAUSE_MS:
+                time.sleep(MIGRATION_BATCH_PAUSE_MS / 1000)
+        self.log(f"      backfilled {updated:,} row(s) of {table} in {time.perf_counter() - start:.1f}s")
+        return updated
+
+
+@contextmanager
+def _file_lock(path: str):
+    """Exclusive lock on a file, released by the OS if the process dies"""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after 10 s; keep waiting
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _runner_lock(engine):
+    """One runner at a time per database"""
+    if engine.dialect.name == "sqlite":
+        # The migrations write through several connections, so a lock held
+        # in the database itself would block them too
+        database = engine.url.database
+        if not database or database == ":memory:" or engine.url.query.get("mode") == "memory":
+            yield
+        else:
+            with _file_lock(os.path.abspath(database) + ".migrate-lock"):
+                yield
+        return
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        try:
+            yield
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+
+
+def upgrade(engine, target: str = None, log=logger.info) -> list:
+    """Apply the pending migrations up to target (all by default); returns the applied ones"""
+    applied = []
+    with _runner_lock(engine):
+        # Read under the lock: another runner may have just applied them
+        schema_migrations.create(engine, checkfirst=True)
+        done = applied_versions(engine)
+        context = MigrationContext(engine, log)
+        for migration in discover():
+            if target is not None and migration.version > target:
+                break
+            if migration.version in done:
+                continue
+            log(f"   ▶ {migration.version} {migration.description}")
+            start = time.perf_counter()
+            migration.module.upgrade(context)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(schema_migrations).values(
+                        version=migration.version, name=migration.name,
+                        applied_at=datetime.now(timezone.utc).replace(tzinfo=None)
+                    ))
+            except IntegrityError:
+                # Recorded meanwhile by a runner that does not take the lock (an older version)
+                pass
+            log(f"     done in {time.perf_counter() - start:.1f}s")
+            applied.append(migration)
+    return applied
+
+
+def check_schema(engine) -> list:
+    """Log a warning when the database is behind the code; used at server startup"""
+    try:
+        pending = pending_migrations(engine)
+    except Exception as e:  # the server still starts; requests will show the real error
+        logger.warning("Could not check schema migrations: %s", e)
+        return []
+    if pending:
+        logger.warning(
+            "%d schema migration(s) pending (%s); run: python -m app.migrate_db",
+            len(pending), ", ".join(migration.version for migration in pending)
+        )
+    return pending
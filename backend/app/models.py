@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from app.database import Base
 
 
@@ -43,6 +43,11 @@ class Property(Base):
 
     owner = relationship("User", backref="properties")
 
+    __table_args__ = (
+        # An owner's listings, newest first (owner pages, owners' visits)
+        Index("ix_properties_owner_id_created_at", "owner_id", "created_at"),
+    )
+
 
 class PropertyImage(Base):
     __tablename__ = "property_images"
@@ -55,6 +60,45 @@ class PropertyImage(Base):
 
     property = relationship("Property", backref="images")
 
+    __table_args__ = (
+        # Image lists and the primary-image lookup of the listing cards
+        Index("ix_property_images_property_id", "property_id"),
+    )
+
+
+class ListingCard(Base):
+    """Denormalized read model for listing cards, kept in sync by app.listing_cards"""
+    __tablename__ = "listing_cards"
+
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True))  # Copied from properties for keyset pagination
+    price = Column(Float, nullable=False)
+    price_label = Column(String, nullable=False)  # e.g. "1200 RON/lună" or "95000 EUR"
+    description = Column(Text, nullable=False)  # Snippet, see listing_cards.SNIPPET_LENGTH
+    image = Column(String, nullable=True)  # Primary image URL
+    location = Column(String, nullable=False)
+    rooms = Column(Integer, nullable=False)
+    type = Column(String, nullable=False)
+    updated_at = Column(DateTime)  # UTC time the card was last rewritten; watermark for exports
+
+    __table_args__ = (
+        Index("ix_listing_cards_created_at_property_id", "created_at", "property_id"),
+        Index("ix_listing_cards_updated_at_property_id", "updated_at", "property_id"),
+        # Rent/sale pages in keyset order, without a sort
+        Index("ix_listing_cards_type_created_at_property_id", "type", "created_at", "property_id"),
+        # Price ranges; type and rooms let the other filters and the total count read only the index
+        Index("ix_listing_cards_price_type_rooms", "price", "type", "rooms"),
+    )
+
+
+class PlatformCounter(Base):
+    """Platform-wide counter for GET /api/stats, kept in sync by app.platform_counters"""
+    __tablename__ = "platform_counters"
+
+    name = Column(String, primary_key=True)  # "total_listings", "verified_landlords", "active_users"
+    value = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False)  # UTC time of the last full recount
+
 
 class Visit(Base):
     __tablename__ = "visits"
@@ -71,6 +115,20 @@ class Visit(Base):
     property = relationship("Property", backref="visits")
     buyer = relationship("User", foreign_keys=[buyer_id], backref="scheduled_visits")
 
+    __table_args__ = (
+        # Slot lookups filter on all three (availability, booking checks)
+        Index("ix_visits_property_date_status", "property_id", "visit_date", "status"),
+        # A buyer's visits in date order (my-visits, review eligibility)
+        Index("ix_visits_buyer_id_status_date_time", "buyer_id", "status", "visit_date", "visit_time"),
+        # One scheduled visit per slot; enforced by the database, not a prior SELECT
+        Index(
+            "uq_visits_scheduled_slot", "property_id", "visit_date", "visit_time",
+            unique=True,
+            sqlite_where=text("status = 'scheduled'"),
+            postgresql_where=text("status = 'scheduled'")
+        ),
+    )
+
 
 class Review(Base):
     __tablename__ = "reviews"
@@ -89,3 +147,38 @@ class Review(Base):
     property = relationship("Property", backref="reviews")
     visit = relationship("Visit", backref="review")
 
+    __table_args__ = (
+        # Review pages, newest first, in keyset order
+        Index("ix_reviews_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_reviews_property_id_created_at_id", "property_id", "created_at", "id"),
+        # One review per buyer, owner and property
+        Index("ix_reviews_buyer_id_property_id", "buyer_id", "property_id", "owner_id"),
+    )
+
+
+
+class OwnerRating(Base):
+    """Per-owner review aggregate and star histogram, kept in sync by app.owner_ratings"""
+    __tablename__ = "owner_ratings"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    stars_1 = Column(Integer, nullable=False, default=0)
+    stars_2 = Column(Integer, nullable=False, default=0)
+    stars_3 = Column(Integer, nullable=False, default=0)
+    stars_4 = Column(Integer, nullable=False, default=0)
+    stars_5 = Column(Integer, nullable=False, default=0)
+
+
+
+class TableVersion(Base):
+    """Write counter per table, bumped by app.table_versions; feeds the ETags of read endpoints"""
+    __tablename__ = "table_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+# Register the session listeners that maintain the read models above
+from app import listing_cards, owner_ratings, platform_counters, property_cache, table_versions  # noqa: E402,F401
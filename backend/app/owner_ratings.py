@@ -0,0 +1,120 @@
+"""
+Owner rating aggregates
+
+`owner_ratings` holds, per owner, the review count, the rating sum and a 1-5
+star histogram. Every ORM flush that adds or deletes a Review (create_review)
+applies the change with an upsert in the same transaction, so the rating
+summary is a single primary-key read.
+
+Usage: python -m app.owner_ratings   (rebuilds every aggregate from reviews)
+"""
+from collections import defaultdict
+
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+
+STAR_COLUMNS = {stars: f"stars_{stars}" for stars in range(1, 6)}
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def summary(rating) -> dict:
+    """Summary fields for an OwnerRating row (or None for an owner without reviews)"""
+    if rating is None or not rating.review_count:
+        return {"average_rating": 0.0, "total_reviews": 0, "histogram": {stars: 0 for stars in STAR_COLUMNS}}
+    return {
+        "average_rating": round(rating.rating_sum / rating.review_count, 1),
+        "total_reviews": rating.review_count,
+        "histogram": {stars: getattr(rating, column) for stars, column in STAR_COLUMNS.items()}
+    }
+
+
+def _apply(connection, owner_id: int, changes: dict) -> None:
+    """Add count/sum/histogram deltas to one owner's row, creating it if needed"""
+    table = models.OwnerRating.__table__
+    upsert_insert = UPSERT_INSERTS.get(connection.dialect.name)
+    if upsert_insert is not None:
+        statement = upsert_insert(table).values(owner_id=owner_id, **changes)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.owner_id],
+            set_={name: table.c[name] + statement.excluded[name] for name in changes}
+        )
+        connection.execute(statement)
+        return
+
+    result = connection.execute(
+        update(table)
+        .where(table.c.owner_id == owner_id)
+        .values({name: table.c[name] + delta for name, delta in changes.items()})
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(owner_id=owner_id, **changes))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_owner_ratings(session, flush_context):
+    """Fold reviews added or deleted in this flush into their owners' aggregates"""
+    per_owner = defaultdict(lambda: defaultdict(int))
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            if isinstance(obj, models.Review) and obj.rating in STAR_COLUMNS:
+                changes = per_owner[obj.owner_id]
+                changes["review_count"] += sign
+                changes["rating_sum"] += sign * obj.rating
+                changes[STAR_COLUMNS[obj.rating]] += sign
+
+    if per_owner:
+        connection = session.connection()
+        for owner_id, changes in per_owner.items():
+            _apply(connection, owner_id, dict(changes))
+
+
+def _recompute(connection, owner_ids=None) -> int:
+    """Replace the aggregates of these owners (all when None) with fresh ones from reviews"""
+    review = models.Review
+    query = select(
+        review.owner_id,
+        func.count(review.id),
+        func.sum(review.rating),
+        *(func.sum(case((review.rating == stars, 1), else_=0)) for stars in STAR_COLUMNS)
+    ).group_by(review.owner_id)
+    existing = delete(models.OwnerRating)
+    if owner_ids is not None:
+        query = query.where(review.owner_id.in_(list(owner_ids)))
+        existing = existing.where(models.OwnerRating.owner_id.in_(list(owner_ids)))
+    rows = connection.execute(query).all()
+
+    connection.execute(existing)
+    if rows:
+        connection.execute(insert(models.OwnerRating), [
+            {
+                "owner_id": row[0],
+                "review_count": row[1],
+                "rating_sum": row[2] or 0,
+                **{column: row[2 + stars] or 0 for stars, column in STAR_COLUMNS.items()}
+            }
+            for row in rows
+        ])
+    return len(rows)
+
+
+def rebuild_owner_ratings(connection) -> int:
+    """Recompute every aggregate from the reviews table; returns the number of owners"""
+    return _recompute(connection)
+
+
+def refresh_owner_ratings(connection, owner_ids) -> int:
+    """Recompute the aggregates of the given owners only"""
+    owner_ids = list(owner_ids)
+    return _recompute(connection, owner_ids) if owner_ids else 0
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.OwnerRating.__table__])
+    with engine.begin() as connection:
+        count = rebuild_owner_ratings(connection)
+    print(f"✅ Rebuilt rating aggregates for {count} owner(s)")
@@ -0,0 +1,201 @@
+"""
+Platform counters for GET /api/stats
+
+`platform_counters` holds the three numbers shown on the landing page. Every
+ORM flush that registers a user, creates or deletes a property, or changes a
+user's is_verified/is_active flag adjusts them in the same transaction, so the
+stats endpoint never counts tables on the hot path.
+
+Writes that bypass the ORM (bulk loads, clear_data) are reconciled by a full
+recount: the bulk tools run one themselves, and the read path recounts when
+counters are missing (a new or cleared database) or older than
+STATS_RECOUNT_SECONDS, which also corrects any drift. Only one reader runs
+each periodic recount: it claims the stale rows with a conditional UPDATE
+first, and readers that claim nothing serve the stored values. Each worker
+also caches the values for STATS_CACHE_SECONDS; commits made by the same
+worker drop that cache immediately.
+
+A recount locks the counter rows before counting, so deltas committed
+meanwhile wait for it and apply on top, and upserts the rows, so it never
+conflicts with another one.
+
+Usage: python -m app.platform_counters   (recounts every counter)
+"""
+import logging
+import os
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_SECONDS = float(os.getenv("STATS_CACHE_SECONDS", "10"))
+STATS_RECOUNT_SECONDS = float(os.getenv("STATS_RECOUNT_SECONDS", "3600"))
+
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+COUNTERS = ("total_listings", "verified_landlords", "active_users")
+
+_cache = {"values": None, "expires": 0.0}
+
+
+def _is_active(value) -> bool:
+    # Rows created before the is_active column existed are NULL, which counts as active
+    return value is not False
+
+
+def count_all(connection) -> dict:
+    """Count every counter from the base tables"""
+    return {
+        "total_listings": connection.execute(select(func.count(models.Property.id))).scalar() or 0,
+        "verified_landlords": connection.execute(
+            select(func.count(models.User.id)).where(models.User.is_verified == True)
+        ).scalar() or 0,
+        "active_users": connection.execute(
+            select(func.count(models.User.id)).where(
+                (models.User.is_active == True) | (models.User.is_active.is_(None))
+            )
+        ).scalar() or 0
+    }
+
+
+def store(connection, values: dict) -> None:
+    """Write the counters, inserting missing rows and overwriting existing ones"""
+    table = models.PlatformCounter.__table__
+    now = datetime.utcnow()
+    upsert_insert = UPSERT_INSERTS.get(connection.dialect.name)
+    for name, value in values.items():
+        if upsert_insert is not None:
+            statement = upsert_insert(table).values(name=name, value=value, refreshed_at=now)
+            connection.execute(statement.on_conflict_do_update(
+                index_elements=[table.c.name],
+                set_={"value": statement.excluded.value, "refreshed_at": statement.excluded.refreshed_at}
+            ))
+            continue
+        result = connection.execute(
+            update(table).where(table.c.name == name).values(value=value, refreshed_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(table).values(name=name, value=value, refreshed_at=now))
+
+
+def _claim(connection, stale_before=None) -> int:
+    """Mark the counters (only those refreshed before stale_before, if given) as refreshed now"""
+    table = models.PlatformCounter.__table__
+    statement = update(table).values(refreshed_at=datetime.utcnow())
+    if stale_before is not None:
+        statement = statement.where(table.c.refreshed_at < stale_before)
+    return connection.execute(statement).rowcount
+
+
+def recount(connection) -> dict:
+    """Replace the stored counters with fresh counts"""
+    _claim(connection)
+    values = count_all(connection)
+    store(connection, values)
+    return values
+
+
+def get_counters(db: Session) -> dict:
+    """Return the current counters, from the worker cache when it is fresh"""
+    now = time.monotonic()
+    if _cache["values"] is not None and now < _cache["expires"]:
+        return _cache["values"]
+
+    rows = db.query(models.PlatformCounter).all()
+    values = {row.name: row.value for row in rows}
+    stale_before = datetime.utcnow() - timedelta(seconds=STATS_RECOUNT_SECONDS)
+    if set(values) != set(COUNTERS):
+        values = count_all(db.connection())
+        try:
+            store(db.connection(), values)
+            db.commit()
+        except (IntegrityError, OperationalError) as e:
+            # Another worker is storing them (or holds the write lock); serve our counts
+            db.rollback()
+            logger.info("Platform counters not stored: %s", e)
+    elif any(row.refreshed_at < stale_before for row in rows):
+        try:
+            # Whoever claims the stale rows recounts; the others serve the stored values
+            if _claim(db.connection(), stale_before):
+                values = count_all(db.connection())
+                store(db.connection(), values)
+            db.commit()
+        except OperationalError as e:
+            db.rollback()
+            logger.info("Platform counters not recounted: %s", e)
+
+    _cache["values"] = values
+    _cache["expires"] = now + STATS_CACHE_SECONDS
+    return values
+
+
+def invalidate_cache() -> None:
+    """Drop this worker's cached counters"""
+    _cache["values"] = None
+
+
+def _flag_delta(obj, attribute: str, normalize) -> int:
+    """+1/-1 when a boolean flag changed during this flush, else 0"""
+    history = inspect(obj).attrs[attribute].history
+    if not history.has_changes():
+        return 0
+    old = normalize(history.deleted[0]) if history.deleted else normalize(None)
+    new = normalize(getattr(obj, attribute))
+    return int(new) - int(old)
+
+
+def _deltas(session) -> Counter:
+    """Counter changes implied by the objects in this flush"""
+    deltas = Counter()
+    for sign, objects in ((1, session.new), (-1, session.deleted)):
+        for obj in objects:
+            if isinstance(obj, models.Property):
+                deltas["total_listings"] += sign
+            elif isinstance(obj, models.User):
+                deltas["verified_landlords"] += sign * int(bool(obj.is_verified))
+                deltas["active_users"] += sign * int(_is_active(obj.is_active))
+    for obj in session.dirty:
+        if isinstance(obj, models.User):
+            deltas["verified_landlords"] += _flag_delta(obj, "is_verified", bool)
+            deltas["active_users"] += _flag_delta(obj, "is_active", _is_active)
+    return deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_platform_counters(session, flush_context):
+    """Apply this flush's counter changes in the same transaction"""
+    connection = None
+    for name, delta in _deltas(session).items():
+        if delta:
+            connection = connection or session.connection()
+            connection.execute(
+                update(models.PlatformCounter)
+                .where(models.PlatformCounter.name == name)
+                .values(value=models.PlatformCounter.value + delta)
+            )
+            session.info["platform_counters_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_cache_on_commit(session):
+    if session.info.pop("platform_counters_changed", False):
+        invalidate_cache()
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.PlatformCounter.__table__])
+    with engine.begin() as connection:
+        values = recount(connection)
+    print("✅ Platform counters recounted:")
+    for name, value in values.items():
+        print(f"   {name}: {value}")
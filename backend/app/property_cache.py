@@ -0,0 +1,71 @@
+"""
+Cached GET /api/properties/{id} responses
+
+The serialized PropertyDetails of each property is kept in the response cache
+(app.utils.response_cache) under `property:{id}`. Every ORM flush that touches
+a property, one of its images, or the public profile of its owner records the
+affected ids; once the transaction commits their entries are dropped, so the
+next view rebuilds them.
+
+Writes that bypass the ORM (bulk loads, clear_data) should call
+response_cache.clear(); otherwise entries expire after RESPONSE_CACHE_SECONDS.
+"""
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.response_cache import response_cache
+
+# User columns that appear in PropertyDetails.owner
+OWNER_FIELDS = ("name", "account_created_year", "profile_description", "profile_image")
+
+
+def cache_key(property_id: int) -> str:
+    return f"property:{property_id}"
+
+
+def invalidate(*property_ids: int) -> None:
+    """Drop the cached details of these properties"""
+    response_cache.delete(*(cache_key(property_id) for property_id in property_ids))
+
+
+def _owner_changed(user) -> bool:
+    state = inspect(user)
+    return any(state.attrs[field].history.has_changes() for field in OWNER_FIELDS)
+
+
+def _stale_property_ids(session) -> set:
+    """Properties whose cached details this flush makes outdated"""
+    property_ids = set()
+    owner_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.Property):
+            property_ids.add(obj.id)
+        elif isinstance(obj, models.PropertyImage):
+            history = inspect(obj).attrs.property_id.history
+            property_ids.update(history.deleted)
+            property_ids.add(obj.property_id)
+        elif isinstance(obj, models.User) and obj not in session.new:
+            if obj in session.deleted or _owner_changed(obj):
+                owner_ids.add(obj.id)
+    if owner_ids:
+        property_ids.update(session.connection().execute(
+            select(models.Property.id).where(models.Property.owner_id.in_(owner_ids))
+        ).scalars())
+    property_ids.discard(None)
+    return property_ids
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_properties(session, flush_context):
+    property_ids = _stale_property_ids(session)
+    if property_ids:
+        session.info.setdefault("stale_property_ids", set()).update(property_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    # Only after the commit: dropping earlier would let a concurrent view re-cache the old row
+    property_ids = session.info.pop("stale_property_ids", None)
+    if property_ids:
+        invalidate(*property_ids)
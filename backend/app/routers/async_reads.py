@@ -0,0 +1,76 @@
+"""
+Async variants of the read-heavy routes (enabled with ASYNC_DB=1)
+
+Each ported endpoint keeps its sync implementation and runs it through
+AsyncSession.run_sync: the ORM code executes in a greenlet whose database I/O
+is awaited on the event loop, so these routes are no longer limited by the
+size of Starlette's threadpool. Route dependencies that have an
+`async_variant` (conditional_get) are swapped for it, so they share the
+endpoint's AsyncSession instead of opening a sync one.
+"""
+import functools
+import inspect
+
+from fastapi import APIRouter, Depends
+from fastapi.routing import APIRoute
+
+from app.async_database import get_async_db
+from app.routers import listings, properties, reviews, stats
+
+ASYNC_READ_ROUTES = [
+    (listings.router, [listings.get_listings]),
+    (properties.router, [properties.get_owner_properties, properties.get_property_details]),
+    (reviews.router, [reviews.get_owner_reviews, reviews.get_owner_rating_summary, reviews.get_property_reviews]),
+    (stats.router, [stats.get_stats]),
+]
+
+
+def with_async_session(endpoint):
+    """Wrap a sync endpoint taking `db: Session` into an async one using AsyncSession"""
+    signature = inspect.signature(endpoint)
+    parameters = [
+        parameter.replace(default=Depends(get_async_db)) if parameter.name == "db" else parameter
+        for parameter in signature.parameters.values()
+    ]
+
+    @functools.wraps(endpoint)
+    async def wrapper(**kwargs):
+        db = kwargs.pop("db")
+        return await db.run_sync(lambda session: endpoint(db=session, **kwargs))
+
+    wrapper.__signature__ = signature.replace(parameters=parameters)
+    return wrapper
+
+
+def _async_dependencies(dependencies) -> list:
+    return [
+        Depends(dependency.dependency.async_variant(), use_cache=dependency.use_cache)
+        if hasattr(dependency.dependency, "async_variant") else dependency
+        for dependency in dependencies
+    ]
+
+
+def _replace_endpoints(router: APIRouter, endpoints) -> None:
+    for index, route in enumerate(router.routes):
+        if isinstance(route, APIRoute) and route.endpoint in endpoints:
+            router.routes[index] = APIRoute(
+                route.path,
+                with_async_session(route.endpoint),
+                response_model=route.response_model,
+                status_code=route.status_code,
+                tags=route.tags,
+                dependencies=_async_dependencies(route.dependencies),
+                summary=route.summary,
+                description=route.description,
+                responses=route.responses,
+                methods=route.methods,
+                name=route.name,
+                include_in_schema=route.include_in_schema,
+                response_class=route.response_class
+            )
+
+
+def enable_async_reads() -> None:
+    """Swap the read-heavy routes to the async stack; call before include_router"""
+    for router, endpoints in ASYNC_READ_ROUTES:
+        _replace_endpoints(router, endpoints)
@@ -1,37 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app import models, schemas
-from app.utils.auth import verify_password, get_password_hash, create_access_token
+from app.utils.auth import create_access_token, invalidate_cached_user
+from app.utils.passwords import password_hasher
 from datetime import datetime
 
 router = APIRouter()
 
+# These routes are async so bcrypt runs in the password process pool without
+# holding a threadpool worker; their database work goes through run_in_threadpool.
+
+
+def _get_user_by_email(db: Session, email: str):
+    return db.query(models.User).filter(models.User.email == email).first()
+
+
+def _save_password_hash(db: Session, user: models.User, hashed_password: str):
+    user.hashed_password = hashed_password
+    db.commit()
+
+
+def _create_user(db: Session, new_user: models.User):
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+
 
 @router.post("/login", response_model=schemas.LoginResponse)
-def login(credentials: schemas.LoginRequest, db: Session = Depends(get_db)):
+async def login(credentials: schemas.LoginRequest, db: Session = Depends(get_db)):
     """Authenticate user and return access token"""
-    user = db.query(models.User).filter(models.User.email == credentials.email).first()
+    user = await run_in_threadpool(_get_user_by_email, db, credentials.email)
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    if not user or not await password_hasher.verify(credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email sau parolă incorectă"
         )
     
+    # Upgrade legacy plaintext values and hashes made with an older cost factor
+    if password_hasher.needs_rehash(user.hashed_password):
+        new_hash = await password_hasher.hash(credentials.password)
+        await run_in_threadpool(_save_password_hash, db, user, new_hash)
+        invalidate_cached_user(user.id)
+    
     token = create_access_token(data={"sub": user.email, "user_id": user.id})
     
     return {
         "token": token,
-        "user": schemas.UserResponse.model_validate(user)
+        "user": await run_in_threadpool(schemas.UserResponse.model_validate, user)
     }
 
 
 @router.post("/register", response_model=schemas.RegisterResponse)
-def register(user_data: schemas.RegisterRequest, db: Session = Depends(get_db)):
+async def register(user_data: schemas.RegisterRequest, db: Session = Depends(get_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(models.User).filter(models.User.email == user_data.email).first()
+    existing_user = await run_in_threadpool(_get_user_by_email, db, user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,7 +79,7 @@ def register(user_data: schemas.RegisterRequest, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)[:72]
+    hashed_password = await password_hasher.hash(user_data.password)
     current_year = datetime.now().year
     
     new_user = models.User(
@@ -65,13 +91,10 @@ def register(user_data: schemas.RegisterRequest, db: Session = Depends(get_db)):
         is_verified=False
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(_create_user, db, new_user)
     
     return {
         "success": True,
         "message": "Cont creat cu succes",
         "user": schemas.UserResponse.model_validate(new_user)
     }
-
@@ -1,80 +1,232 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session
 from typing import Optional
+from datetime import datetime, timezone
+import csv
+import io
+import os
 from app.database import get_db
 from app import models, schemas
+from app.utils.conditional import conditional_get
+from app.utils.fast_json import dumps, fast_json
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, decode_cursor, encode_cursor, invalid_cursor,
+    newest_first_after, newest_first_cursor, newest_first_key
+)
+from app.utils.search import apply_search
 
 router = APIRouter()
 
+# Rows fetched per round trip while exporting; memory use is bounded by one batch
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
 
-@router.get("", response_model=schemas.PropertyListResponse)
-def get_listings(
-    search: Optional[str] = Query(None, description="Search term for location or description"),
-    price: Optional[str] = Query(None, description="Price filter (e.g., '0-500', '500-1000')"),
-    forSale: Optional[bool] = Query(None),
-    forRent: Optional[bool] = Query(None),
-    twoPlusRooms: Optional[bool] = Query(None),
-    db: Session = Depends(get_db)
-):
-    """Get property listings with optional filters"""
-    query = db.query(models.Property)
+EXPORT_COLUMNS = [
+    "id", "title", "type", "price", "price_currency", "price_period", "price_label",
+    "rooms", "bathrooms", "surface", "location", "address", "description", "image",
+    "created_at", "updated_at"
+]
+
+
+def _filter_cards(db: Session, query, search, price, forSale, forRent, twoPlusRooms,
+                  id_column=models.ListingCard.property_id):
+    """
+    Apply the listing filters to a query over ListingCard; returns (query, score).
+
+    Pass id_column=models.Property.id when the query already joins Property,
+    so the search does not join it a second time.
+    """
+    Card = models.ListingCard
+    score = None
     
     # Apply type filter
     if forSale and not forRent:
-        query = query.filter(models.Property.type == "sale")
+        query = query.filter(Card.type == "sale")
     elif forRent and not forSale:
-        query = query.filter(models.Property.type == "rent")
+        query = query.filter(Card.type == "rent")
     
     # Apply room filter
     if twoPlusRooms:
-        query = query.filter(models.Property.rooms >= 2)
+        query = query.filter(Card.rooms >= 2)
     
     # Apply search filter
     if search:
-        search_term = f"%{search.lower()}%"
-        query = query.filter(
-            (models.Property.location.ilike(search_term)) |
-            (models.Property.description.ilike(search_term)) |
-            (models.Property.address.ilike(search_term))
-        )
+        query, score = apply_search(db, query, search, id_column=id_column)
     
     # Apply price filter
     if price:
         if price == "0-500":
-            query = query.filter(models.Property.price <= 500)
+            query = query.filter(Card.price <= 500)
         elif price == "500-1000":
-            query = query.filter(models.Property.price >= 500, models.Property.price <= 1000)
+            query = query.filter(Card.price >= 500, Card.price <= 1000)
         elif price == "1000-2000":
-            query = query.filter(models.Property.price >= 1000, models.Property.price <= 2000)
+            query = query.filter(Card.price >= 1000, Card.price <= 2000)
         elif price == "2000+":
-            query = query.filter(models.Property.price >= 2000)
+            query = query.filter(Card.price >= 2000)
+    
+    return query, score
+
+
+def _listing_item(card) -> dict:
+    """One card as a plain dict matching PropertyListItem (see fast_json)"""
+    return {
+        "id": card.property_id,
+        "price": card.price_label,
+        "description": card.description,
+        "image": card.image,
+        "location": card.location,
+        "rooms": card.rooms,
+        "type": card.type
+    }
+
+
+@router.get(
+    "",
+    response_model=schemas.PropertyListResponse,
+    dependencies=[Depends(conditional_get("listings", "properties", "property_images"))]
+)
+def get_listings(
+    response: Response,
+    search: Optional[str] = Query(None, description="Search term for location or description"),
+    price: Optional[str] = Query(None, description="Price filter (e.g., '0-500', '500-1000')"),
+    forSale: Optional[bool] = Query(None),
+    forRent: Optional[bool] = Query(None),
+    twoPlusRooms: Optional[bool] = Query(None),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: Session = Depends(get_db)
+):
+    """Get property listings with optional filters, one keyset page at a time"""
+    # Served from the denormalized listing_cards read model (see app.listing_cards)
+    Card = models.ListingCard
+    query, score = _filter_cards(db, db.query(Card), search, price, forSale, forRent, twoPlusRooms)
     
-    properties = query.all()
+    # Total over the whole filtered set, counted without loading any rows
+    total = query.with_entities(func.count(Card.property_id)).scalar() or 0
     
-    # Format listings for response
-    listings = []
-    for prop in properties:
-        # Get primary image if available
-        primary_image = next((img.image_url for img in prop.images if img.is_primary), None)
-        
-        # Format price
-        if prop.type == "rent":
-            price_str = f"{int(prop.price)} {prop.price_currency}/{prop.price_period}"
+    # Keyset pagination: relevance when the search was ranked, newest first otherwise
+    if score is not None:
+        if cursor:
+            after = decode_cursor(cursor)
+            if not isinstance(after.get("id"), int) or not isinstance(after.get("score"), (int, float)):
+                raise invalid_cursor()
+            query = query.filter(or_(
+                score > after["score"],
+                and_(score == after["score"], Card.property_id > after["id"])
+            ))
+        query = query.add_columns(score).order_by(score, Card.property_id)
+    else:
+        if cursor:
+            query = query.filter(newest_first_after(db, cursor, Card.created_at, Card.property_id))
+        query = query.add_columns(newest_first_key(db, Card.created_at)).order_by(
+            Card.created_at.desc(), Card.property_id.desc()
+        )
+    
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    # (card, score) when ranked, (card, created_at sort key) otherwise
+    cards = [card for card, _ in rows]
+    
+    next_cursor = None
+    if has_more:
+        last_card, last_key = rows[-1]
+        if score is not None:
+            next_cursor = encode_cursor({"id": last_card.property_id, "score": last_key})
         else:
-            price_str = f"{int(prop.price)} {prop.price_currency}"
-        
-        listings.append(schemas.PropertyListItem(
-            id=prop.id,
-            price=price_str,
-            description=prop.description,
-            image=primary_image,
-            location=prop.location,
-            rooms=prop.rooms,
-            type=prop.type
-        ))
+            next_cursor = newest_first_cursor(last_key, last_card.property_id)
     
-    return {
-        "listings": listings,
-        "total": len(listings)
-    }
+    return fast_json({
+        "listings": [_listing_item(card) for card in cards],
+        "total": total,
+        "next_cursor": next_cursor
+    }, response)
+
+
+
+def _parse_watermark(value: str) -> datetime:
+    """ISO 8601 timestamp as naive UTC, the way listing_cards.updated_at is stored"""
+    try:
+        watermark = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="updated_since trebuie să fie o dată ISO 8601 (ex. 2025-01-31T12:00:00Z)"
+        )
+    if watermark.tzinfo is not None:
+        watermark = watermark.astimezone(timezone.utc).replace(tzinfo=None)
+    return watermark
+
+
+def _export_row(row) -> dict:
+    return {column: getattr(row, column) for column in EXPORT_COLUMNS}
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
 
+def _stream_rows(bind, statement, format: str):
+    """Yield the export body batch by batch from a dedicated server-side cursor"""
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue().encode("utf-8")
+    
+    with bind.connect() as connection:
+        result = connection.execution_options(yield_per=EXPORT_BATCH_SIZE).execute(statement)
+        for batch in result.partitions():
+            if format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_csv_value(getattr(row, column)) for column in EXPORT_COLUMNS] for row in batch)
+                yield buffer.getvalue().encode("utf-8")
+            else:
+                yield b"".join(dumps(_export_row(row)) + b"\n" for row in batch)
+
+
+@router.get("/export")
+def export_listings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson (one JSON object per line) or csv"),
+    updated_since: Optional[str] = Query(None, description="Only listings changed at or after this ISO 8601 time"),
+    search: Optional[str] = Query(None, description="Search term for location or description"),
+    price: Optional[str] = Query(None, description="Price filter (e.g., '0-500', '500-1000')"),
+    forSale: Optional[bool] = Query(None),
+    forRent: Optional[bool] = Query(None),
+    twoPlusRooms: Optional[bool] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream the whole catalogue (or a filtered part of it) for partners.
+
+    Rows are ordered by (updated_at, id). For incremental pulls, pass the
+    largest updated_at seen so far as updated_since; the bound is inclusive,
+    so deduplicate by id. Deleted listings are not reported.
+    """
+    Card = models.ListingCard
+    query = db.query(
+        Card.property_id.label("id"), models.Property.title, Card.type, Card.price,
+        models.Property.price_currency, models.Property.price_period, Card.price_label,
+        Card.rooms, models.Property.bathrooms, models.Property.surface, Card.location,
+        models.Property.address, models.Property.description, Card.image,
+        Card.created_at, Card.updated_at
+    ).join(models.Property, models.Property.id == Card.property_id)
+    query, _ = _filter_cards(
+        db, query, search, price, forSale, forRent, twoPlusRooms, id_column=models.Property.id
+    )
+    if updated_since:
+        query = query.filter(Card.updated_at >= _parse_watermark(updated_since))
+    statement = query.order_by(Card.updated_at, Card.property_id).statement
+    
+    # Validation happened above; the rows are read while the body streams, one
+    # batch per chunk, so a slow client simply pauses the cursor
+    if format == "csv":
+        return StreamingResponse(
+            _stream_rows(db.get_bind(), statement, "csv"),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": 'attachment; filename="listings.csv"'}
+        )
+    return StreamingResponse(_stream_rows(db.get_bind(), statement, "ndjson"), media_type="application/x-ndjson")
@@ -1,60 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
 from app.database import get_db
 from app import models, schemas
-from app.utils.auth import get_password_hash, verify_password, decode_access_token
+from app.utils.auth import get_current_user, invalidate_cached_user
+from app.utils.passwords import password_hasher
 
 router = APIRouter()
 
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user from token"""
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de autentificare lipsă"
-        )
-    
-    # Extract token from "Bearer <token>" format
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise ValueError()
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Format token invalid. Folosiți: Bearer <token>"
-        )
-    
-    payload = decode_access_token(token)
-    
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid sau expirat"
-        )
-    
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid"
-        )
-    
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Utilizatorul nu a fost găsit sau contul este dezactivat"
-        )
-    
-    return user
-
-
 @router.get("", response_model=schemas.UserProfileResponse)
 def get_profile(current_user: models.User = Depends(get_current_user)):
     """Get current user's profile"""
@@ -79,20 +33,21 @@ def update_profile(
         current_user.profile_description = profile_data.description
     
     db.commit()
+    invalidate_cached_user(current_user.id)
     db.refresh(current_user)
     
     return schemas.UserProfileResponse.model_validate(current_user)
 
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: schemas.ChangePasswordRequest,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Change user's password"""
+    """Change user's password (async so bcrypt runs in the password process pool)"""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await password_hasher.verify(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Parola curentă este incorectă"
@@ -106,8 +61,9 @@ def change_password(
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)[:72]
-    db.commit()
+    current_user.hashed_password = await password_hasher.hash(password_data.new_password)
+    await run_in_threadpool(db.commit)
+    invalidate_cached_user(current_user.id)
     
     return {"success": True, "message": "Parola a fost schimbată cu succes"}
 
@@ -120,6 +76,7 @@ def deactivate_account(
     """Deactivate user account"""
     current_user.is_active = False
     db.commit()
+    invalidate_cached_user(current_user.id)
     
     return {"success": True, "message": "Contul a fost dezactivat"}
 
@@ -1,60 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import Optional
 from app.database import get_db
 from app import models, schemas
-from app.utils.auth import decode_access_token
+from app.property_cache import cache_key
+from app.utils.auth import get_current_user
+from app.utils.conditional import cache_policy, conditional_get
+from app.utils.fast_json import fast_json
+from app.utils.response_cache import json_response, make_etag, response_cache
 
 router = APIRouter()
 
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user from token"""
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de autentificare lipsă"
-        )
-    
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise ValueError()
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Format token invalid"
-        )
-    
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid sau expirat"
-        )
-    
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid"
-        )
-    
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Utilizatorul nu a fost găsit sau contul este dezactivat"
-        )
-    
-    return user
+def _owner_property_dict(property: models.Property, images, owner: models.User) -> dict:
+    """One property of GET /owner/{owner_id} as a JSON-ready dict (see fast_json)"""
+    # Format price
+    if property.type == "rent":
+        price_str = f"{int(property.price)} {property.price_currency}/{property.price_period}"
+    else:
+        price_str = f"{int(property.price)} {property.price_currency}"
+    
+    return {
+        "id": property.id,
+        "title": property.title,
+        "description": property.description,
+        "price": price_str,
+        "property_type": property.property_type if hasattr(property, 'property_type') else property.type,
+        "transaction_type": property.transaction_type if hasattr(property, 'transaction_type') else property.type,
+        "rooms": property.rooms,
+        "bathrooms": property.bathrooms,
+        "area": property.area if hasattr(property, 'area') else property.surface,
+        "address": property.address,
+        "city": property.city if hasattr(property, 'city') else property.location,
+        "has_parking": property.has_parking if hasattr(property, 'has_parking') else False,
+        "has_elevator": property.has_elevator if hasattr(property, 'has_elevator') else False,
+        "has_balcony": property.has_balcony if hasattr(property, 'has_balcony') else False,
+        "is_furnished": property.is_furnished if hasattr(property, 'is_furnished') else False,
+        "floor": property.floor if hasattr(property, 'floor') else None,
+        "year_built": property.year_built if hasattr(property, 'year_built') else None,
+        "created_at": property.created_at,
+        "images": [{"id": img.id, "url": img.image_url} for img in images],
+        "owner": {
+            "id": owner.id,
+            "name": owner.name,
+            "email": owner.email,
+            "profile_image": owner.profile_image,
+            "account_created_year": owner.account_created_year,
+            "profile_description": owner.profile_description
+        }
+    }
 
 
-@router.get("/owner/{owner_id}")
-def get_owner_properties(owner_id: int, db: Session = Depends(get_db)):
+@router.get(
+    "/owner/{owner_id}",
+    dependencies=[Depends(conditional_get("owner_properties", "properties", "property_images", "users"))]
+)
+def get_owner_properties(owner_id: int, response: Response, db: Session = Depends(get_db)):
     """Get all properties for a specific owner"""
     # Verify owner exists
     owner = db.query(models.User).filter(models.User.id == owner_id).first()
@@ -69,56 +69,41 @@ def get_owner_properties(owner_id: int, db: Session = Depends(get_db)):
         models.Property.owner_id == owner_id
     ).order_by(models.Property.created_at.desc()).all()
     
-    # Build response with images and owner info
-    result = []
-    for property in properties:
-        images = db.query(models.PropertyImage).filter(
-            models.PropertyImage.property_id == property.id
+    # Load the images of all properties in one query, grouped per property
+    images_by_property = {}
+    if properties:
+        all_images = db.query(models.PropertyImage).filter(
+            models.PropertyImage.property_id.in_([property.id for property in properties])
         ).order_by(models.PropertyImage.is_primary.desc(), models.PropertyImage.order).all()
-        
-        # Format price
-        if property.type == "rent":
-            price_str = f"{int(property.price)} {property.price_currency}/{property.price_period}"
-        else:
-            price_str = f"{int(property.price)} {property.price_currency}"
-        
-        property_dict = {
-            "id": property.id,
-            "title": property.title,
-            "description": property.description,
-            "price": price_str,
-            "property_type": property.property_type if hasattr(property, 'property_type') else property.type,
-            "transaction_type": property.transaction_type if hasattr(property, 'transaction_type') else property.type,
-            "rooms": property.rooms,
-            "bathrooms": property.bathrooms,
-            "area": property.area if hasattr(property, 'area') else property.surface,
-            "address": property.address,
-            "city": property.city if hasattr(property, 'city') else property.location,
-            "has_parking": property.has_parking if hasattr(property, 'has_parking') else False,
-            "has_elevator": property.has_elevator if hasattr(property, 'has_elevator') else False,
-            "has_balcony": property.has_balcony if hasattr(property, 'has_balcony') else False,
-            "is_furnished": property.is_furnished if hasattr(property, 'is_furnished') else False,
-            "floor": property.floor if hasattr(property, 'floor') else None,
-            "year_built": property.year_built if hasattr(property, 'year_built') else None,
-            "created_at": property.created_at,
-            "images": [{"id": img.id, "url": img.image_url} for img in images],
-            "owner": {
-                "id": owner.id,
-                "name": owner.name,
-                "email": owner.email,
-                "profile_image": owner.profile_image,
-                "account_created_year": owner.account_created_year,
-                "profile_description": owner.profile_description
-            }
-        }
-        result.append(property_dict)
+        for img in all_images:
+            images_by_property.setdefault(img.property_id, []).append(img)
+    
+    # Build response with images and owner info
+    result = [
+        _owner_property_dict(property, images_by_property.get(property.id, []), owner)
+        for property in properties
+    ]
     
-    return result
+    return fast_json(result, response)
 
 
 @router.get("/{property_id}", response_model=schemas.PropertyDetails)
-def get_property_details(property_id: int, db: Session = Depends(get_db)):
-    """Get detailed information about a specific property"""
+def get_property_details(property_id: int, request: Request, db: Session = Depends(get_db)):
+    """Get detailed information about a specific property (served from the response cache)"""
+    entry = response_cache.get(cache_key(property_id))
+    if entry is None:
+        body = build_property_details(property_id, db).model_dump_json().encode("utf-8")
+        entry = (make_etag(body), body)
+        response_cache.set(cache_key(property_id), entry)
+    
+    # Validated by the body's own ETag, which only changes with this property
+    return json_response(
+        request, entry, headers={"Cache-Control": cache_policy("property")}, key=cache_key(property_id)
+    )
+
+
+def build_property_details(property_id: int, db: Session) -> schemas.PropertyDetails:
+    """Load a property with its images and owner"""
     property = db.query(models.Property).filter(models.Property.id == property_id).first()
     
     if not property:
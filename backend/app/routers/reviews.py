@@ -1,57 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional, List
+from typing import List, Optional
 from app.database import get_db
 from app import models, schemas
-from app.utils.auth import decode_access_token
+from app.utils.auth import get_current_user
+from app.utils.conditional import conditional_get
+from app.utils.pagination import newest_first_after, newest_first_cursor, newest_first_key
+from app.owner_ratings import summary
 
 router = APIRouter()
 
+REVIEWS_PAGE_SIZE = 50
+REVIEWS_MAX_PAGE_SIZE = 200
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user from token"""
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de autentificare lipsă"
-        )
-    
-    try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise ValueError()
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Format token invalid"
-        )
-    
-    payload = decode_access_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid sau expirat"
-        )
-    
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid"
-        )
-    
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Utilizatorul nu a fost găsit sau contul este dezactivat"
-        )
-    
-    return user
+
+def _review_page(db: Session, criterion, limit: int, cursor: Optional[str]):
+    """
+    One page of reviews matching criterion, newest first, with buyer names and
+    property titles fetched in the same joined query.
+
+    Returns (review responses, next cursor or None).
+    """
+    query = db.query(
+        models.Review,
+        models.User.name,
+        models.Property.title,
+        newest_first_key(db, models.Review.created_at)
+    ).outerjoin(
+        models.User, models.User.id == models.Review.buyer_id
+    ).outerjoin(
+        models.Property, models.Property.id == models.Review.property_id
+    ).filter(criterion)
+    
+    if cursor:
+        query = query.filter(newest_first_after(db, cursor, models.Review.created_at, models.Review.id))
+    
+    rows = query.order_by(models.Review.created_at.desc(), models.Review.id.desc()).limit(limit + 1).all()
+    next_cursor = newest_first_cursor(rows[limit - 1][3], rows[limit - 1][0].id) if len(rows) > limit else None
+    
+    review_responses = [
+        _review_response(review, buyer_name, property_title)
+        for review, buyer_name, property_title, _ in rows[:limit]
+    ]
+    
+    return review_responses, next_cursor
+
+
+def _review_response(review: models.Review, buyer_name: Optional[str], property_title: Optional[str]) -> schemas.ReviewResponse:
+    review_dict = {
+        "id": review.id,
+        "owner_id": review.owner_id,
+        "buyer_id": review.buyer_id,
+        "property_id": review.property_id,
+        "visit_id": review.visit_id,
+        "rating": review.rating,
+        "comment": review.comment,
+        "created_at": review.created_at,
+        "buyer_name": buyer_name,
+        "property_title": property_title
+    }
+    return schemas.ReviewResponse(**review_dict)
 
 
 @router.post("", response_model=schemas.ReviewResponse)
@@ -150,28 +158,21 @@ def create_review(
     # Get buyer info for response
     buyer = db.query(models.User).filter(models.User.id == current_user.id).first()
     
-    review_dict = {
-        "id": new_review.id,
-        "owner_id": new_review.owner_id,
-        "buyer_id": new_review.buyer_id,
-        "property_id": new_review.property_id,
-        "visit_id": new_review.visit_id,
-        "rating": new_review.rating,
-        "comment": new_review.comment,
-        "created_at": new_review.created_at,
-        "buyer_name": buyer.name if buyer else None,
-        "property_title": property.title if property else None
-    }
-    
-    return schemas.ReviewResponse(**review_dict)
+    return _review_response(new_review, buyer.name if buyer else None, property.title if property else None)
 
 
-@router.get("/owner/{owner_id}", response_model=schemas.OwnerRatingResponse)
+@router.get(
+    "/owner/{owner_id}",
+    response_model=schemas.OwnerRatingResponse,
+    dependencies=[Depends(conditional_get("reviews", "reviews", "users", "properties"))]
+)
 def get_owner_reviews(
     owner_id: int,
+    limit: int = Query(REVIEWS_PAGE_SIZE, ge=1, le=REVIEWS_MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
     db: Session = Depends(get_db)
 ):
-    """Get all reviews for a specific owner"""
+    """Get reviews for a specific owner, one page at a time"""
     # Verify owner exists
     owner = db.query(models.User).filter(models.User.id == owner_id).first()
     if not owner:
@@ -180,51 +181,53 @@ def get_owner_reviews(
             detail="Proprietarul nu a fost găsit"
         )
     
-    # Get all reviews for this owner
-    reviews = db.query(models.Review).filter(
-        models.Review.owner_id == owner_id
-    ).order_by(models.Review.created_at.desc()).all()
-    
-    # Calculate average rating
-    if reviews:
-        avg_rating = sum(review.rating for review in reviews) / len(reviews)
-    else:
-        avg_rating = 0.0
+    # Rating over all of the owner's reviews, from the materialized aggregate
+    rating = summary(db.get(models.OwnerRating, owner_id))
     
-    # Build response with buyer and property info
-    review_responses = []
-    for review in reviews:
-        buyer = db.query(models.User).filter(models.User.id == review.buyer_id).first()
-        property = db.query(models.Property).filter(models.Property.id == review.property_id).first()
-        
-        review_dict = {
-            "id": review.id,
-            "owner_id": review.owner_id,
-            "buyer_id": review.buyer_id,
-            "property_id": review.property_id,
-            "visit_id": review.visit_id,
-            "rating": review.rating,
-            "comment": review.comment,
-            "created_at": review.created_at,
-            "buyer_name": buyer.name if buyer else None,
-            "property_title": property.title if property else None
-        }
-        review_responses.append(schemas.ReviewResponse(**review_dict))
+    review_responses, next_cursor = _review_page(db, models.Review.owner_id == owner_id, limit, cursor)
     
     return {
         "owner_id": owner_id,
-        "average_rating": round(avg_rating, 1),
-        "total_reviews": len(reviews),
-        "reviews": review_responses
+        "average_rating": rating["average_rating"],
+        "total_reviews": rating["total_reviews"],
+        "reviews": review_responses,
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/property/{property_id}", response_model=List[schemas.ReviewResponse])
+@router.get(
+    "/owner/{owner_id}/summary",
+    response_model=schemas.OwnerRatingSummary,
+    dependencies=[Depends(conditional_get("reviews", "reviews", "users"))]
+)
+def get_owner_rating_summary(owner_id: int, db: Session = Depends(get_db)):
+    """Get an owner's average rating, review count and star histogram"""
+    rating = db.get(models.OwnerRating, owner_id)
+    if rating is None:
+        # No reviews yet; still distinguish an unknown owner
+        owner = db.get(models.User, owner_id)
+        if not owner:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proprietarul nu a fost găsit"
+            )
+    
+    return {"owner_id": owner_id, **summary(rating)}
+
+
+@router.get(
+    "/property/{property_id}",
+    response_model=List[schemas.ReviewResponse],
+    dependencies=[Depends(conditional_get("reviews", "reviews", "users", "properties"))]
+)
 def get_property_reviews(
     property_id: int,
+    response: Response,
+    limit: int = Query(REVIEWS_PAGE_SIZE, ge=1, le=REVIEWS_MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
     db: Session = Depends(get_db)
 ):
-    """Get all reviews for a specific property"""
+    """Get reviews for a specific property, one page at a time"""
     # Verify property exists
     property = db.query(models.Property).filter(models.Property.id == property_id).first()
     if not property:
@@ -233,28 +236,10 @@ def get_property_reviews(
             detail="Proprietatea nu a fost găsită"
         )
     
-    # Get all reviews for this property
-    reviews = db.query(models.Review).filter(
-        models.Review.property_id == property_id
-    ).order_by(models.Review.created_at.desc()).all()
+    review_responses, next_cursor = _review_page(db, models.Review.property_id == property_id, limit, cursor)
     
-    # Build response
-    review_responses = []
-    for review in reviews:
-        buyer = db.query(models.User).filter(models.User.id == review.buyer_id).first()
-        
-        review_dict = {
-            "id": review.id,
-            "owner_id": review.owner_id,
-            "buyer_id": review.buyer_id,
-            "property_id": review.property_id,
-            "visit_id": review.visit_id,
-            "rating": review.rating,
-            "comment": review.comment,
-            "created_at": review.created_at,
-            "buyer_name": buyer.name if buyer else None,
-            "property_title": property.title if property else None
-        }
-        review_responses.append(schemas.ReviewResponse(**review_dict))
+    # The body stays a plain list, so the next page is announced in a header
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
     return review_responses
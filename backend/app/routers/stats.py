@@ -1,24 +1,34 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+import hashlib
 from app.database import get_db
-from app import models, schemas
+from app import schemas
+from app.platform_counters import STATS_CACHE_SECONDS, get_counters
+from app.utils.conditional import cache_policy
+from app.utils.response_cache import etag_matches
 
 router = APIRouter()
 
 
 @router.get("", response_model=schemas.StatsResponse)
-def get_stats(db: Session = Depends(get_db)):
-    """Get platform statistics"""
-    total_listings = db.query(func.count(models.Property.id)).scalar() or 0
-    verified_landlords = db.query(func.count(models.User.id)).filter(
-        models.User.is_verified == True
-    ).scalar() or 0
-    active_users = db.query(func.count(models.User.id)).scalar() or 0
-    
-    return {
-        "totalListings": total_listings,
-        "verifiedLandlords": verified_landlords,
-        "activeUsers": active_users
+def get_stats(request: Request, response: Response, db: Session = Depends(get_db)):
+    """Get platform statistics (served from the platform_counters table)"""
+    counters = get_counters(db)
+    stats = {
+        "totalListings": counters["total_listings"],
+        "verifiedLandlords": counters["verified_landlords"],
+        "activeUsers": counters["active_users"]
     }
 
+    # Validators so browsers and CDNs can revalidate instead of re-downloading
+    fingerprint = f"{stats['totalListings']}:{stats['verifiedLandlords']}:{stats['activeUsers']}"
+    etag = '"' + hashlib.sha1(fingerprint.encode()).hexdigest()[:16] + '"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_policy("stats", f"public, max-age={int(STATS_CACHE_SECONDS)}")
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return stats
@@ -1,57 +1,105 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Optional, List
-from datetime import datetime, timedelta
+from typing import List
+from datetime import date as date_type, datetime, timedelta
 from app.database import get_db
 from app import models, schemas
-from app.utils.auth import decode_access_token
+from app.schemas import VISIT_SLOTS
+from app.utils.auth import get_current_user
+from app.utils.fast_json import fast_json
+from app.utils.retry import run_with_lock_retry
 
 router = APIRouter()
 
+MAX_RANGE_DAYS = 62
+MAX_RANGE_PROPERTIES = 50
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-):
-    """Get current authenticated user from token"""
-    if not authorization:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token de autentificare lipsă"
-        )
-    
+
+def _parse_date(value: str) -> date_type:
     try:
-        scheme, token = authorization.split()
-        if scheme.lower() != "bearer":
-            raise ValueError()
+        return datetime.strptime(value, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Format token invalid"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Data trebuie să fie în formatul YYYY-MM-DD"
         )
-    
-    payload = decode_access_token(token)
-    if not payload:
+
+
+def _availability_bitmaps(property_ids, dates, booked) -> dict:
+    """{property_id: {date: bitmap}} from (property_id, visit_date, visit_time) rows of booked slots"""
+    all_free = (1 << len(VISIT_SLOTS)) - 1
+    slot_bits = {time_str: 1 << index for index, time_str in enumerate(VISIT_SLOTS)}
+    availability = {property_id: dict.fromkeys(dates, all_free) for property_id in property_ids}
+    for property_id, visit_date, visit_time in booked:
+        bit = slot_bits.get(visit_time)
+        days = availability.get(property_id, {})
+        # Rows written before dates were validated may not be zero-padded ISO
+        # and still sort inside the range; they match no requested day
+        if bit is not None and visit_date in days:
+            days[visit_date] &= ~bit
+    return availability
+
+
+def _slot_grid(booked_times) -> list:
+    """Every bookable slot of a day, marked free unless its time is in booked_times"""
+    return [
+        {"time": time_str, "available": time_str not in booked_times}
+        for time_str in VISIT_SLOTS
+    ]
+
+
+@router.get("/available")
+def get_available_slots_range(
+    start: str = Query(..., description="First date (YYYY-MM-DD)"),
+    end: str = Query(..., description="Last date, inclusive (YYYY-MM-DD)"),
+    property_ids: List[int] = Query(..., description="One or more property ids"),
+    db: Session = Depends(get_db)
+):
+    """
+    Get availability for several properties over a date range in one call.
+
+    Each day is a bitmap over `slot_times`: bit i is set when slot i is free.
+    """
+    start_date, end_date = _parse_date(start), _parse_date(end)
+    days = (end_date - start_date).days + 1
+    if days < 1 or days > MAX_RANGE_DAYS:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid sau expirat"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Intervalul trebuie să aibă între 1 și {MAX_RANGE_DAYS} de zile"
         )
     
-    user_id = payload.get("user_id")
-    if not user_id:
+    property_ids = sorted(set(property_ids))
+    if len(property_ids) > MAX_RANGE_PROPERTIES:
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token invalid"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cel mult {MAX_RANGE_PROPERTIES} de proprietăți pe cerere"
         )
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if not user or not user.is_active:
+    # Verify properties exist
+    found = {row[0] for row in db.query(models.Property.id).filter(models.Property.id.in_(property_ids))}
+    if len(found) != len(property_ids):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Utilizatorul nu a fost găsit sau contul este dezactivat"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Proprietatea nu a fost găsită"
         )
     
-    return user
+    # All booked slots in the range, in one query on ix_visits_property_date_status
+    booked = db.query(models.Visit.property_id, models.Visit.visit_date, models.Visit.visit_time).filter(
+        models.Visit.property_id.in_(property_ids),
+        models.Visit.visit_date >= start_date.isoformat(),
+        models.Visit.visit_date <= end_date.isoformat(),
+        models.Visit.status == "scheduled"
+    ).all()
+    
+    dates = [(start_date + timedelta(days=offset)).isoformat() for offset in range(days)]
+    
+    return {
+        "start": start_date.isoformat(),
+        "end": end_date.isoformat(),
+        "slot_times": VISIT_SLOTS,
+        "availability": _availability_bitmaps(property_ids, dates, booked)
+    }
 
 
 @router.get("/available/{property_id}")
@@ -78,20 +126,10 @@ def get_available_slots(
     
     booked_times = {visit.visit_time for visit in booked_visits}
     
-    # Define available time slots (9:00 AM to 4:00 PM, 30-minute intervals)
-    all_slots = []
-    for hour in range(9, 16):  # 9 AM to 3:30 PM
-        for minute in [0, 30]:
-            time_str = f"{hour:02d}:{minute:02d}"
-            all_slots.append({
-                "time": time_str,
-                "available": time_str not in booked_times
-            })
-    
     return {
         "property_id": property_id,
         "date": date,
-        "slots": all_slots
+        "slots": _slot_grid(booked_times)
     }
 
 
@@ -110,7 +148,12 @@ def create_visit(
             detail="Proprietatea nu a fost găsită"
         )
     
-    # Check if slot is already booked
+    slot_taken = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Acest interval orar este deja rezervat"
+    )
+    
+    # Cheap early exit; uq_visits_scheduled_slot is what actually prevents double booking
     existing_visit = db.query(models.Visit).filter(
         models.Visit.property_id == visit_data.property_id,
         models.Visit.visit_date == visit_data.visit_date,
@@ -119,23 +162,28 @@ def create_visit(
     ).first()
     
     if existing_visit:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Acest interval orar este deja rezervat"
-        )
+        raise slot_taken
     
-    # Create visit
-    new_visit = models.Visit(
-        property_id=visit_data.property_id,
-        buyer_id=current_user.id,
-        visit_date=visit_data.visit_date,
-        visit_time=visit_data.visit_time,
-        status="scheduled",
-        notes=visit_data.notes
-    )
+    def book():
+        # Rebuilt on every attempt: a rollback discards the pending object
+        visit = models.Visit(
+            property_id=visit_data.property_id,
+            buyer_id=current_user.id,
+            visit_date=visit_data.visit_date,
+            visit_time=visit_data.visit_time,
+            status="scheduled",
+            notes=visit_data.notes
+        )
+        db.add(visit)
+        db.commit()
+        return visit
     
-    db.add(new_visit)
-    db.commit()
+    try:
+        new_visit = run_with_lock_retry(db, book)
+    except IntegrityError:
+        # Another request booked the slot between the check and the insert
+        db.rollback()
+        raise slot_taken
     db.refresh(new_visit)
     
     # Load property and buyer for response
@@ -165,6 +213,7 @@ def create_visit(
 
 @router.get("/my-visits", response_model=List[schemas.VisitResponse])
 def get_my_visits(
+    response: Response,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -182,11 +231,23 @@ def get_my_visits(
             models.Visit.status == "scheduled"
         ).order_by(models.Visit.visit_date, models.Visit.visit_time).all()
     
-    # Build response with property and buyer info
+    # Load the properties and buyers of all visits with one query each
+    property_ids = {visit.property_id for visit in visits}
+    buyer_ids = {visit.buyer_id for visit in visits}
+    properties = {
+        property.id: property
+        for property in db.query(models.Property).filter(models.Property.id.in_(property_ids))
+    } if property_ids else {}
+    buyers = {
+        buyer.id: buyer
+        for buyer in db.query(models.User).filter(models.User.id.in_(buyer_ids))
+    } if buyer_ids else {}
+    
+    # Build response with property and buyer info (plain dicts matching VisitResponse, see fast_json)
     result = []
     for visit in visits:
-        property = db.query(models.Property).filter(models.Property.id == visit.property_id).first()
-        buyer = db.query(models.User).filter(models.User.id == visit.buyer_id).first()
+        property = properties.get(visit.property_id)
+        buyer = buyers.get(visit.buyer_id)
         
         visit_dict = {
             "id": visit.id,
@@ -202,9 +263,9 @@ def get_my_visits(
             "buyer_name": buyer.name if buyer else None,
             "property_address": property.address if property else None
         }
-        result.append(schemas.VisitResponse(**visit_dict))
+        result.append(visit_dict)
     
-    return result
+    return fast_json(result, response)
 
 
 @router.delete("/{visit_id}")
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Optional, List, Dict
+from datetime import date, datetime
 
 
 # User Schemas
@@ -142,6 +142,7 @@ class PropertyDetails(PropertyBase):
 class PropertyListResponse(BaseModel):
     listings: List[PropertyListItem]
     total: int
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
 
 
 # Stats Schema
@@ -152,12 +153,36 @@ class StatsResponse(BaseModel):
 
 
 # Visit Schemas
+
+# Bookable time slots (9:00 AM to 3:30 PM, 30-minute intervals)
+VISIT_SLOTS = [f"{hour:02d}:{minute:02d}" for hour in range(9, 16) for minute in (0, 30)]
+
+
 class VisitCreate(BaseModel):
     property_id: int
     visit_date: str  # YYYY-MM-DD
-    visit_time: str  # HH:MM
+    visit_time: str  # HH:MM, one of VISIT_SLOTS
     notes: Optional[str] = None
 
+    @field_validator("visit_date")
+    @classmethod
+    def _check_visit_date(cls, value: str) -> str:
+        # Stored as text and compared as text, so only the zero-padded form is accepted
+        try:
+            valid = date.fromisoformat(value).isoformat() == value
+        except ValueError:
+            valid = False
+        if not valid:
+            raise ValueError("Data trebuie să fie în formatul YYYY-MM-DD")
+        return value
+
+    @field_validator("visit_time")
+    @classmethod
+    def _check_visit_time(cls, value: str) -> str:
+        if value not in VISIT_SLOTS:
+            raise ValueError("Ora vizitei trebuie să fie un interval disponibil (09:00-15:30, din 30 în 30 de minute)")
+        return value
+
 
 class VisitResponse(BaseModel):
     id: int
@@ -202,9 +227,17 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class OwnerRatingSummary(BaseModel):
+    owner_id: int
+    average_rating: float
+    total_reviews: int
+    histogram: Dict[int, int]  # stars (1-5) -> number of reviews
+
+
 class OwnerRatingResponse(BaseModel):
     owner_id: int
     average_rating: float
     total_reviews: int
     reviews: List[ReviewResponse]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page
 
@@ -3,15 +3,24 @@ Script to seed initial data into the database
 Run this after setting up the database to populate it with sample data
 
 Usage: python -m app.seed_data
+       python -m app.seed_data --synthetic [--seed 42 --properties 1000000 ...]
+           bulk-generates a large deterministic dataset (see app/synthetic_data.py)
 """
+import sys
+
 from app.database import SessionLocal, engine
-from app.models import Base, User, Property, PropertyImage
+from app.migrations import upgrade
+from app.models import User, Property, PropertyImage
 from app.utils.auth import get_password_hash
 from datetime import datetime
 
-# Create tables (this will create new tables or update existing ones)
-# Note: For adding columns to existing tables, use migrate_db.py
-Base.metadata.create_all(bind=engine)
+# Bring the schema up to date first (same as python -m app.migrate_db)
+upgrade(engine, log=print)
+
+if "--synthetic" in sys.argv[1:]:
+    from app.synthetic_data import main
+    main(sys.argv[1:])
+    sys.exit(0)
 
 db = SessionLocal()
 
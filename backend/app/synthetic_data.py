@@ -0,0 +1,427 @@
+"""
+Synthetic data at production scale, for benchmarks
+
+Generates users, properties, images, visits and reviews from a seed, so the
+same arguments always produce the same database. The data is skewed the way
+real traffic is: most listings are in a few large cities, a few owners hold
+many listings, a few listings attract most visits, and ratings lean to 4-5
+stars. Prices follow per-city log-normal distributions (RON/month for rent,
+EUR for sale).
+
+Rows are bulk-loaded with executemany in large transactions, on the SQLite
+DBAPI connection directly (or through Core insert() on other databases), with
+ids assigned up front so no row has to be read back. The derived tables
+(listing cards, rating aggregates, counters, search index) are rebuilt once at
+the end. The FTS insert trigger is paused during the load and the index
+rebuilt in one pass.
+
+Usage: python -m app.seed_data --synthetic --seed 42 --properties 1000000 \\
+           --images 5000000 --visits 10000000 --reviews 2000000
+"""
+import argparse
+import random
+import time
+from array import array
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select, text
+
+from app import models
+from app.database import SessionLocal, engine
+from app.listing_cards import rebuild_listing_cards
+from app.migrations import upgrade
+from app.owner_ratings import rebuild_owner_ratings
+from app.platform_counters import recount
+from app.table_versions import bump_all
+from app.utils.passwords import hash_password_sync
+from app.utils.response_cache import response_cache
+from app.utils.search import FTS_TABLE, ensure_search_index
+
+BATCH_SIZE = 50_000
+PASSWORD = "password123"
+
+# (city, weight, rent factor, sale EUR per m²)
+CITIES = [
+    ("București", 34, 1.00, 1900), ("Cluj-Napoca", 11, 1.05, 2400), ("Iași", 7, 0.75, 1350),
+    ("Timișoara", 7, 0.85, 1500), ("Brașov", 6, 0.85, 1700), ("Constanța", 6, 0.80, 1450),
+    ("Craiova", 4, 0.65, 1100), ("Oradea", 3, 0.70, 1250), ("Sibiu", 3, 0.80, 1500),
+    ("Galați", 3, 0.55, 950), ("Ploiești", 3, 0.60, 1050), ("Arad", 2, 0.60, 1000),
+    ("Pitești", 2, 0.60, 1050), ("Bacău", 2, 0.55, 950), ("Târgu Mureș", 2, 0.60, 1100),
+    ("Suceava", 1, 0.55, 1000), ("Baia Mare", 1, 0.50, 900), ("Mamaia", 1, 1.10, 2200),
+    ("Sinaia", 1, 0.90, 1800), ("Alba Iulia", 1, 0.55, 1000),
+]
+STREETS = [
+    "Strada Mihai Eminescu", "Bulevardul Unirii", "Calea Victoriei", "Strada Republicii",
+    "Bulevardul Independenței", "Strada Avram Iancu", "Strada Ștefan cel Mare", "Strada Florilor",
+    "Bulevardul Revoluției", "Strada Libertății", "Calea Moșilor", "Strada Mărășești",
+    "Strada Lalelelor", "Bulevardul Carol I", "Strada Trandafirilor", "Strada Horea",
+    "Strada Nicolae Bălcescu", "Bulevardul Tomis", "Strada Observatorului", "Aleea Teilor",
+]
+FIRST_NAMES = [
+    "Andrei", "Maria", "Ion", "Elena", "Mihai", "Ioana", "Alexandru", "Ana", "Gabriel", "Cristina",
+    "Vlad", "Raluca", "Ștefan", "Bianca", "Florin", "Diana", "Radu", "Andreea", "Bogdan", "Irina",
+]
+LAST_NAMES = [
+    "Popescu", "Ionescu", "Popa", "Dumitru", "Stan", "Stoica", "Gheorghe", "Matei", "Ciobanu",
+    "Rusu", "Munteanu", "Constantin", "Mihăilescu", "Toma", "Dobre", "Marin", "Lazăr", "Nistor",
+]
+FEATURES = [
+    "mobilat complet", "recent renovat", "cu balcon închis", "cu loc de parcare", "aproape de metrou",
+    "cu centrală proprie", "într-un bloc nou", "cu vedere la parc", "la etaj intermediar",
+    "cu bucătărie separată", "cu aer condiționat", "cu boxă la subsol", "luminos, orientare sudică",
+    "aproape de școli și magazine", "într-o zonă liniștită", "cu acces rapid la centru",
+]
+COMMENTS = [
+    "Proprietar foarte amabil, totul a fost conform descrierii.",
+    "Vizionare punctuală, apartamentul arată ca în poze.",
+    "Comunicare bună, dar zona este mai zgomotoasă decât mă așteptam.",
+    "Recomand, proprietarul a răspuns la toate întrebările.",
+    "Apartamentul avea nevoie de mici reparații.",
+    None,
+]
+# Share of each star rating, 1 to 5 (J-shaped, as on most review sites)
+RATING_WEIGHTS = [5, 5, 12, 33, 45]
+ROOM_WEIGHTS = [25, 40, 25, 10]
+SURFACE_RANGES = {1: (28, 45), 2: (45, 68), 3: (65, 95), 4: (90, 160)}
+RENT_MEDIANS = {1: 1500, 2: 2200, 3: 3000, 4: 4300}  # RON/month in București
+SLOT_TIMES = [f"{hour:02d}:{minute:02d}" for hour in range(9, 16) for minute in (0, 30)]
+
+
+class Loader:
+    """executemany of row tuples in BATCH_SIZE transactions"""
+
+    def __init__(self, engine, batch_size: int = BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.sqlite = engine.dialect.name == "sqlite"
+
+    def timestamp(self, value: datetime):
+        # SQLAlchemy's SQLite DateTime storage format, which the ORM compares against
+        if self.sqlite:
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+        return value
+
+    def load(self, table, columns, rows, total: int) -> None:
+        start = time.perf_counter()
+        done = 0
+        if self.sqlite:
+            quoted = ", ".join(f'"{name}"' for name in columns)
+            statement = (
+                f"INSERT INTO {table.name} ({quoted}) "
+                f"VALUES ({', '.join('?' for _ in columns)})"
+            )
+            connection = self.engine.raw_connection()
+            try:
+                cursor = connection.cursor()
+                for batch in _batches(rows, self.batch_size):
+                    cursor.executemany(statement, batch)
+                    connection.commit()
+                    done += len(batch)
+                    _progress(table.name, done, total, start)
+            finally:
+                connection.close()
+        else:
+            statement = insert(table)
+            for batch in _batches(rows, self.batch_size):
+                with self.engine.begin() as connection:
+                    connection.execute(statement, [dict(zip(columns, row)) for row in batch])
+                done += len(batch)
+                _progress(table.name, done, total, start)
+        elapsed = time.perf_counter() - start
+        print(f"\r   ✓ {table.name}: {done:,} rows in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _progress(name, done, total, start):
+    rate = done / max(time.perf_counter() - start, 1e-9)
+    print(f"\r   … {name}: {done:,}/{total:,} ({rate:,.0f} rows/s)", end="", flush=True)
+
+
+def _skewed(rng: random.Random, count: int, power: float) -> int:
+    """Index in [0, count): low indices are picked far more often as power grows"""
+    return int(count * rng.random() ** power)
+
+
+def _weighted(items, weights) -> list:
+    """Lookup list in which each item appears weight times; index it with random()"""
+    return [item for item, weight in zip(items, weights) for _ in range(weight)]
+
+
+class SyntheticData:
+    def __init__(self, seed: int, users: int, properties: int, images: int, visits: int,
+                 reviews: int, as_of: date, loader: Loader):
+        self.seed = seed
+        self.counts = {"users": users, "properties": properties, "images": images,
+                       "visits": visits, "reviews": reviews}
+        self.as_of = datetime.combine(as_of, datetime.min.time())
+        self.loader = loader
+        self.owners = max(1, users // 5)
+        self.buyers = max(1, users - self.owners)
+
+    def rng(self, table: str) -> random.Random:
+        # One stream per table, so changing one count leaves the other tables unchanged
+        return random.Random(f"{self.seed}:{table}")
+
+    def hourly_stamps(self, days: int) -> list:
+        """Timestamps for every hour of the `days` days before as_of, oldest first"""
+        start = self.as_of - timedelta(days=days)
+        return [self.loader.timestamp(start + timedelta(hours=hour)) for hour in range(days * 24)]
+
+    def load(self, offsets: dict) -> None:
+        self.user_base = offsets["users"]
+        self.property_base = offsets["properties"]
+        # Owner of each generated property, to give reviews the right owner_id
+        self.property_owner = array("i", bytes(4 * self.counts["properties"]))
+        self.loader.load(models.User.__table__, USER_COLUMNS, self.user_rows(), self.counts["users"])
+        self.loader.load(models.Property.__table__, PROPERTY_COLUMNS, self.property_rows(), self.counts["properties"])
+        self.loader.load(models.PropertyImage.__table__, IMAGE_COLUMNS, self.image_rows(offsets["property_images"]), self.counts["images"])
+        self.loader.load(models.Visit.__table__, VISIT_COLUMNS, self.visit_rows(offsets["visits"]), self.counts["visits"])
+        self.loader.load(models.Review.__table__, REVIEW_COLUMNS, self.review_rows(offsets["reviews"]), self.counts["reviews"])
+
+    def user_rows(self):
+        rng = self.rng("users")
+        random_ = rng.random
+        password = hash_password_sync(PASSWORD)
+        stamps = self.hourly_stamps(12 * 365)
+        for i in range(self.counts["users"]):
+            user_id = self.user_base + i + 1
+            is_owner = i < self.owners
+            # Accounts get more common towards the present
+            created = stamps[len(stamps) - 1 - int(len(stamps) * random_() ** 2)]
+            yield (
+                user_id, f"{FIRST_NAMES[int(random_() * len(FIRST_NAMES))]} {LAST_NAMES[int(random_() * len(LAST_NAMES))]}",
+                f"user{user_id}@example.ro", password, "owner" if is_owner else "buyer",
+                random_() < (0.6 if is_owner else 0.3), True, int(str(created)[:4]), None, created
+            )
+
+    def property_rows(self):
+        rng = self.rng("properties")
+        random_ = rng.random
+        lognormal = rng.lognormvariate
+        count = self.counts["properties"]
+        cities = _weighted(CITIES, [weight for _, weight, _, _ in CITIES])
+        rooms_table = _weighted((1, 2, 3, 4), ROOM_WEIGHTS)
+        stamps = self.hourly_stamps(3 * 365)
+        features_count = len(FEATURES)
+        for i in range(count):
+            rooms = rooms_table[int(random_() * len(rooms_table))]
+            city, _, rent_factor, sale_per_m2 = cities[int(random_() * len(cities))]
+            low, high = SURFACE_RANGES[rooms]
+            surface = round(low + (high - low) * random_(), 1)
+            is_rent = random_() < 0.7
+            if is_rent:
+                price = round(RENT_MEDIANS[rooms] * rent_factor * lognormal(0, 0.25), -1)
+                currency, period = "RON", "lună"
+            else:
+                price = round(surface * sale_per_m2 * lognormal(0, 0.2), -3)
+                currency, period = "EUR", "one-time"
+            if rooms == 1 and random_() < 0.5:
+                kind = "Garsonieră"
+            elif rooms == 4 and random_() < 0.4:
+                kind = "Casă"
+            else:
+                kind = "Apartament"
+            first = int(random_() * features_count)
+            features = [FEATURES[(first + step) % features_count] for step in (0, 5, 11)]
+            district = f", Sector {1 + int(random_() * 6)}" if city == "București" else ""
+            owner = self.user_base + 1 + _skewed(rng, self.owners, 2)
+            self.property_owner[i] = owner
+            rooms_label = f"{rooms} {'cameră' if rooms == 1 else 'camere'}"
+            yield (
+                self.property_base + i + 1,
+                f"{kind} cu {rooms_label}, {features[0]}",
+                f"{kind} cu {rooms_label} în {city}, {surface:g} mp, {features[0]}, {features[1]} "
+                f"și {features[2]}. Disponibil {'pentru închiriere' if is_rent else 'pentru vânzare'}, "
+                f"vizionări la cerere.",
+                f"{STREETS[int(random_() * len(STREETS))]} nr. {1 + int(random_() * 180)}{district}, {city}",
+                city, price, currency, period, "rent" if is_rent else "sale", rooms,
+                1 if rooms < 3 else 1 + int(random_() * 2), surface, owner, random_() < 0.5,
+                # Listings are created at a steady pace over the last three years, in id order
+                stamps[len(stamps) * i // count]
+            )
+
+    def image_rows(self, base: int):
+        rng = self.rng("images")
+        properties = self.counts["properties"]
+        for i in range(self.counts["images"]):
+            # Round-robin first so every property gets its primary image
+            property_index = i % properties if i < properties else _skewed(rng, properties, 1.5)
+            property_id = self.property_base + property_index + 1
+            yield (
+                base + i + 1, property_id,
+                f"https://cdn.tenansee.ro/properties/{property_id}/{base + i + 1}.jpg",
+                i < properties, i // properties
+            )
+
+    def visit_rows(self, base: int):
+        rng = self.rng("visits")
+        random_ = rng.random
+        properties = self.counts["properties"]
+        buyer_base = self.user_base + self.owners + 1
+        today = self.as_of.date()
+        past_days = [(today - timedelta(days=days)).isoformat() for days in range(1, 731)]
+        # Booked 1-14 days before the visit (capped at as_of for future visits)
+        booked = self.hourly_stamps(745)
+        slots = len(SLOT_TIMES)
+        # Next free future slot per property: scheduled visits never collide
+        next_slot = array("i", bytes(4 * properties))
+        future_days = []
+        for i in range(self.counts["visits"]):
+            property_index = _skewed(rng, properties, 2)
+            buyer = buyer_base + int(random_() * self.buyers)
+            if random_() < 0.8:
+                days_ago = int(random_() * 730)
+                day = past_days[days_ago]
+                visit_time = SLOT_TIMES[int(random_() * slots)]
+                status = "completed" if random_() < 0.85 else "cancelled"
+                created = booked[len(booked) - 24 * (days_ago + 2 + int(random_() * 14)) + int(random_() * 24)]
+            else:
+                slot = next_slot[property_index]
+                next_slot[property_index] = slot + 1
+                while len(future_days) <= slot // slots:
+                    future_days.append((today + timedelta(days=len(future_days) + 1)).isoformat())
+                day = future_days[slot // slots]
+                visit_time = SLOT_TIMES[slot % slots]
+                status = "scheduled"
+                created = booked[len(booked) - 1 - int(random_() * 24 * 14)]
+            yield (base + i + 1, self.property_base + property_index + 1, buyer, day, visit_time, status, None, created)
+
+    def review_rows(self, base: int):
+        rng = self.rng("reviews")
+        random_ = rng.random
+        properties = self.counts["properties"]
+        buyer_base = self.user_base + self.owners + 1
+        ratings = _weighted((1, 2, 3, 4, 5), RATING_WEIGHTS)
+        stamps = self.hourly_stamps(730)
+        for i in range(self.counts["reviews"]):
+            property_index = _skewed(rng, properties, 2)
+            yield (
+                base + i + 1, self.property_owner[property_index], buyer_base + int(random_() * self.buyers),
+                self.property_base + property_index + 1, None, ratings[int(random_() * len(ratings))],
+                COMMENTS[int(random_() * len(COMMENTS))], stamps[int(random_() * len(stamps))]
+            )
+
+
+LOADED_MODELS = [models.User, models.Property, models.PropertyImage, models.Visit, models.Review]
+USER_COLUMNS = ["id", "name", "email", "hashed_password", "role", "is_verified", "is_active",
+                "account_created_year", "profile_description", "created_at"]
+PROPERTY_COLUMNS = ["id", "title", "description", "address", "location", "price", "price_currency",
+                    "price_period", "type", "rooms", "bathrooms", "surface", "owner_id", "is_verified",
+                    "created_at"]
+IMAGE_COLUMNS = ["id", "property_id", "image_url", "is_primary", "order"]
+VISIT_COLUMNS = ["id", "property_id", "buyer_id", "visit_date", "visit_time", "status", "notes", "created_at"]
+REVIEW_COLUMNS = ["id", "owner_id", "buyer_id", "property_id", "visit_id", "rating", "comment", "created_at"]
+
+
+def _next_ids(connection) -> dict:
+    """Largest existing id per table, so generated rows append after them"""
+    tables = {
+        "users": models.User.id, "properties": models.Property.id,
+        "property_images": models.PropertyImage.id, "visits": models.Visit.id, "reviews": models.Review.id
+    }
+    return {name: connection.execute(select(func.max(column))).scalar() or 0 for name, column in tables.items()}
+
+
+def _drop_indexes(engine, tables) -> list:
+    """Drop the secondary indexes of the tables; building them once after the load is far cheaper"""
+    indexes = [index for table in tables for index in table.indexes]
+    with engine.begin() as connection:
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+    return indexes
+
+
+def _create_indexes(engine, indexes) -> None:
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        for index in indexes:
+            index.create(connection, checkfirst=True)
+    print(f"   ✓ {len(indexes)} indexes rebuilt in {time.perf_counter() - start:.1f}s")
+
+
+def _pause_fts_trigger(connection) -> bool:
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type='trigger' AND name='properties_fts_ai'")
+    ).first() is not None
+    if exists:
+        connection.execute(text("DROP TRIGGER properties_fts_ai"))
+    return exists
+
+
+def rebuild_derived(engine) -> None:
+    """Recompute everything the ORM listeners would have maintained"""
+    steps = [("listing cards", None), ("rating aggregates", rebuild_owner_ratings),
+             ("platform counters", recount), ("table versions", bump_all)]
+    for label, step in steps:
+        start = time.perf_counter()
+        if step is None:
+            with SessionLocal() as db:
+                rebuild_listing_cards(db)
+        else:
+            with engine.begin() as connection:
+                step(connection)
+        print(f"   ✓ {label} rebuilt in {time.perf_counter() - start:.1f}s")
+    response_cache.clear()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.seed_data --synthetic", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--synthetic", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--properties", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=None, help="default: properties / 2")
+    parser.add_argument("--images", type=int, default=None, help="default: 5 per property")
+    parser.add_argument("--visits", type=int, default=None, help="default: 10 per property")
+    parser.add_argument("--reviews", type=int, default=None, help="default: 2 per property")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=date.today(),
+                        help="date the data is generated around (YYYY-MM-DD, default today)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    properties = max(1, args.properties)
+    data = SyntheticData(
+        seed=args.seed,
+        users=max(2, args.users if args.users is not None else properties // 2),
+        properties=properties,
+        images=args.images if args.images is not None else properties * 5,
+        visits=args.visits if args.visits is not None else properties * 10,
+        reviews=args.reviews if args.reviews is not None else properties * 2,
+        as_of=args.as_of,
+        loader=Loader(engine, args.batch_size)
+    )
+    print(f"🏭 Generating synthetic data (seed {args.seed}): "
+          + ", ".join(f"{count:,} {name}" for name, count in data.counts.items()))
+
+    upgrade(engine)
+    with engine.begin() as connection:
+        offsets = _next_ids(connection)
+        paused = data.loader.sqlite and _pause_fts_trigger(connection)
+
+    start = time.perf_counter()
+    indexes = _drop_indexes(engine, [model.__table__ for model in LOADED_MODELS])
+    try:
+        data.load(offsets)
+    finally:
+        _create_indexes(engine, indexes)
+        if paused:
+            with engine.begin() as connection:
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+        # Restores the trigger, or creates and fills the index if it did not exist yet
+        if ensure_search_index(engine):
+            print("   ✓ search index rebuilt")
+    rebuild_derived(engine)
+
+    rows = sum(data.counts.values())
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Loaded {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s overall)")
+    print(f"   Log in as any user{offsets['users'] + 1}@example.ro … with password {PASSWORD}")
@@ -0,0 +1,126 @@
+"""
+Per-table write versions for cheap ETags
+
+`table_versions` holds one counter per table. The ORM flushes of a
+transaction record the tables they inserted into, changed or deleted from;
+once it commits, their counters are bumped in a separate short transaction.
+Bumping inside the writer's transaction would hold the lock on a table's
+single counter row until commit and serialise every writer of that table.
+A read endpoint's ETag is then derived from the versions of the tables it
+reads (app.utils.conditional) instead of hashing its body.
+
+Between a commit and its bump (milliseconds) a read can pair the new body
+with the previous ETag; the bump then changes the ETag, so the client
+re-downloads on its next request.
+
+Counters start from the current time in milliseconds, so a recreated database
+never hands out an ETag that an old one already used. Writes that bypass the
+ORM (bulk loads, clear_data) must call bump_all().
+
+Usage: python -m app.table_versions   (bumps every table, invalidating all ETags)
+"""
+import logging
+import random
+import time
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.retry import DB_LOCK_RETRIES, DB_LOCK_RETRY_BASE_MS, is_lock_error
+
+logger = logging.getLogger(__name__)
+
+
+def _initial_version() -> int:
+    return int(time.time() * 1000)
+
+
+def get_versions(connection, tables) -> dict:
+    """Current version of each table"""
+    rows = connection.execute(
+        select(models.TableVersion.name, models.TableVersion.version)
+        .where(models.TableVersion.name.in_(list(tables)))
+    )
+    return dict(rows.all())
+
+
+def bump(connection, tables) -> None:
+    """Increment the versions of these tables"""
+    connection.execute(
+        update(models.TableVersion)
+        .where(models.TableVersion.name.in_(sorted(tables)))
+        .values(version=models.TableVersion.version + 1)
+    )
+
+
+def bump_all(connection) -> None:
+    bump(connection, models.Base.metadata.tables)
+
+
+def ensure_table_versions(engine) -> None:
+    """Create the missing counters (new databases and newly added tables)"""
+    with engine.begin() as connection:
+        existing = set(connection.execute(select(models.TableVersion.name)).scalars())
+        missing = [name for name in models.Base.metadata.tables if name not in existing]
+        if missing:
+            version = _initial_version()
+            connection.execute(insert(models.TableVersion), [
+                {"name": name, "version": version} for name in missing
+            ])
+
+
+def _touched_tables(session) -> set:
+    tables = {obj.__tablename__ for obj in session.new}
+    tables.update(obj.__tablename__ for obj in session.deleted)
+    tables.update(obj.__tablename__ for obj in session.dirty if session.is_modified(obj))
+    tables.discard(models.TableVersion.__tablename__)
+    return tables
+
+
+def _bump_committed(engine, tables) -> None:
+    """Bump in its own transaction, retrying SQLite lock errors like the write routes"""
+    for attempt in range(DB_LOCK_RETRIES + 1):
+        try:
+            with engine.begin() as connection:
+                bump(connection, tables)
+            return
+        except OperationalError as error:
+            if attempt == DB_LOCK_RETRIES or not is_lock_error(error):
+                # The data is committed; a missed bump only delays revalidation until the next write
+                logger.warning("Could not bump table versions %s: %s", sorted(tables), error)
+                return
+            delay = DB_LOCK_RETRY_BASE_MS * (2 ** attempt) / 1000
+            time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_touched_tables(session, flush_context):
+    tables = _touched_tables(session)
+    if tables:
+        session.info.setdefault("touched_tables", set()).update(tables)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_table_versions(session):
+    # The session cannot run SQL here, so the bump goes through its engine
+    tables = session.info.pop("touched_tables", None)
+    if tables:
+        bind = session.get_bind()
+        _bump_committed(getattr(bind, "engine", bind), tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_touched_tables(session):
+    session.info.pop("touched_tables", None)
+
+
+if __name__ == "__main__":
+    from app.database import engine
+
+    models.Base.metadata.create_all(bind=engine, tables=[models.TableVersion.__table__])
+    ensure_table_versions(engine)
+    with engine.begin() as connection:
+        bump_all(connection)
+    print("✅ Bumped every table version; clients will revalidate")
@@ -1,31 +1,38 @@
-from passlib.context import CryptContext
+from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional
 import os
+import threading
+import time
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.database import get_db
+from app import models
+from app.utils.passwords import hash_password_sync, verify_password_sync
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
 
+# Authenticated user cache: skips the users lookup on hot paths. Changes made
+# through invalidate_cached_user() apply at once on this worker; other workers
+# pick them up (e.g. a deactivation) within AUTH_CACHE_SECONDS.
+AUTH_CACHE_SECONDS = float(os.getenv("AUTH_CACHE_SECONDS", "30"))
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (blocking; routes use password_hasher)"""
+    return verify_password_sync(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password"""
-    # Bcrypt has a 72 byte limit - truncate if necessary
-    if isinstance(password, str):
-        password_bytes = password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password = password_bytes[:72].decode('utf-8', errors='ignore')
-    #return pwd_context.hash(password)
-    return password
+    """Hash a password (blocking; routes use password_hasher)"""
+    return hash_password_sync(password)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
@@ -49,3 +56,110 @@ def decode_access_token(token: str):
     except JWTError:
         return None
 
+
+class UserCache:
+    """Bounded LRU of detached User snapshots keyed by user id, with a TTL"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, snapshot = entry
+            if time.monotonic() >= expires:
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def put(self, user_id: int, snapshot) -> None:
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(AUTH_CACHE_SIZE, AUTH_CACHE_SECONDS)
+
+
+def _snapshot(user: models.User) -> models.User:
+    """Detached copy of a loaded user that is safe to share between sessions"""
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(models.User).column_attrs}
+    snapshot = models.User(**values)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Forget a cached user after its row changed"""
+    user_cache.invalidate(user_id)
+
+
+def get_current_user(
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get current authenticated user from token"""
+    if not authorization:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de autentificare lipsă"
+        )
+    
+    # Extract token from "Bearer <token>" format
+    try:
+        scheme, token = authorization.split()
+        if scheme.lower() != "bearer":
+            raise ValueError()
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Format token invalid. Folosiți: Bearer <token>"
+        )
+    
+    payload = decode_access_token(token)
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token invalid sau expirat"
+        )
+    
+    user_id = payload.get("user_id")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token invalid"
+        )
+    
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        # Attach a copy to this request's session without a SELECT, so routes
+        # can still modify and commit current_user
+        user = db.merge(snapshot, load=False)
+    else:
+        user = db.query(models.User).filter(models.User.id == user_id).first()
+        if user and user.is_active:
+            user_cache.put(user_id, _snapshot(user))
+    
+    if not user or not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Utilizatorul nu a fost găsit sau contul este dezactivat"
+        )
+    
+    return user
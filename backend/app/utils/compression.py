@@ -0,0 +1,178 @@
+"""
+Response compression: gzip, and Brotli when the brotli package is installed
+
+CompressionMiddleware compresses JSON, text, CSV and NDJSON responses of at
+least COMPRESSION_MIN_SIZE bytes in the best encoding the client accepts
+(Accept-Encoding, honouring q-values; Brotli is preferred on ties). Streaming
+responses are compressed chunk by chunk and flushed after each chunk, so the
+client still receives rows as they are produced.
+
+Responses that already carry Content-Encoding pass through untouched; this is
+how cached responses (app.utils.response_cache) send their precompressed
+variants instead of being compressed again on every hit.
+
+A compressed response's strong ETag becomes weak (W/"..."), since the bytes
+differ per encoding. If-None-Match uses weak comparison, so 304s still work.
+
+Settings (environment):
+    COMPRESSION_MIN_SIZE    smallest body worth compressing (default 1024)
+    GZIP_LEVEL              on-the-fly gzip level (default 6)
+    BROTLI_QUALITY          on-the-fly Brotli quality (default 5)
+Precompressed cache variants use the maximum levels, since they are made once.
+"""
+import os
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Preferred first when the client weighs them equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Best supported encoding from an Accept-Encoding header, or None"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    wildcard = weights.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = weights.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+class Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY if level is None else level)
+        else:
+            # wbits 31: gzip container
+            self._zlib = zlib.compressobj(GZIP_LEVEL if level is None else level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    """Compress a whole body"""
+    return Compressor(encoding, level).finish(body)
+
+
+def compress_best(body: bytes, encoding: str) -> bytes:
+    """Compress with the maximum level, for bodies that are compressed once and reused"""
+    return compress(body, encoding, level=11 if encoding == "br" else 9)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing eligible responses in the negotiated encoding"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                )
+                return
+            if message["type"] != "http.response.body":
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start_message is None:
+                # Later chunks of a stream
+                if compressor is not None:
+                    body = compressor.chunk(body) if more_body else compressor.finish(body)
+                    message = {**message, "body": body}
+                await send(message)
+                return
+
+            first, start_message = start_message, None
+            if passthrough or (not more_body and len(body) < self.minimum_size):
+                await send(first)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=first["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is None:
+                await send(first)
+                await send(message)
+                return
+
+            compressor = Compressor(encoding)
+            headers["Content-Encoding"] = encoding
+            if "etag" in headers:
+                headers["ETag"] = weak_etag(headers["etag"])
+            if more_body:
+                del headers["Content-Length"]
+                body = compressor.chunk(body)
+            else:
+                body = compressor.finish(body)
+                headers["Content-Length"] = str(len(body))
+            await send(first)
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,82 @@
+"""
+Conditional GET for read endpoints
+
+    @router.get("", dependencies=[Depends(conditional_get("listings", "properties", "property_images"))])
+
+The dependency derives a weak ETag from the request URL and the write
+versions (app.table_versions) of the tables the route reads. A matching
+If-None-Match ends the request with 304 before the endpoint runs; otherwise
+ETag and Cache-Control are added to the endpoint's response.
+
+The versions are read before the endpoint queries its data, so a concurrent
+write can only make an ETag older than the body it labels (the client
+re-downloads once more), never newer.
+
+Under ASYNC_DB=1, app.routers.async_reads swaps the dependency for its
+async_variant, which reads the versions through the route's AsyncSession
+(the same one the endpoint gets), so no threadpool worker or sync connection
+is taken.
+
+Cache-Control is set per policy name and can be overridden with
+CACHE_CONTROL_<POLICY> (e.g. CACHE_CONTROL_LISTINGS="public, max-age=30").
+"""
+import hashlib
+import os
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.table_versions import get_versions
+from app.utils.response_cache import etag_matches
+
+# "no-cache" still lets browsers and CDNs store the response, but they
+# revalidate it with If-None-Match on every use
+CACHE_POLICIES = {
+    "listings": "public, no-cache",
+    "property": "public, no-cache",
+    "owner_properties": "public, no-cache",
+    "reviews": "public, no-cache",
+}
+
+
+def cache_policy(name: str, default: str = "no-cache") -> str:
+    """Cache-Control value for a policy name"""
+    return os.getenv(f"CACHE_CONTROL_{name.upper()}", CACHE_POLICIES.get(name, default))
+
+
+def _answer(request: Request, response: Response, tables, versions: dict, cache_control: str) -> None:
+    """Raise 304 when the client's ETag is current, else label the response"""
+    fingerprint = "|".join(
+        [request.url.path, request.url.query] + [f"{table}={versions.get(table)}" for table in tables]
+    )
+    etag = 'W/"' + hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:20] + '"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(policy: str, *tables: str):
+    """Dependency answering 304 while none of `tables` changed"""
+    cache_control = cache_policy(policy)
+
+    def check(request: Request, response: Response, db: Session = Depends(get_db)):
+        _answer(request, response, tables, get_versions(db.connection(), tables), cache_control)
+
+    check.async_variant = lambda: async_conditional_get(policy, *tables)
+    return check
+
+
+def async_conditional_get(policy: str, *tables: str):
+    """conditional_get for routes served from the async stack (ASYNC_DB=1)"""
+    # Imported here: it creates the async engine, which needs the async driver
+    from app.async_database import get_async_db
+
+    cache_control = cache_policy(policy)
+
+    async def check(request: Request, response: Response, db=Depends(get_async_db)):
+        versions = await db.run_sync(lambda session: get_versions(session.connection(), tables))
+        _answer(request, response, tables, versions, cache_control)
+
+    return check
@@ -0,0 +1,69 @@
+"""
+Fast JSON path for large list responses
+
+A route that opts in builds plain dicts and lists that already match its
+response_model and returns them through fast_json(). The result is a Response,
+so FastAPI skips the response_model validation and jsonable_encoder pass it
+would otherwise run over every item, and orjson encodes the body in one call.
+The response_model stays on the route for the OpenAPI schema.
+
+Because nothing validates the output any more, the dicts must use exactly the
+schema's field names and JSON-ready types (str, int, float, bool, None,
+datetime, lists and dicts of those).
+
+Set FAST_JSON=0 to send the same content through FastAPI's regular
+validation and encoding (also the fallback when orjson is not installed).
+
+Benchmark: python -m benchmarks.json_serialization
+"""
+import json
+import os
+from datetime import date
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+FAST_JSON = orjson is not None and os.getenv("FAST_JSON", "1").lower() not in ("0", "false", "no")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson; UTC datetimes end in "Z" as with pydantic"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode one value as compact UTF-8 JSON (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def fast_json(content: Any, response: Optional[Response] = None):
+    """
+    Return content as an ORJSONResponse, or unchanged when FAST_JSON is off.
+
+    Pass the route's `response` parameter to keep the headers and status code
+    set on it by the route or its dependencies (ETag, X-Next-Cursor, ...).
+    """
+    if not FAST_JSON:
+        return content
+    fast = ORJSONResponse(content)
+    if response is not None:
+        if response.status_code:
+            fast.status_code = response.status_code
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
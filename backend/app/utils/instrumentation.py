@@ -0,0 +1,140 @@
+"""
+Per-request SQL instrumentation
+
+Cursor execute events on the engine are attributed to the request that issued
+them through a context variable, which is copied into the threadpool that runs
+the sync routes. The middleware in main.py turns the result into a
+Server-Timing header and one structured log line per request.
+
+The log line is written once the body has been sent, so it includes streamed
+routes (the listings export runs its queries while the body is produced).
+The Server-Timing header goes out before the body and only covers the work
+done until then.
+
+Settings (environment):
+    SLOW_QUERY_MS   statements slower than this are logged with their
+                    parameters (default 200, 0 disables)
+"""
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.sql")
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+MAX_LOGGED_LENGTH = 500
+
+
+class QueryStats:
+    """SQL statistics collected for one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_sql = statement
+
+    def server_timing(self, app_ms: float) -> str:
+        """Format as a Server-Timing header value"""
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f'db-slowest;dur={self.slowest_ms:.1f}, '
+            f'app;dur={app_ms:.1f}'
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    """Begin collecting statistics for the current request context"""
+    stats = QueryStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def _truncate(value) -> str:
+    text = value if isinstance(value, str) else repr(value)
+    if len(text) > MAX_LOGGED_LENGTH:
+        return text[:MAX_LOGGED_LENGTH] + "..."
+    return text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+
+    if SLOW_QUERY_MS and elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(elapsed_ms, 1),
+            "sql": _truncate(statement),
+            "parameters": _truncate(parameters),
+            "executemany": executemany
+        }, ensure_ascii=False))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the timing listeners to an engine (idempotent)"""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def after_body(response, callback) -> None:
+    """
+    Call callback(failed) once the response body has been sent, or has failed
+    with an exception. A client disconnect is not a failure.
+    """
+    body_iterator = getattr(response, "body_iterator", None)
+    if body_iterator is None:
+        callback(False)
+        return
+
+    async def observed():
+        failed = False
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        except Exception:
+            failed = True
+            raise
+        finally:
+            callback(failed)
+
+    response.body_iterator = observed()
+
+
+def log_request(method: str, path: str, status_code: int, app_ms: float, stats: QueryStats) -> None:
+    """Emit the structured per-request log line"""
+    logging.getLogger("app.requests").info(json.dumps({
+        "event": "request",
+        "method": method,
+        "path": path,
+        "status": status_code,
+        "duration_ms": round(app_ms, 1),
+        "db_queries": stats.count,
+        "db_ms": round(stats.total_ms, 1),
+        "db_slowest_ms": round(stats.slowest_ms, 1),
+        "db_slowest_sql": _truncate(stats.slowest_sql) if stats.slowest_sql else None
+    }, ensure_ascii=False))
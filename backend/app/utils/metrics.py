@@ -0,0 +1,150 @@
+"""
+Prometheus metrics
+
+Metrics are labelled by router (the path segment after /api/) rather than by
+raw path, which keeps label cardinality bounded.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty,
+writable directory before the server starts. Each worker then writes its
+samples to memory-mapped files there, and /metrics aggregates all of them, so
+any worker can answer a scrape. The live gauges (requests in progress, pool
+connections) of a worker that exits are removed: by the worker itself on
+shutdown, and for one that crashed, by the next worker that starts.
+"""
+import glob
+import os
+import re
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+ROUTERS = {"auth", "listings", "properties", "stats", "profile", "visits", "reviews"}
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled",
+    ["router", "method", "status"]
+)
+REQUEST_ERRORS = Counter(
+    "http_request_errors_total",
+    "HTTP requests that failed with a 5xx status or an unhandled exception",
+    ["router"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["router", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled",
+    ["router"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the SQLAlchemy pool"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the SQLAlchemy pool",
+    multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size (negative while the pool is not full)",
+    multiprocess_mode="livesum"
+)
+
+
+def router_label(path: str) -> str:
+    """Map a request path to its router name"""
+    parts = path.split("/")
+    if len(parts) > 2 and parts[1] == "api" and parts[2] in ROUTERS:
+        return parts[2]
+    return "other"
+
+
+class RequestTimer:
+    """Tracks one request through the in-progress gauge and latency histogram"""
+
+    def __init__(self, path: str, method: str):
+        self.router = router_label(path)
+        self.method = method
+        self.start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(self.router).inc()
+
+    def finish(self, status_code: int) -> None:
+        REQUESTS_IN_PROGRESS.labels(self.router).dec()
+        REQUEST_LATENCY.labels(self.router, self.method).observe(time.perf_counter() - self.start)
+        REQUESTS.labels(self.router, self.method, str(status_code)).inc()
+        if status_code >= 500:
+            REQUEST_ERRORS.labels(self.router).inc()
+
+
+def instrument_pool(engine: Engine) -> None:
+    """Count pool checkouts and track checked-out/overflow connections"""
+    pool = engine.pool
+
+    def update_overflow():
+        if hasattr(pool, "overflow"):
+            DB_POOL_OVERFLOW.set(pool.overflow())
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_CHECKED_OUT.inc()
+        update_overflow()
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        DB_POOL_CHECKED_OUT.dec()
+        update_overflow()
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def mark_dead_workers() -> None:
+    """Remove the live gauge samples of worker processes that no longer run"""
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    for path in glob.glob(os.path.join(directory, "gauge_live*_*.db")):
+        match = re.search(r"_(\d+)\.db$", path)
+        if match and int(match.group(1)) != os.getpid() and not _is_running(int(match.group(1))):
+            multiprocess.mark_process_dead(int(match.group(1)), directory)
+
+
+def mark_worker_dead() -> None:
+    """Remove this worker's live gauge samples (call when it shuts down)"""
+    directory = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        multiprocess.mark_process_dead(os.getpid(), directory)
+
+
+def render_metrics():
+    """Return (body, content type) for the /metrics endpoint"""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
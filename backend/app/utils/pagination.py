@@ -0,0 +1,84 @@
+"""
+Opaque cursors for keyset pagination
+
+A cursor is the URL-safe base64 of a small JSON object holding the sort key of
+the last row on the previous page. Clients pass it back unchanged.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import String, and_, or_, type_coerce
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode the sort key of the last returned row"""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Cursor de paginare invalid"
+    )
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        values = None
+
+    if not isinstance(values, dict):
+        raise invalid_cursor()
+    return values
+
+
+def _sorts_as_text(db) -> bool:
+    # SQLite keeps timestamps as ISO 8601 text and orders by that text, which
+    # differs between CURRENT_TIMESTAMP defaults and bound datetimes
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def newest_first_key(db, created_column):
+    """Column to select alongside the rows: the created_at a cursor must carry"""
+    if _sorts_as_text(db):
+        return type_coerce(created_column, String).label("cursor_created_at")
+    return created_column.label("cursor_created_at")
+
+
+def newest_first_cursor(created_at, id: int) -> str:
+    """Cursor after a row of a (created_at desc, id desc) ordering"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    return encode_cursor({"created_at": created_at, "id": id})
+
+
+def newest_first_after(db, cursor: str, created_column, id_column):
+    """
+    Filter for the rows after a newest_first_cursor. The cursor carries the
+    row's own sort key, so the next page does not depend on that row still
+    existing.
+    """
+    after = decode_cursor(cursor)
+    if not isinstance(after.get("id"), int) or not isinstance(after.get("created_at"), str):
+        raise invalid_cursor()
+    try:
+        created_at = datetime.fromisoformat(after["created_at"])
+    except ValueError:
+        raise invalid_cursor()
+    
+    if _sorts_as_text(db):
+        created_column, created_at = type_coerce(created_column, String), after["created_at"]
+    return or_(
+        created_column < created_at,
+        and_(created_column == created_at, id_column < after["id"])
+    )
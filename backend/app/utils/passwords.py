@@ -0,0 +1,135 @@
+"""
+Password hashing in a dedicated process pool
+
+bcrypt costs 100+ ms of CPU per call at production cost factors. Running it in
+the request worker would stall that worker, and threads would contend on the
+GIL, so hashes and checks are sent to a bounded pool of worker processes and
+awaited. Throughput then grows with the number of cores.
+
+Settings (environment):
+    BCRYPT_ROUNDS           cost factor for new hashes (default 12); stored
+                            hashes with another cost are rehashed on login
+    PASSWORD_HASH_WORKERS   pool processes (default: CPU count)
+    PASSWORD_HASH_QUEUE     max jobs waiting per worker before callers wait
+                            for a free slot (default 8)
+
+Usage: python -m app.utils.passwords   (benchmark hashes/s per pool size)
+"""
+import asyncio
+import hmac
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "8"))
+
+BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+def _to_bytes(password: str) -> bytes:
+    # Bcrypt only uses the first 72 bytes and refuses longer input
+    return password.encode("utf-8")[:72]
+
+
+def hash_password_sync(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """Hash a password in the calling process"""
+    return bcrypt.hashpw(_to_bytes(password), bcrypt.gensalt(rounds)).decode("ascii")
+
+
+def verify_password_sync(password: str, hashed_password: str) -> bool:
+    """Check a password against a stored value in the calling process"""
+    if not hashed_password:
+        return False
+    if not hashed_password.startswith(BCRYPT_PREFIXES):
+        # Legacy rows stored the password itself; needs_rehash() upgrades them
+        return hmac.compare_digest(_to_bytes(password), _to_bytes(hashed_password))
+    try:
+        return bcrypt.checkpw(_to_bytes(password), hashed_password.encode("ascii"))
+    except ValueError:
+        return False
+
+
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """True for legacy plaintext values and hashes made with another cost"""
+    if not hashed_password or not hashed_password.startswith(BCRYPT_PREFIXES):
+        return True
+    try:
+        return int(hashed_password.split("$")[2]) != rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasher:
+    """Async facade over a bounded process pool running bcrypt"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, rounds: int = BCRYPT_ROUNDS,
+                 queue_per_worker: int = PASSWORD_HASH_QUEUE):
+        self.workers = max(1, workers)
+        self.rounds = rounds
+        self.max_pending = self.workers * max(1, queue_per_worker)
+        self._executor = None
+        self._slots = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a server process that already runs threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool(), fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password_sync, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password_sync, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return needs_rehash(hashed_password, self.rounds)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+async def _benchmark(workers: int, jobs: int, rounds: int) -> float:
+    hasher = PasswordHasher(workers=workers, rounds=rounds)
+    stored = hash_password_sync("parola-de-test", rounds)
+    try:
+        # Warm up: start every worker process before timing
+        await asyncio.gather(*(hasher.verify("parola-de-test", stored) for _ in range(workers)))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(hasher.verify("parola-de-test", stored) for _ in range(jobs)))
+        elapsed = time.perf_counter() - start
+    finally:
+        hasher.shutdown()
+    assert all(results)
+    return jobs / elapsed
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    sizes = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    print(f"🔐 bcrypt verify throughput, cost {BCRYPT_ROUNDS}, {cores} core(s)")
+    baseline = None
+    for size in sizes:
+        rate = asyncio.run(_benchmark(size, jobs=size * 8, rounds=BCRYPT_ROUNDS))
+        baseline = baseline or rate
+        print(f"   {size:>2} worker(s): {rate:7.1f} logins/s  ({rate / baseline:.2f}x)")
@@ -0,0 +1,265 @@
+"""
+Pluggable cache for serialized JSON responses
+
+Entries are (etag, body) pairs: the body is the exact bytes sent to the client
+and the ETag is a strong validator derived from them, so a hit needs neither a
+query nor serialization and `If-None-Match` can be answered with a 304.
+
+Compressed variants are stored next to an entry under `{key}|{encoding}` the
+first time a client asks for that encoding, and are removed with it.
+
+Backends (RESPONSE_CACHE_BACKEND):
+    memory   per-worker LRU with TTL (default). Invalidation reaches the
+             worker that made the change; other workers catch up within
+             RESPONSE_CACHE_SECONDS.
+    file     one file per key under RESPONSE_CACHE_PATH, shared by every
+             worker on the host
+    sqlite   a SQLite database at RESPONSE_CACHE_PATH, shared by every
+             worker on the host
+    none     caching disabled
+
+Settings (environment):
+    RESPONSE_CACHE_SECONDS  entry lifetime (default 300)
+    RESPONSE_CACHE_SIZE     max entries of the memory backend (default 1024)
+    RESPONSE_CACHE_PATH     directory (file) or database file (sqlite);
+                            defaults to ./response_cache and ./response_cache.db
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.utils.compression import COMPRESSION_MIN_SIZE, compress_best, negotiate, weak_etag
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_SECONDS = float(os.getenv("RESPONSE_CACHE_SECONDS", "300"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")
+
+Entry = Tuple[str, bytes]
+
+# Every encoding a worker might have stored, whether or not this one supports it
+VARIANT_ENCODINGS = ("gzip", "br")
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _opaque(etag: str) -> str:
+    # If-None-Match uses weak comparison: W/"x" and "x" match
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when If-None-Match lists this ETag (or *)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [_opaque(value.strip()) for value in header.split(",")]
+    return "*" in candidates or _opaque(etag) in candidates
+
+
+def variant_key(key: str, encoding: str) -> str:
+    return f"{key}|{encoding}"
+
+
+def _with_variants(keys):
+    for key in keys:
+        yield key
+        for encoding in VARIANT_ENCODINGS:
+            yield variant_key(key, encoding)
+
+
+def json_response(request: Request, entry: Entry, headers: Optional[dict] = None,
+                  key: Optional[str] = None) -> Response:
+    """
+    200 with the cached body, or 304 when the client already has it.
+
+    With `key`, a body large enough to compress is sent in the negotiated
+    encoding, compressed once and kept in the cache as a variant of the entry.
+    """
+    etag, body = entry
+    headers = {"ETag": etag, **(headers or {})}
+    compressible = len(body) >= COMPRESSION_MIN_SIZE
+    if compressible:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    encoding = negotiate(request.headers.get("accept-encoding")) if compressible and key else None
+    if encoding is None:
+        return Response(content=body, media_type="application/json", headers=headers)
+    
+    # The variant records the ETag of the body it was made from, so one left
+    # behind by a concurrent invalidation is never served for a newer body
+    cached = response_cache.get(variant_key(key, encoding))
+    if cached is not None and cached[0] == weak_etag(etag):
+        compressed = cached[1]
+    else:
+        compressed = compress_best(body, encoding)
+        response_cache.set(variant_key(key, encoding), (weak_etag(etag), compressed))
+    headers.update({"ETag": weak_etag(etag), "Content-Encoding": encoding})
+    return Response(content=compressed, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """Interface shared by the backends; also the disabled ("none") backend"""
+
+    def get(self, key: str) -> Optional[Entry]:
+        return None
+
+    def set(self, key: str, entry: Entry) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    """Bounded LRU kept in this worker's memory"""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_SECONDS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires, entry = item
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in _with_variants(keys):
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileResponseCache(ResponseCache):
+    """One file per key: the ETag on the first line, then the body"""
+
+    def __init__(self, directory: str, ttl: float = RESPONSE_CACHE_SECONDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime >= self.ttl:
+                return None
+            etag, body = path.read_bytes().split(b"\n", 1)
+        except (OSError, ValueError):
+            return None
+        return etag.decode("ascii"), body
+
+    def set(self, key, entry):
+        etag, body = entry
+        path = self._path(key)
+        # Write then rename so readers never see a partial file
+        temporary = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(etag.encode("ascii") + b"\n" + body)
+        os.replace(temporary, path)
+
+    def delete(self, *keys):
+        for key in _with_variants(keys):
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Entries in a small SQLite database (WAL, one connection per thread)"""
+
+    def __init__(self, path: str, ttl: float = RESPONSE_CACHE_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS response_cache "
+            "(key TEXT PRIMARY KEY, etag TEXT NOT NULL, body BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT etag, body FROM response_cache WHERE key = ? AND expires > ?", (key, time.time())
+        ).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def set(self, key, entry):
+        etag, body = entry
+        self._connection().execute(
+            "INSERT OR REPLACE INTO response_cache (key, etag, body, expires) VALUES (?, ?, ?, ?)",
+            (key, etag, body, time.time() + self.ttl)
+        )
+
+    def delete(self, *keys):
+        if keys:
+            self._connection().executemany(
+                "DELETE FROM response_cache WHERE key = ?", [(key,) for key in _with_variants(keys)]
+            )
+
+    def clear(self):
+        self._connection().execute("DELETE FROM response_cache")
+
+
+def create_response_cache(backend: str = RESPONSE_CACHE_BACKEND, path: Optional[str] = RESPONSE_CACHE_PATH) -> ResponseCache:
+    """Build the configured backend"""
+    if backend == "memory":
+        return MemoryResponseCache()
+    if backend == "file":
+        return FileResponseCache(path or "./response_cache")
+    if backend == "sqlite":
+        return SQLiteResponseCache(path or "./response_cache.db")
+    if backend == "none":
+        return ResponseCache()
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {backend}")
+
+
+response_cache = create_response_cache()
@@ -0,0 +1,47 @@
+"""
+Retry for transient SQLite write contention
+
+SQLite allows one writer at a time. When busy_timeout runs out the driver
+raises OperationalError("database is locked"), which says nothing about the
+request itself, so the write is rolled back and tried again after a short,
+jittered backoff.
+
+Settings (environment):
+    DB_LOCK_RETRIES         extra attempts after the first one (default 5)
+    DB_LOCK_RETRY_BASE_MS   first backoff; doubles on every attempt (default 20)
+"""
+import os
+import random
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+DB_LOCK_RETRIES = int(os.getenv("DB_LOCK_RETRIES", "5"))
+DB_LOCK_RETRY_BASE_MS = float(os.getenv("DB_LOCK_RETRY_BASE_MS", "20"))
+
+LOCK_MESSAGES = ("database is locked", "database table is locked")
+
+
+def is_lock_error(error: OperationalError) -> bool:
+    """True when the error is SQLite write contention rather than a real failure"""
+    message = str(getattr(error, "orig", error)).lower()
+    return any(text in message for text in LOCK_MESSAGES)
+
+
+def run_with_lock_retry(db: Session, write, retries: int = DB_LOCK_RETRIES):
+    """
+    Call write() (which must add its objects and commit) until it succeeds.
+
+    On a lock error the session is rolled back before the next attempt, so
+    write() has to rebuild any objects it adds. Other errors propagate.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return write()
+        except OperationalError as error:
+            db.rollback()
+            if attempt == retries or not is_lock_error(error):
+                raise
+            delay = DB_LOCK_RETRY_BASE_MS * (2 ** attempt) / 1000
+            time.sleep(delay * random.uniform(0.5, 1.5))
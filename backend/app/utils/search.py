@@ -0,0 +1,200 @@
+"""
+Full-text search over property listings
+
+SQLite uses an external-content FTS5 table (`properties_fts`) kept in sync with
+`properties` by triggers, so every insert/update/delete - including
+`create_property` and the seed scripts - updates the index in the same
+transaction. PostgreSQL uses a GIN index over an unaccented tsvector.
+
+Both tokenizers strip diacritics, so "brasov" matches "Brașov" (and the legacy
+cedilla spelling "Braşov").
+"""
+import logging
+import re
+
+from sqlalchemy import Float, cast, func, literal_column, select, table, column, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Query, Session
+
+from app import models
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "properties_fts"
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        location, address, description,
+        content='properties', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ai AFTER INSERT ON properties BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, location, address, description)
+        VALUES (new.id, new.location, new.address, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS properties_fts_ad AFTER DELETE ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, address, description)
+        VALUES ('delete', old.id, old.location, old.address, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS properties_fts_au AFTER UPDATE ON properties BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, address, description)
+        VALUES ('delete', old.id, old.location, old.address, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, location, address, description)
+        VALUES (new.id, new.location, new.address, new.description);
+    END
+    """,
+]
+
+# unaccent() is only STABLE, so it is wrapped in an IMMUTABLE function to be
+# usable inside an index expression.
+_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    """
+    CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT public.unaccent('public.unaccent', $1) $$
+    """,
+]
+
+# Separate so migrations can build it CONCURRENTLY (outside a transaction)
+POSTGRES_SEARCH_INDEX = """
+    CREATE INDEX IF NOT EXISTS ix_properties_search ON properties USING gin (
+        to_tsvector('simple', f_unaccent(
+            coalesce(location, '') || ' ' || coalesce(address, '') || ' ' || coalesce(description, '')
+        ))
+    )
+"""
+
+_fts = table(FTS_TABLE, column("rowid"))
+_backend_cache = {}
+
+
+def ensure_search_index(engine: Engine, build_index: bool = True) -> bool:
+    """
+    Create the full-text index for the engine's dialect (idempotent).
+
+    With build_index=False the PostgreSQL GIN index is left to the caller
+    (POSTGRES_SEARCH_INDEX); the migrations build it concurrently.
+    """
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                    {"name": FTS_TABLE}
+                ).first() is not None
+                for statement in _SQLITE_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were inserted before the triggers existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for statement in _POSTGRES_DDL:
+                    conn.execute(text(statement))
+                if build_index:
+                    conn.execute(text(POSTGRES_SEARCH_INDEX))
+            else:
+                return False
+    except (OperationalError, ProgrammingError) as e:
+        logger.warning("Full-text search unavailable, falling back to ILIKE: %s", e)
+        return False
+
+    _backend_cache.pop(str(engine.url), None)
+    return True
+
+
+def _search_backend(db: Session):
+    """Return "fts5", "postgresql" or None if no full-text index is installed"""
+    bind = db.get_bind()
+    key = str(bind.engine.url)
+    if key not in _backend_cache:
+        backend = None
+        if bind.dialect.name == "sqlite":
+            found = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type='table' AND name=:name"),
+                {"name": FTS_TABLE}
+            ).first()
+            backend = "fts5" if found else None
+        elif bind.dialect.name == "postgresql":
+            found = db.execute(text("SELECT 1 FROM pg_proc WHERE proname = 'f_unaccent'")).first()
+            backend = "postgresql" if found else None
+        _backend_cache[key] = backend
+    return _backend_cache[key]
+
+
+def _tokens(search: str):
+    """Split user input into word tokens (drops quotes and FTS operators)"""
+    return re.findall(r"\w+", search.lower())
+
+
+def apply_search(db: Session, query: Query, search: str, id_column=models.Property.id):
+    """
+    Filter a query by a search term over property text.
+
+    id_column is the property id of the rows being queried, so the same search
+    works for Property and for read models keyed by property id.
+
+    Returns (query, score) where score is a relevance expression that sorts
+    best-first in ascending order, or None when only the ILIKE fallback is
+    available. Ordering is left to the caller so it can paginate on it.
+    """
+    tokens = _tokens(search)
+    if not tokens:
+        return query, None
+
+    backend = _search_backend(db)
+    if backend == "fts5":
+        # Every token must match, as a prefix ("bras" finds "Brașov")
+        match = " ".join(f'"{token}"*' for token in tokens)
+        # Materialized, so the MATCH runs once and drives the join. As a plain
+        # subquery SQLite 3.40 may put an index on the cards outermost (e.g.
+        # type=? for forRent) and re-run the MATCH for every card.
+        matches = (
+            select(
+                _fts.c.rowid.label("property_id"),
+                func.bm25(literal_column(FTS_TABLE)).label("score")
+            )
+            .where(literal_column(FTS_TABLE).op("MATCH")(match))
+            .cte("search_matches")
+            .prefix_with("MATERIALIZED")
+        )
+        # bm25() is already lower-is-better
+        return query.join(matches, matches.c.property_id == id_column), matches.c.score
+
+    if id_column is not models.Property.id:
+        query = query.join(models.Property, models.Property.id == id_column)
+
+    if backend == "postgresql":
+        document = func.to_tsvector(
+            literal_column("'simple'"),
+            func.f_unaccent(
+                func.coalesce(models.Property.location, "").op("||")(" ")
+                .op("||")(func.coalesce(models.Property.address, ""))
+                .op("||")(" ")
+                .op("||")(func.coalesce(models.Property.description, ""))
+            )
+        )
+        ts_query = func.to_tsquery(
+            literal_column("'simple'"),
+            func.f_unaccent(" & ".join(f"{token}:*" for token in tokens))
+        )
+        # ts_rank() is float4; as double precision the value a cursor stores
+        # is exactly the value the next page compares against
+        score = -cast(func.ts_rank(document, ts_query), Float(53))
+        return query.filter(document.op("@@")(ts_query)), score
+
+    search_term = f"%{search.lower()}%"
+    return query.filter(
+        (models.Property.location.ilike(search_term)) |
+        (models.Property.description.ilike(search_term)) |
+        (models.Property.address.ilike(search_term))
+    ), None
@@ -0,0 +1,158 @@
+"""
+Load test: sync (threadpool) vs async (ASYNC_DB=1) read routes
+
+Seeds a temporary SQLite database, then for each mode boots uvicorn in a
+subprocess and drives the read-heavy endpoints with N concurrent clients,
+reporting throughput and p50/p95/p99 latency.
+
+Usage (from backend/): python -m benchmarks.async_load [--clients 500] [--seconds 20] [--properties 2000]
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def seed_database(url: str, properties: int) -> None:
+    """Create the schema and load a synthetic catalogue in a child process"""
+    script = f"""
+import random
+from app.database import SessionLocal, engine
+from app import models
+from app.migrations import upgrade
+upgrade(engine)
+rng = random.Random(42)
+db = SessionLocal()
+owners = [models.User(name=f"Owner {{i}}", email=f"owner{{i}}@bench.local", hashed_password="x", role="owner", is_verified=True) for i in range(50)]
+db.add_all(owners)
+db.flush()
+cities = ["București", "Cluj-Napoca", "Iași", "Timișoara", "Brașov", "Constanța"]
+for i in range({properties}):
+    kind = rng.choice(["rent", "sale"])
+    prop = models.Property(
+        title=f"Apartament {{i}}", description="Apartament luminos, aproape de parc și transport public. " * 3,
+        address=f"Strada Exemplu nr. {{i}}", location=rng.choice(cities),
+        price=rng.randint(300, 3000) if kind == "rent" else rng.randint(40000, 250000),
+        price_period="lună" if kind == "rent" else "one-time", type=kind,
+        rooms=rng.randint(1, 5), bathrooms=1, surface=rng.randint(30, 150), owner_id=rng.choice(owners).id
+    )
+    db.add(prop)
+    db.flush()
+    db.add(models.PropertyImage(property_id=prop.id, image_url=f"/images/{{i}}.jpg", is_primary=True))
+db.commit()
+"""
+    env = dict(os.environ, DATABASE_URL=url)
+    subprocess.run([sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, check=True)
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30) -> None:
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() < deadline:
+            try:
+                if (await client.get(f"{base_url}/api/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def drive(base_url: str, clients: int, seconds: float, properties: int) -> dict:
+    paths = [
+        lambda rng: "/api/listings?limit=20",
+        lambda rng: f"/api/listings?limit=20&search={rng.choice(['cluj', 'brasov', 'parc'])}",
+        lambda rng: f"/api/properties/{rng.randint(1, properties)}",
+        lambda rng: f"/api/properties/owner/{rng.randint(1, 50)}",
+        lambda rng: f"/api/reviews/property/{rng.randint(1, properties)}",
+        lambda rng: "/api/stats",
+    ]
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def run_client(seed: int):
+            nonlocal errors
+            rng = random.Random(seed)
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(rng.choice(paths)(rng))
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(run_client(i) for i in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors
+    }
+
+
+def run_mode(mode: str, url: str, args) -> dict:
+    port = args.port
+    env = dict(os.environ, DATABASE_URL=url, ASYNC_DB="1" if mode == "async" else "0", LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        return asyncio.run(drive(base_url, args.clients, args.seconds, args.properties))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=3099)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-async-'), 'bench.db')}"
+    print(f"🌱 Seeding {args.properties} properties...")
+    seed_database(url, args.properties)
+
+    print(f"📊 {args.clients} concurrent clients, {args.seconds:g}s per mode")
+    for mode in ("sync", "async"):
+        result = run_mode(mode, url, args)
+        print(
+            f"   {mode:<6} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+            f"p95 {result['p95_ms']:7.1f} ms  p99 {result['p99_ms']:7.1f} ms  {result['errors']} error(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
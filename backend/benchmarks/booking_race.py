@@ -0,0 +1,111 @@
+"""
+Stress test for create_visit: many buyers race for the same slot
+
+Every round starts a fresh set of threads behind a barrier, all booking one
+(property, date, time) through the create_visit route function. Exactly one
+must win; the rest must get the "slot already booked" 400. Any other outcome
+(double booking, lock errors leaking out) fails the run with exit code 1.
+
+--without-index drops uq_visits_scheduled_slot to show the race the plain
+check-then-insert allows.
+
+Usage (from backend/): python -m benchmarks.booking_race [--threads 32] [--rounds 20] [--profile default]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.database import Base, create_db_engine
+from app import models, schemas
+from app.routers import visits
+from benchmarks.visit_writes import SLOT_TIMES, _seed
+
+
+def run_round(engine, buyers, property_id, visit_date, visit_time) -> Counter:
+    outcomes = Counter()
+    lock = threading.Lock()
+    barrier = threading.Barrier(len(buyers))
+
+    def book(buyer):
+        # Wait before opening a session: the pool has fewer connections than threads
+        barrier.wait()
+        with Session(bind=engine) as db:
+            try:
+                visits.create_visit(
+                    schemas.VisitCreate(property_id=property_id, visit_date=visit_date, visit_time=visit_time),
+                    current_user=buyer,
+                    db=db
+                )
+                outcome = "booked"
+            except HTTPException as error:
+                outcome = f"http {error.status_code}"
+            except Exception as error:
+                outcome = type(error).__name__
+        with lock:
+            outcomes[outcome] += 1
+
+    threads = [threading.Thread(target=book, args=(buyer,)) for buyer in buyers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--profile", default="default", choices=["default", "production"])
+    parser.add_argument("--without-index", action="store_true")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench-booking-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile=args.profile)
+    Base.metadata.create_all(bind=engine)
+    if args.without_index:
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX uq_visits_scheduled_slot"))
+    buyer_ids, property_ids = _seed(engine, args.threads)
+    with Session(bind=engine) as db:
+        buyers = db.query(models.User).filter(models.User.id.in_(buyer_ids)).all()
+        db.expunge_all()
+
+    print(f"🏁 {args.threads} buyer(s) per slot, {args.rounds} round(s), {args.profile} profile"
+          + (", without unique index" if args.without_index else ""))
+    totals = Counter()
+    failed_rounds = 0
+    for n in range(args.rounds):
+        visit_date = f"2030-02-{n % 28 + 1:02d}"
+        visit_time = SLOT_TIMES[n % len(SLOT_TIMES)]
+        outcomes = run_round(engine, buyers, property_ids[0], visit_date, visit_time)
+        totals.update(outcomes)
+        with Session(bind=engine) as db:
+            stored = db.query(models.Visit).filter(
+                models.Visit.property_id == property_ids[0],
+                models.Visit.visit_date == visit_date,
+                models.Visit.visit_time == visit_time,
+                models.Visit.status == "scheduled"
+            ).count()
+        ok = outcomes["booked"] == 1 and stored == 1 and outcomes["http 400"] == args.threads - 1
+        failed_rounds += not ok
+        if not ok:
+            print(f"   ❌ round {n + 1}: {dict(outcomes)}, {stored} scheduled row(s)")
+    engine.dispose()
+
+    print(f"   outcomes: {dict(totals)}")
+    if failed_rounds:
+        print(f"❌ {failed_rounds}/{args.rounds} round(s) did not end with exactly one booking")
+        sys.exit(1)
+    print("✅ Every round ended with exactly one booking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Check: GET /api/listings/export with a search term on every search backend
+
+The export joins Property itself, so the search must not join it again. Runs
+the NDJSON and CSV exports with a search against a fresh SQLite database,
+once with FTS5 and once with the ILIKE fallback forced (the path PostgreSQL
+shares), and compares the ids with the listings that should match. Exits
+with 1 on any difference or error.
+
+Usage (from backend/): python -m benchmarks.export_search
+"""
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+DIRECTORY = tempfile.mkdtemp(prefix="check-export-")
+# Before anything imports app.database, which reads it once
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DIRECTORY, 'check.db')}"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import models  # noqa: E402
+from app.database import SessionLocal, engine  # noqa: E402
+from app.migrations import upgrade  # noqa: E402
+from app.utils import search  # noqa: E402
+
+CITIES = ["Cluj-Napoca", "București", "Iași", "Cluj-Napoca", "Brașov"]
+SEARCH = "cluj"
+
+
+def _seed() -> set:
+    """Five listings; returns the ids of those the search should find"""
+    with SessionLocal() as db:
+        owner = models.User(name="Ion Popescu", email="ion@check.local", hashed_password="x", role="owner")
+        db.add(owner)
+        db.flush()
+        expected = set()
+        for i, city in enumerate(CITIES):
+            prop = models.Property(
+                title=f"Apartament {i}", description="Apartament luminos, aproape de parc.",
+                address=f"Strada Exemplu nr. {i}", location=city, price=500 + i * 100,
+                price_period="lună", type="rent", rooms=2, bathrooms=1, surface=50, owner_id=owner.id
+            )
+            db.add(prop)
+            db.flush()
+            db.add(models.PropertyImage(property_id=prop.id, image_url=f"/images/{i}.jpg", is_primary=True))
+            if SEARCH in city.lower():
+                expected.add(prop.id)
+        db.commit()
+    return expected
+
+
+def _export_ids(client, format: str) -> set:
+    response = client.get("/api/listings/export", params={"format": format, "search": SEARCH})
+    if response.status_code != 200:
+        raise AssertionError(f"{format}: HTTP {response.status_code}")
+    if format == "csv":
+        return {int(row["id"]) for row in csv.DictReader(io.StringIO(response.text))}
+    return {json.loads(line)["id"] for line in response.text.splitlines()}
+
+
+def main() -> int:
+    upgrade(engine)
+    expected = _seed()
+
+    import main as server
+
+    failures = 0
+    with TestClient(server.app) as client:
+        for backend in ("fts5", None):
+            # The cached backend decides which search path apply_search takes
+            search._backend_cache[str(engine.url)] = backend
+            label = backend or "ILIKE fallback"
+            for format in ("ndjson", "csv"):
+                try:
+                    ids = _export_ids(client, format)
+                except Exception as e:
+                    print(f"❌ {label}, {format}: {e}")
+                    failures += 1
+                    continue
+                if ids != expected:
+                    print(f"❌ {label}, {format}: got ids {sorted(ids)}, expected {sorted(expected)}")
+                    failures += 1
+                else:
+                    print(f"✅ {label}, {format}: {len(ids)} listing(s)")
+
+    if failures:
+        print(f"\n❌ {failures} export(s) with a search term failed")
+        return 1
+    print("\n✅ Exports with a search term match on every backend")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
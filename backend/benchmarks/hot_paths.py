@@ -0,0 +1,202 @@
+"""
+Micro-benchmarks for the per-row Python work of the hot routes
+
+Each case runs the route's own row builder over a fixed in-memory dataset
+(transient ORM objects from a seeded generator, no database), so a regression
+in the HTTP suite can be split into Python work and database time:
+
+    price labels          listing_cards.format_price, once per card refresh
+    listing items         listings._listing_item + orjson, as get_listings
+    listing items (pyd.)  the same rows validated against PropertyListResponse
+                          (FAST_JSON=0)
+    owner properties      properties._owner_property_dict + orjson, five
+                          images each, as get_owner_properties
+    review responses      reviews._review_response, as every review page
+    slot grids            visits._slot_grid, one day each
+    availability          visits._availability_bitmaps, 50 properties × 62 days
+
+Every case is repeated for --seconds; the fastest repetition is reported, in
+µs per row. --output and --baseline work as in benchmarks.http_suite.
+
+Usage (from backend/): python -m benchmarks.hot_paths [--rows 1000] [--seconds 1] [--output hot_paths.json]
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from app import models
+from app.listing_cards import format_price, make_snippet
+from app.routers.listings import _listing_item
+from app.routers.properties import _owner_property_dict
+from app.routers.reviews import _review_response
+from app.routers.visits import VISIT_SLOTS, _availability_bitmaps, _slot_grid
+from app.utils.fast_json import dumps
+from benchmarks.json_serialization import _fastapi_body
+
+RESULTS_VERSION = 1
+CITIES = ["București", "Cluj-Napoca", "Iași", "Timișoara", "Brașov", "Constanța"]
+DESCRIPTION = "Apartament luminos, aproape de metrou, complet mobilat și utilat, cu balcon închis. "
+
+
+class Dataset:
+    """Seeded rows shaped like the ones each route loads"""
+
+    def __init__(self, rows: int, seed: int = 42):
+        rng = random.Random(seed)
+        created = datetime(2025, 1, 1)
+        self.owner = models.User(
+            id=1, name="Ion Popescu", email="ion.popescu@example.com", role="owner",
+            account_created_year=2020, profile_description="Proprietar cu experiență."
+        )
+        self.properties = []
+        self.cards = []
+        self.images = {}
+        for i in range(rows):
+            kind = "rent" if rng.random() < 0.7 else "sale"
+            prop = models.Property(
+                id=i + 1, title=f"Apartament {i + 1}", description=DESCRIPTION * 3,
+                address=f"Strada Exemplu nr. {i + 1}", location=rng.choice(CITIES),
+                price=rng.randint(300, 3000) if kind == "rent" else rng.randint(40000, 250000),
+                price_currency="RON" if kind == "rent" else "EUR",
+                price_period="lună" if kind == "rent" else "one-time", type=kind,
+                rooms=rng.randint(1, 4), bathrooms=1, surface=rng.randint(30, 120), owner_id=1,
+                created_at=created - timedelta(minutes=i)
+            )
+            self.properties.append(prop)
+            self.images[prop.id] = [
+                models.PropertyImage(id=i * 5 + n, property_id=prop.id, image_url=f"/images/{prop.id}/{n}.jpg",
+                                     is_primary=n == 0, order=n)
+                for n in range(5)
+            ]
+            self.cards.append(models.ListingCard(
+                property_id=prop.id, created_at=prop.created_at, price=prop.price,
+                price_label=format_price(prop.type, prop.price, prop.price_currency, prop.price_period),
+                description=make_snippet(prop.description), image=self.images[prop.id][0].image_url,
+                location=prop.location, rooms=prop.rooms, type=prop.type
+            ))
+        self.reviews = [
+            (
+                models.Review(
+                    id=i + 1, owner_id=1, buyer_id=2 + i % 50, property_id=1 + i % rows, visit_id=None,
+                    rating=rng.randint(1, 5), comment="Proprietar amabil, totul conform descrierii.",
+                    created_at=created - timedelta(hours=i)
+                ),
+                f"Cumpărător {i % 50}", f"Apartament {1 + i % rows}"
+            )
+            for i in range(rows)
+        ]
+        self.booked_days = [
+            {slot for slot in VISIT_SLOTS if rng.random() < 0.3} for _ in range(rows)
+        ]
+        start = date(2025, 3, 1)
+        self.dates = [(start + timedelta(days=offset)).isoformat() for offset in range(62)]
+        self.property_ids = list(range(1, 51))
+        self.booked_rows = [
+            (rng.choice(self.property_ids), rng.choice(self.dates), rng.choice(VISIT_SLOTS))
+            for _ in range(rows)
+        ]
+
+
+def cases(data: Dataset):
+    """(name, rows per call, callable)"""
+    rows = len(data.properties)
+    return [
+        ("price labels", rows, lambda: [
+            format_price(p.type, p.price, p.price_currency, p.price_period) for p in data.properties
+        ]),
+        ("listing items", rows, lambda: dumps({
+            "listings": [_listing_item(card) for card in data.cards], "total": rows, "next_cursor": None
+        })),
+        ("listing items (pydantic)", rows, lambda: _fastapi_body({
+            "listings": [_listing_item(card) for card in data.cards], "total": rows, "next_cursor": None
+        })),
+        ("owner properties", rows, lambda: dumps([
+            _owner_property_dict(p, data.images[p.id], data.owner) for p in data.properties
+        ])),
+        ("review responses", rows, lambda: [
+            _review_response(review, buyer_name, title) for review, buyer_name, title in data.reviews
+        ]),
+        ("slot grids", rows, lambda: [_slot_grid(booked) for booked in data.booked_days]),
+        ("availability", rows, lambda: _availability_bitmaps(data.property_ids, data.dates, data.booked_rows)),
+    ]
+
+
+def measure(build, seconds: float) -> list:
+    """Duration of each repetition, in seconds"""
+    build()
+    durations = []
+    deadline = time.perf_counter() + seconds
+    while True:
+        start = time.perf_counter()
+        build()
+        end = time.perf_counter()
+        durations.append(end - start)
+        if end >= deadline and len(durations) >= 5:
+            return durations
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    problems = []
+    for name, current in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous and current["us_per_row"] > previous["us_per_row"] * (1 + max_regression):
+            problems.append(f"{name}: {previous['us_per_row']:.2f} → {current['us_per_row']:.2f} µs/row")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=1.0, help="per case")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    data = Dataset(args.rows, args.seed)
+    print(f"📊 Hot paths over {args.rows:,} rows, {args.seconds:g}s per case")
+    results = {}
+    for name, rows, build in cases(data):
+        durations = measure(build, args.seconds)
+        best = min(durations)
+        results[name] = {
+            "rows": rows,
+            "repetitions": len(durations),
+            "best_ms": round(best * 1000, 3),
+            "median_ms": round(statistics.median(durations) * 1000, 3),
+            "us_per_row": round(best / rows * 1e6, 3),
+            "rows_per_s": round(rows / best)
+        }
+        row = results[name]
+        print(f"   {name:<26} {row['us_per_row']:8.2f} µs/row  {row['rows_per_s']:12,} rows/s  "
+              f"(median {row['median_ms']:.2f} ms per call)")
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {"rows": args.rows, "seed": args.seed},
+        "cases": results
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.max_regression)
+        if problems:
+            print(f"\n❌ Regressions against {args.baseline}:")
+            for problem in problems:
+                print(f"   - {problem}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+HTTP benchmark suite: scripted user scenarios against every router
+
+Generates a synthetic dataset (app.synthetic_data) in a temporary SQLite
+database, or uses --database-url, then boots main:app in-process (httpx ASGI
+transport) or under uvicorn and runs N concurrent virtual users. Each one
+plays a fixed, seeded sequence of scenarios:
+
+    browse    listings with random filters, then the next page
+    details   property details, its reviews, the owner's rating and listings
+    slots     one day's slots and a two-week availability range
+    book      book a visit, then list my visits
+    review    review a property the buyer has booked
+    account   log in, read the profile
+    stats     platform statistics
+
+Reported per endpoint: requests, errors, throughput, p50/p95/p99 latency and
+SQL queries per request (from the Server-Timing header). --output writes the
+results as JSON; --baseline compares against an earlier file and exits with 1
+when an endpoint got slower than --max-regression allows, issues more
+queries, or errors appear.
+
+Usage (from backend/): python -m benchmarks.http_suite [--properties 20000] [--clients 32] [--iterations 50]
+                           [--server inprocess|uvicorn] [--output results.json] [--baseline previous.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.async_load import BACKEND_DIR, percentile, wait_until_ready
+
+RESULTS_VERSION = 1
+PASSWORD = "password123"
+QUERIES = re.compile(r'desc="(\d+) queries"')
+SCENARIO_WEIGHTS = {"browse": 30, "details": 25, "slots": 15, "book": 10, "review": 5, "account": 5, "stats": 10}
+PRICE_FILTERS = [None, "0-500", "500-1000", "1000-2000", "2000+"]
+SEARCH_TERMS = [None, None, "cluj", "bucuresti", "iasi", "parcare", "metrou", "renovat"]
+
+
+class Recorder:
+    """Latency and query count samples per endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, response=None, ok: bool = True) -> None:
+        self.latencies[endpoint].append(seconds)
+        if not ok:
+            self.errors[endpoint] += 1
+        if response is not None:
+            match = QUERIES.search(response.headers.get("server-timing", ""))
+            if match:
+                self.queries[endpoint].append(int(match.group(1)))
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for endpoint in sorted(self.latencies):
+            latencies = self.latencies[endpoint]
+            queries = self.queries[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(latencies),
+                "errors": self.errors[endpoint],
+                "rps": round(len(latencies) / elapsed, 2),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+                "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+                "max_queries": max(queries) if queries else None
+            }
+        every = [value for values in self.latencies.values() for value in values]
+        total = {
+            "requests": len(every),
+            "errors": sum(self.errors.values()),
+            "rps": round(len(every) / elapsed, 2),
+            "p50_ms": round(percentile(every, 50) * 1000, 2),
+            "p95_ms": round(percentile(every, 95) * 1000, 2),
+            "p99_ms": round(percentile(every, 99) * 1000, 2)
+        }
+        return {"endpoints": endpoints, "total": total}
+
+
+class VirtualUser:
+    """One client replaying a seeded sequence of scenarios"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, dataset: dict, seed: int):
+        self.client = client
+        self.recorder = recorder
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.buyer = self.rng.choice(dataset["buyers"])
+        self.headers = {"Authorization": f"Bearer {dataset['tokens'][self.buyer]}"}
+        self.booked = []
+
+    async def request(self, method: str, endpoint: str, url: str, expected=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(endpoint, time.perf_counter() - start, ok=False)
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - start, response, response.status_code in expected)
+        return response
+
+    def property(self):
+        # A few listings get most of the traffic, as in production
+        properties = self.dataset["properties"]
+        return properties[int(len(properties) * self.rng.random() ** 2)]
+
+    async def browse(self):
+        params = {"limit": 20}
+        search = self.rng.choice(SEARCH_TERMS)
+        if search:
+            params["search"] = search
+        price = self.rng.choice(PRICE_FILTERS)
+        if price:
+            params["price"] = price
+        if self.rng.random() < 0.3:
+            params[self.rng.choice(["forSale", "forRent"])] = "true"
+        if self.rng.random() < 0.2:
+            params["twoPlusRooms"] = "true"
+        response = await self.request("GET", "GET /api/listings", "/api/listings", params=params)
+        if response is not None and response.status_code == 200:
+            cursor = response.json().get("next_cursor")
+            if cursor:
+                await self.request("GET", "GET /api/listings (next page)", "/api/listings",
+                                   params={**params, "cursor": cursor})
+
+    async def details(self):
+        property_id, owner_id = self.property()
+        await self.request("GET", "GET /api/properties/{id}", f"/api/properties/{property_id}")
+        await self.request("GET", "GET /api/reviews/property/{id}", f"/api/reviews/property/{property_id}")
+        await self.request("GET", "GET /api/reviews/owner/{id}/summary", f"/api/reviews/owner/{owner_id}/summary")
+        if self.rng.random() < 0.3:
+            await self.request("GET", "GET /api/reviews/owner/{id}", f"/api/reviews/owner/{owner_id}")
+            await self.request("GET", "GET /api/properties/owner/{id}", f"/api/properties/owner/{owner_id}")
+
+    async def slots(self):
+        property_id, _ = self.property()
+        day = self.dataset["today"] + timedelta(days=self.rng.randint(1, 14))
+        await self.request("GET", "GET /api/visits/available/{id}", f"/api/visits/available/{property_id}",
+                           params={"date": day.isoformat()})
+        ids = [self.property()[0] for _ in range(5)]
+        await self.request("GET", "GET /api/visits/available", "/api/visits/available", params={
+            "start": day.isoformat(), "end": (day + timedelta(days=13)).isoformat(), "property_ids": ids
+        })
+
+    async def book(self):
+        property_id, owner_id = self.property()
+        # Far enough ahead not to collide with the generated schedule; a taken slot is a normal 400
+        day = self.dataset["today"] + timedelta(days=self.rng.randint(60, 400))
+        time_slot = f"{self.rng.randint(9, 15):02d}:{self.rng.choice(['00', '30'])}"
+        response = await self.request("POST", "POST /api/visits", "/api/visits", expected=(200, 400), headers=self.headers, json={
+            "property_id": property_id, "visit_date": day.isoformat(), "visit_time": time_slot
+        })
+        if response is not None and response.status_code == 200:
+            self.booked.append((property_id, owner_id))
+        await self.request("GET", "GET /api/visits/my-visits", "/api/visits/my-visits", headers=self.headers)
+
+    async def review(self):
+        if not self.booked:
+            await self.book()
+        if not self.booked:
+            return
+        property_id, owner_id = self.booked.pop()
+        # 400 when this buyer already reviewed the property
+        await self.request("POST", "POST /api/reviews", "/api/reviews", expected=(200, 400), headers=self.headers, json={
+            "owner_id": owner_id, "property_id": property_id, "rating": self.rng.randint(3, 5),
+            "comment": "Vizionare reușită, proprietar punctual."
+        })
+
+    async def account(self):
+        await self.request("POST", "POST /api/auth/login", "/api/auth/login",
+                           json={"email": self.buyer, "password": PASSWORD})
+        await self.request("GET", "GET /api/profile/me", "/api/profile/me", headers=self.headers)
+
+    async def stats(self):
+        await self.request("GET", "GET /api/stats", "/api/stats")
+
+    async def run(self, iterations: int):
+        names = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        for _ in range(iterations):
+            await getattr(self, self.rng.choices(names, weights)[0])()
+
+
+def generate_dataset(url: str, args) -> None:
+    """Load synthetic data in a child process, the same way an operator would"""
+    env = dict(os.environ, DATABASE_URL=url)
+    subprocess.run([sys.executable, "-m", "app.migrate_db"], cwd=BACKEND_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    subprocess.run(
+        [sys.executable, "-m", "app.seed_data", "--synthetic", "--seed", str(args.seed),
+         "--properties", str(args.properties)],
+        cwd=BACKEND_DIR, env=env, check=True, stdout=subprocess.DEVNULL
+    )
+
+
+def discover(url: str, seed: int, buyers: int, sample: int = 5000) -> dict:
+    """Pick the properties and buyers the scenarios will use"""
+    from app import models
+
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        max_id = connection.execute(select(func.max(models.Property.id))).scalar() or 0
+        rng = random.Random(seed)
+        candidates = sorted({rng.randint(1, max_id) for _ in range(sample)}) if max_id else []
+        properties = connection.execute(
+            select(models.Property.id, models.Property.owner_id).where(models.Property.id.in_(candidates))
+        ).all()
+        emails = connection.execute(
+            select(models.User.email)
+            .where(models.User.role == "buyer", models.User.email.like("user%@example.ro"))
+            .order_by(models.User.id)
+            .limit(buyers)
+        ).scalars().all()
+    engine.dispose()
+    if not properties or not emails:
+        raise SystemExit("❌ The database has no synthetic data; run python -m app.seed_data --synthetic first")
+    rng.shuffle(properties)
+    return {"properties": [tuple(row) for row in properties], "buyers": list(emails)}
+
+
+async def log_in(client: httpx.AsyncClient, emails) -> dict:
+    tokens = {}
+    for email in emails:
+        response = await client.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        tokens[email] = response.json()["token"]
+    return tokens
+
+
+async def drive(client: httpx.AsyncClient, dataset: dict, args) -> dict:
+    dataset["tokens"] = await log_in(client, dataset["buyers"])
+    dataset["today"] = date.today()
+    if args.warmup:
+        warmup = Recorder()
+        await asyncio.gather(*(
+            VirtualUser(client, warmup, dataset, seed=-1 - i).run(args.warmup) for i in range(args.clients)
+        ))
+
+    recorder = Recorder()
+    users = [VirtualUser(client, recorder, dataset, seed=args.seed * 1000 + i) for i in range(args.clients)]
+    start = time.perf_counter()
+    await asyncio.gather(*(user.run(args.iterations) for user in users))
+    elapsed = time.perf_counter() - start
+    return {**recorder.summary(elapsed), "elapsed_s": round(elapsed, 2)}
+
+
+async def run_inprocess(dataset: dict, args) -> dict:
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    import main
+    from app.utils.passwords import password_hasher
+
+    transport = httpx.ASGITransport(app=main.app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+            return await drive(client, dataset, args)
+    finally:
+        password_hasher.shutdown()
+
+
+def run_uvicorn(url: str, dataset: dict, args) -> dict:
+    env = dict(os.environ, DATABASE_URL=url, LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--workers", str(args.workers),
+         "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env, start_new_session=True
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+
+    async def run():
+        await wait_until_ready(base_url)
+        limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+            return await drive(client, dataset, args)
+
+    try:
+        return asyncio.run(run())
+    finally:
+        # The whole group, so the password hashing workers stop with the server
+        os.killpg(server.pid, signal.SIGTERM)
+        server.wait()
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list:
+    """Regressions of results against baseline, as printable lines"""
+    problems = []
+    if results["total"]["errors"]:
+        problems.append(f"{results['total']['errors']} request(s) failed")
+    for endpoint, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + max_regression):
+            problems.append(f"{endpoint}: p95 {previous['p95_ms']:.1f} → {current['p95_ms']:.1f} ms")
+        if (current["queries_per_request"] or 0) > (previous["queries_per_request"] or 0) + 0.01:
+            problems.append(
+                f"{endpoint}: queries/request {previous['queries_per_request']} → {current['queries_per_request']}"
+            )
+    return problems
+
+
+def print_report(results: dict) -> None:
+    print(f"\n   {'endpoint':<40} {'req':>6} {'err':>4} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}")
+    for endpoint, row in results["endpoints"].items():
+        queries = "-" if row["queries_per_request"] is None else f"{row['queries_per_request']:g}"
+        print(
+            f"   {endpoint:<40} {row['requests']:>6} {row['errors']:>4} {row['rps']:>8.1f} "
+            f"{row['p50_ms']:>6.1f}ms {row['p95_ms']:>6.1f}ms {row['p99_ms']:>6.1f}ms {queries:>8}"
+        )
+    total = results["total"]
+    print(
+        f"   {'all':<40} {total['requests']:>6} {total['errors']:>4} {total['rps']:>8.1f} "
+        f"{total['p50_ms']:>6.1f}ms {total['p95_ms']:>6.1f}ms {total['p99_ms']:>6.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--server", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--database-url", help="existing database with synthetic data (default: generate one)")
+    parser.add_argument("--properties", type=int, default=20000, help="size of the generated dataset")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=50, help="scenarios per client")
+    parser.add_argument("--warmup", type=int, default=5, help="untimed scenarios per client first")
+    parser.add_argument("--buyers", type=int, default=20, help="distinct logged-in buyers")
+    parser.add_argument("--port", type=int, default=3098)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="allowed p95 increase (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    url = args.database_url
+    if url is None:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench-http-'), 'bench.db')}"
+        print(f"🌱 Generating {args.properties:,} properties (seed {args.seed})...")
+        generate_dataset(url, args)
+    # Before anything imports app.database, which reads it once
+    os.environ["DATABASE_URL"] = url
+    dataset = discover(url, args.seed, args.buyers)
+
+    print(f"📊 {args.clients} clients × {args.iterations} scenarios, {args.server}")
+    if args.server == "inprocess":
+        results = asyncio.run(run_inprocess(dataset, args))
+    else:
+        results = run_uvicorn(url, dataset, args)
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "server": args.server, "workers": args.workers, "clients": args.clients,
+            "iterations": args.iterations, "seed": args.seed,
+            "properties": args.properties if args.database_url is None else None,
+            "database": url.split(":", 1)[0]
+        },
+        **results
+    }
+    print_report(results)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        problems = compare(results, baseline, args.max_regression)
+        if problems:
+            print(f"\n❌ Regressions against {args.baseline} ({baseline.get('git_commit', '?')}):")
+            for problem in problems:
+                print(f"   - {problem}")
+            sys.exit(1)
+        print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Serialization benchmark for PropertyListResponse: regular FastAPI path vs fast_json
+
+For 100, 1k and 10k listings it measures building and encoding one response:
+    models    PropertyListItem objects, validated against response_model,
+              serialized by pydantic and encoded with json (the previous
+              get_listings)
+    dicts     plain dicts through the same response_model path (FAST_JSON=0)
+    fast      plain dicts encoded with orjson, no validation (fast_json)
+
+No database is involved; the rows are synthetic listing cards.
+
+Usage (from backend/): python -m benchmarks.json_serialization [--sizes 100 1000 10000] [--seconds 1]
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from fastapi.responses import JSONResponse
+from fastapi.utils import create_model_field
+
+from app import schemas
+from app.utils.fast_json import ORJSONResponse
+
+RESPONSE_FIELD = create_model_field(name="Response_listings", type_=schemas.PropertyListResponse, mode="serialization")
+
+
+def _cards(count: int):
+    created = datetime(2025, 1, 1)
+    return [
+        SimpleNamespace(
+            property_id=i,
+            price_label=f"{1000 + i % 900} RON/lună",
+            description="Apartament luminos, aproape de metrou, complet mobilat și utilat. " * 2,
+            image=f"https://images.example.com/properties/{i}/1.jpg" if i % 4 else None,
+            location="București" if i % 2 else "Cluj-Napoca",
+            rooms=1 + i % 4,
+            type="rent" if i % 3 else "sale",
+            created_at=created - timedelta(minutes=i)
+        )
+        for i in range(count)
+    ]
+
+
+def _item_dict(card) -> dict:
+    return {
+        "id": card.property_id,
+        "price": card.price_label,
+        "description": card.description,
+        "image": card.image,
+        "location": card.location,
+        "rooms": card.rooms,
+        "type": card.type
+    }
+
+
+def _fastapi_body(content) -> bytes:
+    # What fastapi.routing.serialize_response and the route handler do with a
+    # non-Response return value
+    value, errors = RESPONSE_FIELD.validate(content, {}, loc=("response",))
+    assert not errors
+    return JSONResponse(RESPONSE_FIELD.serialize(value)).body
+
+
+def via_models(cards) -> bytes:
+    listings = [schemas.PropertyListItem(**_item_dict(card)) for card in cards]
+    return _fastapi_body({"listings": listings, "total": len(cards), "next_cursor": None})
+
+
+def via_dicts(cards) -> bytes:
+    listings = [_item_dict(card) for card in cards]
+    return _fastapi_body({"listings": listings, "total": len(cards), "next_cursor": None})
+
+
+def via_fast_json(cards) -> bytes:
+    listings = [_item_dict(card) for card in cards]
+    return ORJSONResponse({"listings": listings, "total": len(cards), "next_cursor": None}).body
+
+
+def measure(build, cards, seconds: float) -> float:
+    """Responses per second"""
+    build(cards)
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        build(cards)
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return runs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    variants = [("models", via_models), ("dicts", via_dicts), ("fast", via_fast_json)]
+    print(f"📊 PropertyListResponse serialization, {args.seconds:g}s per case")
+    for size in args.sizes:
+        cards = _cards(size)
+        assert len({json.dumps(json.loads(build(cards))) for _, build in variants}) == 1
+        baseline = None
+        for name, build in variants:
+            rate = measure(build, cards, args.seconds)
+            baseline = baseline or rate
+            print(f"   {size:>6} items  {name:<7} {rate:9.1f} responses/s  {rate * size:12,.0f} items/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Check: the hot list routes send the same number of SQL statements at any size
+
+Counts the statements (before_cursor_execute) that one call of each route
+sends against a fresh SQLite database, at several result sizes:
+
+    get_listings           pages of 1, 10 and 100 listings (plus filtered,
+                           searched and second pages)
+    get_owner_properties   owners with 1, 10 and 100 properties, 3 images each
+
+A count that grows with the size means a per-row query (N+1) crept back in.
+Exits with 1 when the counts of a route differ between sizes.
+
+Usage (from backend/): python -m benchmarks.query_counts
+"""
+import json
+import os
+import sys
+import tempfile
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import create_db_engine
+from app.migrations import upgrade
+from app.routers.listings import get_listings
+from app.routers.properties import get_owner_properties
+
+SIZES = [1, 10, 100]
+IMAGES_PER_PROPERTY = 3
+
+
+def _seed(engine) -> dict:
+    """One owner per size, holding that many properties; returns {size: owner_id}"""
+    owners = {}
+    with Session(bind=engine) as db:
+        for size in SIZES:
+            owner = models.User(name=f"Owner {size}", email=f"owner{size}@check.local", hashed_password="x", role="owner")
+            db.add(owner)
+            db.flush()
+            for i in range(size):
+                prop = models.Property(
+                    title=f"Apartament {size}-{i}", description="Apartament luminos în Cluj-Napoca.",
+                    address=f"Strada Exemplu nr. {i}", location="Cluj-Napoca", price=500 + i,
+                    price_period="lună", type="rent" if i % 2 else "sale", rooms=1 + i % 3,
+                    bathrooms=1, surface=50, owner_id=owner.id
+                )
+                db.add(prop)
+                db.flush()
+                db.add_all([
+                    models.PropertyImage(property_id=prop.id, image_url=f"/images/{prop.id}/{n}.jpg",
+                                         is_primary=n == 0, order=n)
+                    for n in range(IMAGES_PER_PROPERTY)
+                ])
+            owners[size] = owner.id
+        db.commit()
+    return owners
+
+
+def count_statements(engine, call) -> int:
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        with Session(bind=engine) as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+    return len(statements)
+
+
+def _listings(limit: int, **filters):
+    params = dict(search=None, price=None, forSale=None, forRent=None, twoPlusRooms=None, cursor=None)
+    params.update(filters)
+    return lambda db: get_listings(Response(), limit=limit, db=db, **params)
+
+
+def _second_page(limit: int):
+    def run(db):
+        first = json.loads(_listings(limit)(db).body)
+        _listings(limit, cursor=first["next_cursor"])(db)
+    return run
+
+
+def cases(owners: dict):
+    """(route, {size: call})"""
+    return [
+        ("listings", {size: _listings(size) for size in SIZES}),
+        ("listings: rent, 2+ rooms", {size: _listings(size, forRent=True, twoPlusRooms=True) for size in SIZES}),
+        ("listings: search", {size: _listings(size, search="cluj") for size in SIZES}),
+        ("listings: first + next page", {size: _second_page(size) for size in SIZES}),
+        ("owner properties", {
+            size: (lambda owner_id: lambda db: get_owner_properties(owner_id, Response(), db))(owner_id)
+            for size, owner_id in owners.items()
+        }),
+    ]
+
+
+def main() -> int:
+    directory = tempfile.mkdtemp(prefix="check-queries-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'check.db')}")
+    upgrade(engine)
+    owners = _seed(engine)
+
+    print(f"🔢 SQL statements per call at {', '.join(map(str, SIZES))} rows")
+    failures = 0
+    for name, calls in cases(owners):
+        # Once first, so one-off lookups (the search backend) are cached
+        with Session(bind=engine) as db:
+            next(iter(calls.values()))(db)
+        counts = {size: count_statements(engine, call) for size, call in calls.items()}
+        constant = len(set(counts.values())) == 1
+        failures += not constant
+        marker = "✅" if constant else "❌"
+        print(f"   {marker} {name:<30} " + "  ".join(f"{size}: {count}" for size, count in counts.items()))
+
+    if failures:
+        print(f"\n❌ {failures} route(s) send more statements as the result grows")
+        return 1
+    print("\n✅ Statement counts do not depend on the result size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
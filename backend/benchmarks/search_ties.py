@@ -0,0 +1,106 @@
+"""
+Check: ranked search pages neither repeat nor skip listings with tied scores
+
+Seeds listings whose text is identical, so a search ranks them all the same,
+and pages through GET /api/listings?search= with a small page size. The
+boundary of every page falls inside the tie, where the cursor's score must
+compare equal to the score in the database (ts_rank() is float4 on
+PostgreSQL). Exits with 1 when a listing is returned twice or not at all.
+
+Runs on a temporary SQLite database (FTS5) by default. Pass --database-url
+with an empty PostgreSQL database to check the tsvector path.
+
+Usage (from backend/): python -m benchmarks.search_ties [--database-url postgresql://...]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from fastapi import Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import create_db_engine
+from app.migrations import upgrade
+from app.routers.listings import get_listings
+
+SEARCH = "cluj"
+TIED = 25
+OTHERS = 5
+
+
+def _seed(engine) -> set:
+    """TIED identical listings plus a few that rank differently; returns the ids the search finds"""
+    with Session(bind=engine) as db:
+        owner = models.User(name="Ion Popescu", email="ion@check.local", hashed_password="x", role="owner")
+        db.add(owner)
+        db.flush()
+        descriptions = ["Apartament luminos în Cluj-Napoca, aproape de parc."] * TIED + [
+            "Cluj-Napoca, Cluj, zona centrală, Cluj" + ", Cluj" * i for i in range(OTHERS)
+        ]
+        properties = [
+            models.Property(
+                title=f"Apartament {i}", description=description, address=f"Strada Exemplu nr. {i}",
+                location="Cluj-Napoca", price=500, price_period="lună", type="rent", rooms=2,
+                bathrooms=1, surface=50, owner_id=owner.id
+            )
+            for i, description in enumerate(descriptions)
+        ]
+        db.add_all(properties)
+        db.commit()
+        return {prop.id for prop in properties}
+
+
+def _pages(engine, limit: int) -> list:
+    ids, cursor = [], None
+    with Session(bind=engine) as db:
+        while True:
+            body = json.loads(get_listings(
+                Response(), search=SEARCH, price=None, forSale=None, forRent=None, twoPlusRooms=None,
+                limit=limit, cursor=cursor, db=db
+            ).body)
+            ids += [listing["id"] for listing in body["listings"]]
+            cursor = body["next_cursor"]
+            if not cursor or len(ids) > 10 * (TIED + OTHERS):
+                return ids
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="empty database to use (default: temporary SQLite)")
+    args = parser.parse_args(argv)
+
+    url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='check-ties-'), 'check.db')}"
+    engine = create_db_engine(url)
+    upgrade(engine)
+    with Session(bind=engine) as db:
+        if db.execute(select(func.count()).select_from(models.Property)).scalar():
+            print("❌ The database already has properties; pass an empty one")
+            return 1
+    expected = _seed(engine)
+
+    print(f"🔗 Paging a search with {TIED} tied scores on {engine.dialect.name}")
+    failures = 0
+    for limit in (1, 2, 3, 7):
+        ids = _pages(engine, limit)
+        repeated = len(ids) - len(set(ids))
+        missing = expected - set(ids)
+        if repeated or missing or set(ids) != expected:
+            print(f"   ❌ limit {limit}: {repeated} repeated, {len(missing)} missing of {len(expected)}")
+            failures += 1
+        else:
+            print(f"   ✅ limit {limit}: {len(ids)} listing(s), each once")
+    engine.dispose()
+
+    if failures:
+        print(f"\n❌ {failures} page size(s) repeated or skipped tied listings")
+        return 1
+    print("\n✅ Tied search scores page without gaps or repeats")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
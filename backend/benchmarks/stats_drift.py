@@ -0,0 +1,156 @@
+"""
+Check: GET /api/stats corrects drifted counters once they are older than the TTL
+
+Against a fresh SQLite database with a few listings:
+
+    1. a drifted total_listings is served while it is younger than
+       STATS_RECOUNT_SECONDS, and replaced by the real count after that
+    2. when many readers find stale counters at once, exactly one of them
+       recounts and every reader gets an answer
+
+Exits with 1 when a step fails.
+
+Usage (from backend/): python -m benchmarks.stats_drift [--readers 8]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, text, update
+from sqlalchemy.orm import Session
+
+from app import models, platform_counters
+from app.database import create_db_engine
+from app.migrations import upgrade
+from app.platform_counters import get_counters, invalidate_cache
+
+LISTINGS = 3
+DRIFT = 5
+
+
+def _seed(engine) -> None:
+    with Session(bind=engine) as db:
+        owner = models.User(name="Ion Popescu", email="ion@check.local", hashed_password="x", role="owner")
+        db.add(owner)
+        db.flush()
+        db.add_all([
+            models.Property(
+                title=f"Apartament {i}", description="Apartament luminos.", address=f"Strada Exemplu nr. {i}",
+                location="Cluj-Napoca", price=500, price_period="lună", type="rent", rooms=2,
+                bathrooms=1, surface=50, owner_id=owner.id
+            )
+            for i in range(LISTINGS)
+        ])
+        db.commit()
+
+
+def _drift(engine, age_seconds: float) -> None:
+    """Add DRIFT to total_listings and make every counter age_seconds old"""
+    table = models.PlatformCounter.__table__
+    with engine.begin() as connection:
+        connection.execute(
+            update(table).where(table.c.name == "total_listings").values(value=table.c.value + DRIFT)
+        )
+        connection.execute(update(table).values(refreshed_at=datetime.utcnow() - timedelta(seconds=age_seconds)))
+    invalidate_cache()
+
+
+def _read(engine) -> dict:
+    invalidate_cache()
+    with Session(bind=engine) as db:
+        return get_counters(db)
+
+
+def _concurrent_reads(engine, readers: int) -> tuple:
+    """(results, errors, number of recounts) of readers calling get_counters at once"""
+    recounts, results, errors = [], [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(readers)
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT COUNT(PROPERTIES.ID)"):
+            with lock:
+                recounts.append(statement)
+
+    def read():
+        barrier.wait()
+        try:
+            with Session(bind=engine) as db:
+                value = get_counters(db)
+            with lock:
+                results.append(value)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    # The worker cache is per process; keep every thread on the database
+    cache_seconds = platform_counters.STATS_CACHE_SECONDS
+    platform_counters.STATS_CACHE_SECONDS = 0
+    try:
+        threads = [threading.Thread(target=read) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        platform_counters.STATS_CACHE_SECONDS = cache_seconds
+        event.remove(engine, "before_cursor_execute", _count)
+    return results, errors, len(recounts)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix="check-stats-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'check.db')}")
+    upgrade(engine)
+    _seed(engine)
+    with engine.begin() as connection:
+        platform_counters.recount(connection)
+    ttl = platform_counters.STATS_RECOUNT_SECONDS
+
+    print(f"📊 Drifting total_listings by {DRIFT} (STATS_RECOUNT_SECONDS={ttl:g})")
+    failures = 0
+
+    _drift(engine, age_seconds=ttl / 2)
+    served = _read(engine)["total_listings"]
+    ok = served == LISTINGS + DRIFT
+    failures += not ok
+    print(f"   {'✅' if ok else '❌'} before the TTL: served {served} (stored value, {LISTINGS + DRIFT})")
+
+    _drift(engine, age_seconds=ttl + 1)
+    served = _read(engine)["total_listings"]
+    with engine.connect() as connection:
+        stored = connection.execute(
+            text("SELECT value FROM platform_counters WHERE name = 'total_listings'")
+        ).scalar()
+    ok = served == stored == LISTINGS
+    failures += not ok
+    print(f"   {'✅' if ok else '❌'} after the TTL: served {served}, stored {stored} (real count, {LISTINGS})")
+
+    _drift(engine, age_seconds=ttl + 1)
+    results, errors, recounts = _concurrent_reads(engine, args.readers)
+    served = {result["total_listings"] for result in results}
+    ok = not errors and recounts == 1 and len(results) == args.readers
+    failures += not ok
+    print(f"   {'✅' if ok else '❌'} {args.readers} concurrent readers: {recounts} recount(s), "
+          f"{len(errors)} error(s), served {sorted(served)}")
+    for error in errors[:3]:
+        print(f"      {type(error).__name__}: {error}")
+    engine.dispose()
+
+    if failures:
+        print(f"\n❌ {failures} step(s) failed")
+        return 1
+    print("\n✅ Drifted counters are corrected after the TTL, by one reader")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
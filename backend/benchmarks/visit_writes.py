@@ -0,0 +1,135 @@
+"""
+Concurrent write benchmark for create_visit: default vs production engine profile
+
+Each profile gets a fresh SQLite file. Writer threads book distinct slots
+through the create_visit route function while reader threads poll
+get_available_slots, which is what makes the default rollback journal stall.
+
+Usage (from backend/): python -m benchmarks.visit_writes [--writers 8] [--readers 8] [--seconds 10]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.database import Base, create_db_engine
+from app import models, schemas
+from app.routers import visits
+
+PROPERTIES = 20
+SLOT_TIMES = [f"{hour:02d}:{minute:02d}" for hour in range(9, 16) for minute in (0, 30)]
+
+
+def _seed(engine, buyers: int):
+    with Session(bind=engine) as db:
+        owner = models.User(name="Owner", email="owner@bench.local", hashed_password="x", role="owner")
+        db.add(owner)
+        db.flush()
+        for i in range(PROPERTIES):
+            db.add(models.Property(
+                title=f"Proprietate {i}", description="Apartament de test", address="Strada Test 1",
+                location="București", price=1000, type="rent", rooms=2, bathrooms=1, surface=50,
+                owner_id=owner.id
+            ))
+        for i in range(buyers):
+            db.add(models.User(name=f"Buyer {i}", email=f"buyer{i}@bench.local", hashed_password="x", role="buyer"))
+        db.commit()
+        buyer_ids = [u.id for u in db.query(models.User).filter(models.User.role == "buyer")]
+        property_ids = [p.id for p in db.query(models.Property)]
+    return buyer_ids, property_ids
+
+
+def _slot(n: int, property_ids):
+    """The n-th distinct (property, date, time) slot"""
+    property_id = property_ids[n % len(property_ids)]
+    n //= len(property_ids)
+    visit_time = SLOT_TIMES[n % len(SLOT_TIMES)]
+    visit_date = (date(2030, 1, 1) + timedelta(days=n // len(SLOT_TIMES))).isoformat()
+    return property_id, visit_date, visit_time
+
+
+def run_profile(profile: str, writers: int, readers: int, seconds: float) -> dict:
+    directory = tempfile.mkdtemp(prefix="bench-visits-")
+    engine = create_db_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", profile=profile)
+    Base.metadata.create_all(bind=engine)
+    buyer_ids, property_ids = _seed(engine, writers)
+
+    counter = iter(range(10 ** 9))
+    counter_lock = threading.Lock()
+    stats = {"writes": 0, "reads": 0, "errors": 0}
+    stats_lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def bump(key):
+        with stats_lock:
+            stats[key] += 1
+
+    def writer(buyer_id):
+        while time.perf_counter() < deadline:
+            with counter_lock:
+                n = next(counter)
+            property_id, visit_date, visit_time = _slot(n, property_ids)
+            with Session(bind=engine) as db:
+                try:
+                    buyer = db.get(models.User, buyer_id)
+                    visits.create_visit(
+                        schemas.VisitCreate(property_id=property_id, visit_date=visit_date, visit_time=visit_time),
+                        current_user=buyer,
+                        db=db
+                    )
+                    bump("writes")
+                except (OperationalError, HTTPException):
+                    db.rollback()
+                    bump("errors")
+
+    def reader(i):
+        while time.perf_counter() < deadline:
+            with Session(bind=engine) as db:
+                try:
+                    visits.get_available_slots(property_ids[i % len(property_ids)], date="2030-01-01", db=db)
+                    bump("reads")
+                except OperationalError:
+                    bump("errors")
+
+    threads = [threading.Thread(target=writer, args=(buyer_id,)) for buyer_id in buyer_ids]
+    threads += [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    return {
+        "profile": profile,
+        "writes_per_s": stats["writes"] / elapsed,
+        "reads_per_s": stats["reads"] / elapsed,
+        "errors": stats["errors"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"📊 create_visit: {args.writers} writer(s), {args.readers} reader(s), {args.seconds:g}s per profile")
+    for profile in ("default", "production"):
+        result = run_profile(profile, args.writers, args.readers, args.seconds)
+        print(
+            f"   {result['profile']:<10} {result['writes_per_s']:8.1f} writes/s "
+            f"{result['reads_per_s']:8.1f} reads/s  {result['errors']} error(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
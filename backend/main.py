@@ -1,15 +1,39 @@
-from fastapi import FastAPI
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth, listings, properties, stats, profile, visits, reviews
-from app.database import engine, Base
+from app.database import engine
+from app.migrations import check_schema, upgrade
+from app.utils.compression import CompressionMiddleware
+from app.utils.instrumentation import after_body, instrument_engine, log_request, start_request
+from app.utils.metrics import RequestTimer, instrument_pool, mark_dead_workers, mark_worker_dead, render_metrics
+
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+
+# Schema changes are applied before a deploy (python -m app.migrate_db), not here
+if os.getenv("MIGRATE_ON_STARTUP", "").lower() in ("1", "true", "yes"):
+    upgrade(engine)
+else:
+    check_schema(engine)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Multiprocess Prometheus: drop the in-progress/pool gauges of dead workers
+    mark_dead_workers()
+    yield
+    mark_worker_dead()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="IAS Rental Platform API",
     description="Backend API for the IAS rental platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -25,8 +49,59 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Next-Cursor"],
 )
 
+# gzip/Brotli for larger JSON bodies (cached responses arrive precompressed)
+app.add_middleware(CompressionMiddleware)
+
+# Per-request SQL statistics (Server-Timing header + structured log line)
+instrument_engine(engine)
+
+
+@app.middleware("http")
+async def sql_timing_middleware(request: Request, call_next):
+    stats = start_request()
+    start = time.perf_counter()
+    response = await call_next(request)
+    # Headers go out first: Server-Timing covers the work until the response starts
+    response.headers["Server-Timing"] = stats.server_timing((time.perf_counter() - start) * 1000)
+    
+    def finish(failed: bool):
+        app_ms = (time.perf_counter() - start) * 1000
+        log_request(request.method, request.url.path, 500 if failed else response.status_code, app_ms, stats)
+    
+    after_body(response, finish)
+    return response
+
+
+# Prometheus request and connection pool metrics, served at /metrics
+instrument_pool(engine)
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    timer = RequestTimer(request.url.path, request.method)
+    try:
+        response = await call_next(request)
+    except Exception:
+        timer.finish(500)
+        raise
+    # Streamed routes do most of their work after the response starts
+    after_body(response, lambda failed: timer.finish(500 if failed else response.status_code))
+    return response
+
+
+# Serve the read-heavy routes from the async database stack
+if os.getenv("ASYNC_DB", "").lower() in ("1", "true", "yes"):
+    from app.async_database import async_engine
+    from app.routers.async_reads import enable_async_reads
+
+    instrument_engine(async_engine.sync_engine)
+    instrument_pool(async_engine.sync_engine)
+    enable_async_reads()
+
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(listings.router, prefix="/api/listings", tags=["listings"])
@@ -46,3 +121,8 @@ def root():
 def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -3,6 +3,10 @@ Simple script to run the FastAPI server
 """
 import uvicorn
 
+from app.database import engine
+from app.migrations import upgrade
+
 if __name__ == "__main__":
+    upgrade(engine, log=print)
     uvicorn.run("main:app", host="0.0.0.0", port=3001, reload=True)
 
@@ -34,7 +34,7 @@ function OwnerCard({ owner, onDiscuss, onScheduleVisit }) {
   
   const loadOwnerRating = async () => {
     try {
-      const data = await apiService.getOwnerReviews(id)
+      const data = await apiService.getOwnerReviewSummary(id)
       setRating(data.average_rating || 0)
       setTotalReviews(data.total_reviews || 0)
     } catch (error) {
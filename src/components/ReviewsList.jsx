@@ -5,7 +5,10 @@ import './ReviewsList.css'
 function ReviewsList({ ownerId, showTitle = true }) {
   const [reviews, setReviews] = useState([])
   const [averageRating, setAverageRating] = useState(0)
+  const [totalReviews, setTotalReviews] = useState(0)
+  const [nextCursor, setNextCursor] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     if (ownerId) {
@@ -19,15 +22,32 @@ function ReviewsList({ ownerId, showTitle = true }) {
       const data = await apiService.getOwnerReviews(ownerId)
       setReviews(data.reviews || [])
       setAverageRating(data.average_rating || 0)
+      setTotalReviews(data.total_reviews || 0)
+      setNextCursor(data.next_cursor || null)
     } catch (error) {
       console.error('Error loading reviews:', error)
       setReviews([])
       setAverageRating(0)
+      setTotalReviews(0)
+      setNextCursor(null)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMoreReviews = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await apiService.getOwnerReviews(ownerId, { cursor: nextCursor })
+      setReviews(current => [...current, ...(data.reviews || [])])
+      setNextCursor(data.next_cursor || null)
+    } catch (error) {
+      console.error('Error loading more reviews:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   if (loading) {
     return (
       <div className="reviews-list-container">
@@ -63,7 +83,7 @@ function ReviewsList({ ownerId, showTitle = true }) {
               ))}
             </div>
             <span className="summary-text">
-              {averageRating.toFixed(1)} din {reviews.length} {reviews.length === 1 ? 'recenzie' : 'recenzii'}
+              {averageRating.toFixed(1)} din {totalReviews} {totalReviews === 1 ? 'recenzie' : 'recenzii'}
             </span>
           </div>
         </div>
@@ -103,6 +123,18 @@ function ReviewsList({ ownerId, showTitle = true }) {
           </div>
         ))}
       </div>
+
+      {nextCursor && (
+        <div className="reviews-load-more">
+          <button
+            className="reviews-load-more-btn"
+            onClick={loadMoreReviews}
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Se încarcă...' : 'Încarcă mai multe recenzii'}
+          </button>
+        </div>
+      )}
     </div>
   )
 }
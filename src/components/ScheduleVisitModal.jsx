@@ -7,29 +7,44 @@ function ScheduleVisitModal({ propertyId, isOpen, onClose, onSuccess }) {
   const { user } = useAuth()
   const [selectedDate, setSelectedDate] = useState('')
   const [selectedTime, setSelectedTime] = useState('')
-  const [availableSlots, setAvailableSlots] = useState([])
+  const [slotTimes, setSlotTimes] = useState([])
+  const [dayBitmaps, setDayBitmaps] = useState({})
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const [currentMonth, setCurrentMonth] = useState(new Date())
 
   useEffect(() => {
-    if (isOpen && selectedDate) {
-      loadAvailableSlots()
+    setDayBitmaps({})
+  }, [propertyId])
+
+  useEffect(() => {
+    if (isOpen) {
+      loadMonthAvailability()
     }
-  }, [isOpen, selectedDate, propertyId])
+  }, [isOpen, currentMonth, propertyId])
 
-  const loadAvailableSlots = async () => {
-    if (!selectedDate) return
+  const loadMonthAvailability = async () => {
+    // One call for the visible month; each day is a bitmap over slot_times
+    const start = formatDate(new Date(currentMonth.getFullYear(), currentMonth.getMonth(), 1))
+    const end = formatDate(new Date(currentMonth.getFullYear(), currentMonth.getMonth() + 1, 0))
     
     try {
-      const data = await apiService.getAvailableSlots(propertyId, selectedDate)
-      setAvailableSlots(data.slots || [])
+      const data = await apiService.getAvailabilityRange([propertyId], start, end)
+      setSlotTimes(data.slot_times || [])
+      // Months already seen are kept, so a date picked before paging still has its slots
+      setDayBitmaps(current => ({ ...current, ...((data.availability || {})[propertyId] || {}) }))
     } catch (err) {
       console.error('Error loading slots:', err)
       setError('Nu s-au putut încărca sloturile disponibile.')
     }
   }
 
+  const bitmap = dayBitmaps[selectedDate]
+  const availableSlots = bitmap === undefined ? [] : slotTimes.map((time, index) => ({
+    time,
+    available: ((bitmap >> index) & 1) === 1
+  }))
+
   const handleDateSelect = (date) => {
     const dateStr = formatDate(date)
     setSelectedDate(dateStr)
@@ -8,6 +8,8 @@ import './ListingsPage.css'
 function ListingsPage() {
   const [listings, setListings] = useState([])
   const [loading, setLoading] = useState(true)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [filters, setFilters] = useState({})
   const [showMap, setShowMap] = useState(false)
 
@@ -20,14 +22,29 @@ function ListingsPage() {
     try {
       const data = await apiService.getListings(filterParams)
       setListings(data.listings || [])
+      setNextCursor(data.next_cursor || null)
     } catch (error) {
       console.error('Error loading listings:', error)
       setListings([])
+      setNextCursor(null)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMoreListings = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await apiService.getListings({ ...filters, cursor: nextCursor })
+      setListings(current => [...current, ...(data.listings || [])])
+      setNextCursor(data.next_cursor || null)
+    } catch (error) {
+      console.error('Error loading more listings:', error)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleFilterChange = (filterParams) => {
     setFilters(filterParams)
     loadListings(filterParams)
@@ -64,6 +81,18 @@ function ListingsPage() {
             )}
           </div>
         )}
+
+        {!loading && nextCursor && (
+          <div className="load-more-container">
+            <button
+              className="load-more-btn"
+              onClick={loadMoreListings}
+              disabled={loadingMore}
+            >
+              {loadingMore ? 'Se încarcă...' : 'Încarcă mai multe'}
+            </button>
+          </div>
+        )}
       </main>
     </div>
   )
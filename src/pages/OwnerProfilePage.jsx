@@ -26,10 +26,8 @@ function OwnerProfilePage() {
 
   const loadOwnerProfile = async () => {
     try {
-      // Get owner info from reviews endpoint (which includes owner_id)
-      const reviewsData = await apiService.getOwnerReviews(ownerId)
-      // We need to get owner details - let's use the first property's owner or create a separate endpoint
-      // For now, we'll get owner info from properties
+      // The reviews are listed (and paged) by ReviewsList; owner details come
+      // from the first property's owner until there is a separate endpoint
       const propertiesData = await apiService.getOwnerProperties(ownerId)
       if (propertiesData.length > 0 && propertiesData[0].owner) {
         setOwner(propertiesData[0].owner)
@@ -15,6 +15,9 @@ function ProfilePage() {
   const [visits, setVisits] = useState([])
   const [reviews, setReviews] = useState([])
   const [averageRating, setAverageRating] = useState(0)
+  const [totalReviews, setTotalReviews] = useState(0)
+  const [reviewsCursor, setReviewsCursor] = useState(null)
+  const [loadingMoreReviews, setLoadingMoreReviews] = useState(false)
   const [showReviewModal, setShowReviewModal] = useState(false)
   const [selectedVisitForReview, setSelectedVisitForReview] = useState(null)
   const [profileData, setProfileData] = useState({
@@ -133,10 +136,27 @@ function ProfilePage() {
       const data = await apiService.getOwnerReviews(user.id)
       setReviews(data.reviews || [])
       setAverageRating(data.average_rating || 0)
+      setTotalReviews(data.total_reviews || 0)
+      setReviewsCursor(data.next_cursor || null)
     } catch (error) {
       console.error('Error loading reviews:', error)
       setReviews([])
       setAverageRating(0)
+      setTotalReviews(0)
+      setReviewsCursor(null)
+    }
+  }
+
+  const loadMoreOwnerReviews = async () => {
+    setLoadingMoreReviews(true)
+    try {
+      const data = await apiService.getOwnerReviews(user.id, { cursor: reviewsCursor })
+      setReviews(current => [...current, ...(data.reviews || [])])
+      setReviewsCursor(data.next_cursor || null)
+    } catch (error) {
+      console.error('Error loading more reviews:', error)
+    } finally {
+      setLoadingMoreReviews(false)
     }
   }
 
@@ -241,7 +261,7 @@ function ProfilePage() {
                 ))}
                 {user.role === 'owner' && averageRating > 0 && (
                   <span className="rating-text">
-                    ({averageRating.toFixed(1)}) - {reviews.length} {reviews.length === 1 ? 'recenzie' : 'recenzii'}
+                    ({averageRating.toFixed(1)}) - {totalReviews} {totalReviews === 1 ? 'recenzie' : 'recenzii'}
                   </span>
                 )}
               </div>
@@ -468,6 +488,17 @@ function ProfilePage() {
                     </div>
                   ))}
                 </div>
+                {reviewsCursor && (
+                  <div className="reviews-load-more">
+                    <button
+                      className="save-profile-btn"
+                      onClick={loadMoreOwnerReviews}
+                      disabled={loadingMoreReviews}
+                    >
+                      {loadingMoreReviews ? 'Se încarcă...' : 'Încarcă mai multe recenzii'}
+                    </button>
+                  </div>
+                )}
               </section>
             )}
 
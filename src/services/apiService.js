@@ -455,6 +455,9 @@ class ApiService {
     if (params.forSale !== undefined) queryParams.forSale = params.forSale
     if (params.forRent !== undefined) queryParams.forRent = params.forRent
     if (params.twoPlusRooms !== undefined) queryParams.twoPlusRooms = params.twoPlusRooms
+    // Keyset paging: pass back the previous page's next_cursor
+    if (params.limit) queryParams.limit = params.limit
+    if (params.cursor) queryParams.cursor = params.cursor
     
     return this.request('/listings', { params: queryParams })
   }
@@ -545,6 +548,13 @@ class ApiService {
     })
   }
 
+  async getAvailabilityRange(propertyIds, start, end) {
+    // One call for a whole calendar; each day is a bitmap over slot_times
+    const query = new URLSearchParams({ start, end })
+    propertyIds.forEach(id => query.append('property_ids', id))
+    return this.request(`/visits/available?${query.toString()}`)
+  }
+
   async createVisit(visitData) {
     const token = localStorage.getItem('authToken')
     return this.request('/visits', {
@@ -586,8 +596,17 @@ class ApiService {
     })
   }
 
-  async getOwnerReviews(ownerId) {
-    return this.request(`/reviews/owner/${ownerId}`)
+  async getOwnerReviews(ownerId, params = {}) {
+    // Keyset paging: pass back the previous page's next_cursor
+    const queryParams = {}
+    if (params.limit) queryParams.limit = params.limit
+    if (params.cursor) queryParams.cursor = params.cursor
+    
+    return this.request(`/reviews/owner/${ownerId}`, { params: queryParams })
+  }
+
+  async getOwnerReviewSummary(ownerId) {
+    return this.request(`/reviews/owner/${ownerId}/summary`)
   }
 
   async getPropertyReviews(propertyId) {